@@ -1,26 +1,70 @@
-import threading
-import webbrowser
+import time
+from functools import lru_cache
 from pathlib import Path
 
-from flask import Flask, jsonify, render_template, request, send_from_directory
+from flask import Flask, Response, jsonify, render_template, request, send_from_directory
 
 from config import (
     DEFAULT_BASELINE,
+    DEFAULT_CACHE_DIR,
     DEFAULT_ENEMY_DIRECTORIES,
     DEFAULT_ITEMS_FOLDER,
     DEFAULT_ONLINE_ITEMS_URL,
     DEFAULT_OUTPUT_DIR,
 )
-from diff_checker import DiffChecker
-from exporters import ExportService
-from pipeline import ItemPipeline
+from metrics import Metrics
 
 app = Flask(__name__)
 OUTPUT_DIR = Path(DEFAULT_OUTPUT_DIR)
+METRICS = Metrics()
+ACTIONS = ("diff", "armor", "ring", "sword", "hammer", "spear", "staff", "dagger", "axe", "all", "class", "enemy")
+
+# Parsing and export modules are imported on first use rather than at startup;
+# the shared helpers below are created once and reused across requests.
+
+
+@lru_cache(maxsize=None)
+def _parse_cache():
+    """Shared so unchanged ENML/.character files are not re-tokenized."""
+    from parse_cache import ParseCache
+    return ParseCache(Path(DEFAULT_CACHE_DIR) / "parse")
+
+
+@lru_cache(maxsize=None)
+def _online_manager():
+    """Revalidates the online item JSON instead of downloading it on every request."""
+    from http_cache import HttpCache
+    from online_data import BUNDLED_INDEX_NAME, OnlineDataManager
+    return OnlineDataManager(index_path=Path(DEFAULT_CACHE_DIR) / BUNDLED_INDEX_NAME,
+                             http_cache=HttpCache(Path(DEFAULT_CACHE_DIR) / "http"))
+
+
+@lru_cache(maxsize=None)
+def _snapshot():
+    from snapshot import ItemSnapshot
+    return ItemSnapshot(Path(DEFAULT_CACHE_DIR) / "items.snapshot")
 
 
 def _exporter():
-    return ExportService(OUTPUT_DIR)
+    return _exporter_for(OUTPUT_DIR)
+
+
+@lru_cache(maxsize=None)
+def _exporter_for(output_dir):
+    """Shared per output folder, so its content manifest and written/unchanged counters persist."""
+    from exporters import ExportService
+    return ExportService(output_dir, cache=_parse_cache())
+
+
+def _load_items(items_folder, online_url):
+    from pipeline import ItemPipeline
+    pipeline = ItemPipeline(items_folder, online_url, online_manager=_online_manager(), cache=_parse_cache(),
+                            snapshot=_snapshot())
+    items_by_type = pipeline.load_items()
+    METRICS.observe_stages(pipeline.timings)
+    METRICS.observe_exclusions(pipeline.data_filter.exclusions)
+    METRICS.set_dataset(items_by_type)
+    return items_by_type
 
 
 @app.route("/")
@@ -30,8 +74,25 @@ def index():
 
 @app.route("/api/run", methods=["POST"])
 def api_run():
+    started = time.perf_counter()
     body = request.get_json(force=True)
     action = body.get("action", "")
+    response = _dispatch(action, body)
+    status = response[1] if isinstance(response, tuple) else response.status_code
+    # Unknown actions share one label so clients cannot grow the series count.
+    METRICS.observe_request(action if action in ACTIONS else "unknown", status, time.perf_counter() - started)
+    return response
+
+
+@app.route("/metrics")
+def metrics():
+    online_manager = _online_manager()
+    text = METRICS.render(parse_cache=_parse_cache(), http_cache=online_manager.http_cache,
+                          online_manager=online_manager, output_cache=_exporter())
+    return Response(text, mimetype="text/plain; version=0.0.4")
+
+
+def _dispatch(action, body):
     output_type = body.get("output_type", "normal")
     items_folder = body.get("items_folder") or DEFAULT_ITEMS_FOLDER
     online_url = body.get("online_url") or DEFAULT_ONLINE_ITEMS_URL
@@ -61,12 +122,12 @@ def download(filename):
 
 
 def _run_diff(items_folder, online_url):
-    checker = DiffChecker(items_folder, online_url)
+    from diff_checker import DiffChecker
+    checker = DiffChecker(items_folder, online_url, online_manager=_online_manager(), cache=_parse_cache())
     new_items, removed_items, changes, local = checker.run()
 
     report = DiffChecker.format_report(new_items, removed_items, changes, local)
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    (OUTPUT_DIR / "diff_report.txt").write_text(report, encoding="utf-8")
+    _exporter().write_text("diff_report.txt", report)
 
     serialized_changes = {
         name: {field: [online_val, local_val] for field, (online_val, local_val) in diffs.items()}
@@ -90,55 +151,56 @@ def _run_diff(items_folder, online_url):
 
 
 def _run_single_type(item_type, output_type, items_folder, online_url):
-    items_by_type = ItemPipeline(items_folder, online_url).load_items()
-    out_path = _exporter().export_items(items_by_type, item_type, output_type)
+    items_by_type = _load_items(items_folder, online_url)
+    result = _exporter().export_items(items_by_type, item_type, output_type)
     return jsonify({
         "type": "parse",
         "item_type": item_type,
-        "content": out_path.read_text(encoding="utf-8"),
-        "filename": out_path.name,
+        "content": result.path.read_text(encoding="utf-8"),
+        "filename": result.path.name,
     })
 
 
 def _run_all(output_type, items_folder, online_url):
-    items_by_type = ItemPipeline(items_folder, online_url).load_items()
+    items_by_type = _load_items(items_folder, online_url)
     exporter = _exporter()
-    paths = exporter.export_all_items(items_by_type, output_type)
+    results = exporter.export_all_items(items_by_type, output_type)
 
     try:
-        class_path = exporter.export_classes(items_folder, output_type)
-        if class_path:
-            paths.append(class_path)
+        results.append(exporter.export_classes(items_folder, output_type))
     except Exception:
         pass
 
     files = [
-        {"filename": p.name, "item_type": p.stem.replace("_code", "")}
-        for p in paths if p
+        {"filename": result.path.name, "item_type": result.label}
+        for result in results if result.path
     ]
     return jsonify({"type": "all", "files": files})
 
 
 def _run_classes(output_type, items_folder):
-    out_path = _exporter().export_classes(items_folder, output_type)
+    result = _exporter().export_classes(items_folder, output_type)
     return jsonify({
         "type": "parse",
         "item_type": "class",
-        "content": out_path.read_text(encoding="utf-8"),
-        "filename": out_path.name,
+        "content": result.path.read_text(encoding="utf-8"),
+        "filename": result.path.name,
     })
 
 
 def _run_enemies(output_type, enemy_dirs):
-    out_path = _exporter().export_enemies(enemy_dirs, output_type)
+    result = _exporter().export_enemies(enemy_dirs, output_type)
     return jsonify({
         "type": "parse",
         "item_type": "enemy",
-        "content": out_path.read_text(encoding="utf-8"),
-        "filename": out_path.name,
+        "content": result.path.read_text(encoding="utf-8"),
+        "filename": result.path.name,
     })
 
 
 if __name__ == "__main__":
+    import threading
+    import webbrowser
+
     threading.Timer(1.2, lambda: webbrowser.open("http://localhost:5000")).start()
     app.run(debug=False, host="127.0.0.1", port=5000)
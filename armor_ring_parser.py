@@ -1,6 +1,13 @@
-from parser_utils import process_boost, sanitize_resource_name
+from collections.abc import Mapping
+from parser_utils import boost_columns, sanitize_resource_name
 from models import record_to_mapping
 
+ARMOR_BOOST_FIELDS = (
+    "speedBoost", "jumpBoost", "magicBoost", "swordBoost", "staffBoost",
+    "daggerBoost", "axeBoost", "hammerBoost", "spearBoost",
+)
+RING_BOOST_FIELDS = ("armorBoost",) + ARMOR_BOOST_FIELDS
+
 
 def sort_by_max_armor(items, is_ring=False):
     """Sorts a list of dicts by max armor (or armor if ring) in ascending order."""
@@ -41,9 +48,10 @@ def generate_armor_code(data):
     if isinstance(data, list):
         # sort ascending
         sorted_data = sort_by_max_armor(data, is_ring=False)
+        boosts = boost_columns(sorted_data, ARMOR_BOOST_FIELDS)
 
-        for block in sorted_data:
-            if isinstance(block, dict) or hasattr(block, "as_dict"):
+        for index, block in enumerate(sorted_data):
+            if isinstance(block, Mapping) or hasattr(block, "as_mapping"):
                 block = record_to_mapping(block)
                 name = (block.get("name", "test_armor")
                         )
@@ -53,15 +61,15 @@ def generate_armor_code(data):
                 maxArmor = block.get("maxLevelArmor", minArmor)
                 upgrades = block.get("maxLevelAllowed", 1) or 1
 
-                speed = process_boost(block.get("speedBoost", 1))
-                jump = process_boost(block.get("jumpBoost", 1))
-                magic = process_boost(block.get("magicBoost", 1))
-                sword = process_boost(block.get("swordBoost", 1))
-                staff = process_boost(block.get("staffBoost", 1))
-                dagger = process_boost(block.get("daggerBoost", 1))
-                axe = process_boost(block.get("axeBoost", 1))
-                hammer = process_boost(block.get("hammerBoost", 1))
-                spear = process_boost(block.get("spearBoost", 1))
+                speed = boosts["speedBoost"][index]
+                jump = boosts["jumpBoost"][index]
+                magic = boosts["magicBoost"][index]
+                sword = boosts["swordBoost"][index]
+                staff = boosts["staffBoost"][index]
+                dagger = boosts["daggerBoost"][index]
+                axe = boosts["axeBoost"][index]
+                hammer = boosts["hammerBoost"][index]
+                spear = boosts["spearBoost"][index]
 
                 element = block.get("element", "NEUTRAL").upper()
 
@@ -84,25 +92,26 @@ def generate_ring_code(data):
     if isinstance(data, list):
         # sort ascending
         sorted_data = sort_by_max_armor(data, is_ring=True)
+        boosts = boost_columns(sorted_data, RING_BOOST_FIELDS)
 
-        for block in sorted_data:
-            if isinstance(block, dict) or hasattr(block, "as_dict"):
+        for index, block in enumerate(sorted_data):
+            if isinstance(block, Mapping) or hasattr(block, "as_mapping"):
                 block = record_to_mapping(block)
                 name = (block.get("name", "test_ring")
                         )
                 name = sanitize_resource_name(name, "test_ring")
                 element = block.get("element", "NEUTRAL").upper()
                 armor = block.get("armor", 0)
-                armorBonus = process_boost(block.get("armorBoost", 1))
-                speed = process_boost(block.get("speedBoost", 1))
-                jump = process_boost(block.get("jumpBoost", 1))
-                magic = process_boost(block.get("magicBoost", 1))
-                sword = process_boost(block.get("swordBoost", 1))
-                staff = process_boost(block.get("staffBoost", 1))
-                dagger = process_boost(block.get("daggerBoost", 1))
-                axe = process_boost(block.get("axeBoost", 1))
-                hammer = process_boost(block.get("hammerBoost", 1))
-                spear = process_boost(block.get("spearBoost", 1))
+                armorBonus = boosts["armorBoost"][index]
+                speed = boosts["speedBoost"][index]
+                jump = boosts["jumpBoost"][index]
+                magic = boosts["magicBoost"][index]
+                sword = boosts["swordBoost"][index]
+                staff = boosts["staffBoost"][index]
+                dagger = boosts["daggerBoost"][index]
+                axe = boosts["axeBoost"][index]
+                hammer = boosts["hammerBoost"][index]
+                spear = boosts["spearBoost"][index]
 
                 base = (
                     f"ringList.add(new Ring(str(context, R.string.{name}), Elements.{element}, "
@@ -0,0 +1,157 @@
+"""Concurrent load test of the web app's /api/run endpoint, fully offline.
+
+Starts the Flask app on a local werkzeug server next to a local HTTP stand-in
+for the online items gist (with ETag support), both fed from a synthetic
+corpus, then fires concurrent /api/run requests per action and reports
+throughput and p50/p95/p99 latency:
+
+    python benchmarks/bench_app_load.py --items 2000 --requests 40 --concurrency 8
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import build_corpus  # noqa: E402
+
+ACTIONS = ("all", "diff", "enemy", "class", "armor", "ring", "sword", "hammer", "spear", "staff", "dagger", "axe")
+
+
+def serve_gist(body):
+    """Serve ``body`` as the gist JSON on a random local port; return (server, url)."""
+    etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+
+    class GistHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GistHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/items.json"
+
+
+def serve_app(output_dir):
+    """Run app.py's Flask app on a threaded werkzeug server; return (server, base_url)."""
+    from werkzeug.serving import make_server
+
+    import app as web_app
+    web_app.OUTPUT_DIR = Path(output_dir)
+    server = make_server("127.0.0.1", 0, web_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def post_run(base_url, payload):
+    request = urllib.request.Request(
+        f"{base_url}/api/run",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=300) as response:
+            response.read()
+            ok = response.status == 200
+    except OSError:
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def run_action(base_url, payload, requests, concurrency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: post_run(base_url, payload), range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, ok in results if not ok),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--characters", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=40, help="Requests per action")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--actions", default=",".join(ACTIONS))
+    parser.add_argument("--output-type", default="normal", choices=("normal", "developer"))
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    parser.add_argument("--log-level", default="ERROR", help="Log level of the app and request log")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s %(name)s: %(message)s")
+    logging.getLogger("werkzeug").setLevel(args.log_level.upper())
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = build_corpus(folder, args.items, characters=args.characters, strings_files=1, keys_per_file=1)
+        gist, gist_url = serve_gist(paths["online"].read_bytes())
+        # The app keeps its caches under ./.cache; keep them inside the corpus folder.
+        previous_cwd = os.getcwd()
+        os.chdir(folder)
+        server, base_url = serve_app(Path(folder) / "output")
+        try:
+            payload = {
+                "output_type": args.output_type,
+                "items_folder": str(paths["items"]),
+                "online_url": gist_url,
+                "enemy_dirs": [str(paths["enemies"])],
+            }
+            results = {}
+            print(f"{'action':<8} {'req':>5} {'err':>4} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+            for action in args.actions.split(","):
+                stats = run_action(base_url, dict(payload, action=action), args.requests, args.concurrency)
+                results[action] = stats
+                print(f"{action:<8} {stats['requests']:>5} {stats['errors']:>4} {stats['throughput_rps']:>8} "
+                      f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+        finally:
+            server.shutdown()
+            gist.shutdown()
+            os.chdir(previous_cwd)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"items": args.items, "actions": results}, indent=2) + "\n",
+                                     encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Micro-benchmark of value decoding: regex-per-call parse_scalar vs ValueDecoder.
+
+    python benchmarks/bench_decode.py --number 20
+"""
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from parser_utils import ValueDecoder, parse_scalar  # noqa: E402
+
+# A typical item block, as (key, raw value) pairs straight from the tokenizer.
+SAMPLE = [
+    ("name", "Bench Sword"),
+    ("type", "weapon"),
+    ("secondaryType", "sword"),
+    ("sprite", "sword_12.png"),
+    ("element", "fire"),
+    ("damage", "77"),
+    ("attackCooldown", "650;"),
+    ("pierceCount", "1"),
+    ("speedBoost", "1.04"),
+    ("jumpBoost", "1"),
+    ("armorBoost", "1.4"),
+    ("frost", "false"),
+    ("poisonous", "true"),
+    ("freemiumGoldPrice", "904000"),
+    ("customFlag", "3"),
+]
+
+
+def legacy_parse_scalar(value):
+    """parse_scalar as it was before precompiled patterns, for reference."""
+    if not isinstance(value, str):
+        return value
+    text = value.strip().rstrip(";")
+    lowered = text.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    if re.fullmatch(r"[+-]?\d+", text):
+        return int(text)
+    if re.fullmatch(r"[+-]?(?:\d+\.\d*|\.\d+)", text):
+        return float(text)
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=10000, help="Item blocks decoded per run")
+    parser.add_argument("--number", type=int, default=10, help="Runs per variant (best is reported)")
+    args = parser.parse_args(argv)
+
+    pairs = SAMPLE * args.blocks
+    decoder = ValueDecoder()
+    variants = {
+        "legacy_parse_scalar": lambda: [legacy_parse_scalar(value) for _, value in pairs],
+        "parse_scalar": lambda: [parse_scalar(value) for _, value in pairs],
+        "ValueDecoder.decode": lambda: [decoder.decode(key, value) for key, value in pairs],
+    }
+    for name, run in variants.items():
+        best = min(timeit.repeat(run, number=1, repeat=args.number))
+        print(f"{name:<22}{best * 1e9 / len(pairs):8.1f} ns/value")
+
+
+if __name__ == "__main__":
+    main()
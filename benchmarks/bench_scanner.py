@@ -0,0 +1,107 @@
+"""Compare the line-based and memory-mapped ENML scanners on a synthetic corpus.
+
+Each scanner runs in a fresh interpreter so peak RSS is measured in isolation:
+
+    python benchmarks/bench_scanner.py --items 200000 --files 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from enml_tokenizer import SCANNERS  # noqa: E402
+from file_parser import FileParser  # noqa: E402
+
+
+def write_corpus(folder, items, files):
+    """Write ``items`` synthetic item blocks spread over ``files`` ENML files."""
+    file_map = {}
+    per_file = max(1, items // files)
+    for file_index in range(files):
+        file_name = f"bench-{file_index}.enml"
+        file_map[file_name] = "sword"
+        with open(Path(folder) / file_name, "w", encoding="utf-8") as handle:
+            for index in range(file_index * per_file, (file_index + 1) * per_file):
+                handle.write(
+                    "item\n{\n"
+                    f"    name = Bench Sword {index}\n"
+                    "    type = weapon\n"
+                    "    secondaryType = sword\n"
+                    f"    sprite = sword_{index % 50}.png // shared sprite\n"
+                    "    element = fire\n"
+                    f"    damage = {10 + index % 90}\n"
+                    f"    attackCooldown = {400 + index % 300}\n"
+                    "    speedBoost = 1.05\n"
+                    "    jumpBoost = 1.0\n"
+                    "    armorBoost = 1.2\n"
+                    "    frost = false\n"
+                    f"    freemiumGoldPrice = {index * 10}\n"
+                    "}\n"
+                )
+    return file_map
+
+
+def _peak_rss_kb():
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_worker(scanner, folder):
+    with open(Path(folder) / "file_map.json", encoding="utf-8") as handle:
+        file_map = json.load(handle)
+    baseline_kb = _peak_rss_kb()
+    started = time.perf_counter()
+    parsed = FileParser(folder, file_map, scanner=scanner).parse_files()
+    elapsed = time.perf_counter() - started
+    count = sum(len(items) for items in parsed.values())
+    print(json.dumps({
+        "scanner": scanner,
+        "items": count,
+        "seconds": round(elapsed, 4),
+        "items_per_second": round(count / elapsed) if elapsed else None,
+        "baseline_rss_kb": baseline_kb,
+        "peak_rss_kb": _peak_rss_kb(),
+    }))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--worker", nargs=2, metavar=("SCANNER", "FOLDER"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(*args.worker)
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        file_map = write_corpus(folder, args.items, args.files)
+        (Path(folder) / "file_map.json").write_text(json.dumps(file_map), encoding="utf-8")
+        size_mb = sum(os.path.getsize(Path(folder) / name) for name in file_map) / (1024 * 1024)
+        print(f"corpus: {args.items} items in {args.files} files ({size_mb:.1f} MB)")
+        for scanner in SCANNERS:
+            runs = []
+            for _ in range(args.repeat):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--worker", scanner, folder],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                runs.append(json.loads(output))
+            best = min(runs, key=lambda run: run["seconds"])
+            print(json.dumps(best))
+
+
+if __name__ == "__main__":
+    main()
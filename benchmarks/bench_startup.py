@@ -0,0 +1,95 @@
+"""Import-time budget check for CLI and web app cold starts.
+
+Each scenario in ``startup_budget.json`` runs in a fresh interpreter under
+``python -X importtime``; the summed self time of every import (median over
+``--runs``) must stay within its budget, and none of its ``forbidden``
+modules may be loaded.
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --update   # rewrite budgets from this machine
+
+Budgets are calibrated with the declared dependencies (requests, Flask) and
+NumPy installed, since those change what an unguarded import would pull in.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / "startup_budget.json"
+# Budgets written by --update leave this much headroom over the measured median.
+UPDATE_HEADROOM = 1.5
+
+
+def _script(scenario, items_dir):
+    if "module" in scenario:
+        return f"import {scenario['module']}"
+    argv = scenario["argv"] + ["--items-folder", items_dir, "--online-items-url", "", "--log-level", "critical"]
+    return f"import main; main.main({argv!r})"
+
+
+def measure(scenario, items_dir):
+    """Return (total import self time in ms, set of imported module names) for one cold start."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _script(scenario, items_dir)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else "failed")
+    total_us = 0
+    modules = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        modules.add(name.strip())
+    return total_us / 1000, modules
+
+
+def _available(scenario):
+    requires = scenario.get("requires")
+    if not requires:
+        return True
+    check = subprocess.run([sys.executable, "-c", f"import {requires}"], capture_output=True)
+    return check.returncode == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update", action="store_true", help="Rewrite the budget file from this machine")
+    args = parser.parse_args(argv)
+
+    budget = json.loads(BUDGET_PATH.read_text(encoding="utf-8"))
+    failures = []
+    with tempfile.TemporaryDirectory() as items_dir:
+        for name, scenario in budget["scenarios"].items():
+            if not _available(scenario):
+                print(f"{name:<16} skipped ({scenario['requires']} not installed)")
+                continue
+            runs = [measure(scenario, items_dir) for _ in range(args.runs)]
+            median_ms = statistics.median(ms for ms, _ in runs)
+            loaded = sorted(set(scenario.get("forbidden", [])) & set.union(*(modules for _, modules in runs)))
+            limit = scenario["max_import_ms"]
+            status = "ok" if median_ms <= limit and not loaded else "OVER BUDGET"
+            print(f"{name:<16} {median_ms:8.1f} ms  (budget {limit} ms, {len(runs[0][1])} modules)  {status}")
+            if loaded:
+                print(f"{'':<16} forbidden modules loaded: {', '.join(loaded)}")
+            if args.update:
+                scenario["max_import_ms"] = round(median_ms * UPDATE_HEADROOM)
+            elif status != "ok":
+                failures.append(name)
+
+    if args.update:
+        BUDGET_PATH.write_text(json.dumps(budget, indent=2) + "\n", encoding="utf-8")
+        print(f"Updated {BUDGET_PATH}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
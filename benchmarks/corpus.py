@@ -0,0 +1,174 @@
+"""Synthetic Magic Rampage data at configurable scale, for benchmarks.
+
+Everything is derived from a seeded RNG, so the same arguments always produce
+the same corpus:
+
+    from corpus import build_corpus
+    paths = build_corpus(folder, items=10000, characters=300, strings_files=20, keys_per_file=500)
+"""
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from language_getter import TARGET_LANGUAGES  # noqa: E402
+from pipeline import FILE_MAP  # noqa: E402
+
+ELEMENTS = ("NEUTRAL", "FIRE", "WATER", "AIR", "EARTH", "DARKNESS", "LIGHT")
+WORDS = ("holy", "dark", "ancient", "cursed", "royal", "storm", "frost", "ember", "shadow", "golden")
+CLASS_HEADERS = ("helmet", "hood", "hat")
+CLASS_NAMES = ("knight", "mage", "rogue-archer", "warlock", "thief", "witch", "druid")
+# Secondary types per item type; axes include maces, which the pipeline moves to hammers.
+SECONDARY_TYPES = {
+    "armor": ("armor",),
+    "ring": ("ring",),
+    "sword": ("sword",),
+    "hammer": ("hammer",),
+    "spear": ("spear",),
+    "staff": ("staff", "grimoire"),
+    "dagger": ("dagger", "shuriken"),
+    "axe": ("axe", "axe", "mace"),
+}
+
+
+def _item_name(rng, index, item_type):
+    name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {item_type.title()} {index}"
+    # A few variants the filter drops.
+    return name + " B" if index % 97 == 0 else name
+
+
+def _item_block(rng, index, item_type):
+    secondary = rng.choice(SECONDARY_TYPES[item_type])
+    lines = [
+        f"name = {_item_name(rng, index, item_type)}",
+        f"type = {'armor' if item_type == 'armor' else 'supply' if item_type == 'ring' else 'weapon'}",
+        f"secondaryType = {secondary}",
+        f"sprite = {item_type}_{index % 200}.png" if index % 89 else f"sprite = {item_type}_dummy.png",
+        f"element = {rng.choice(ELEMENTS)}",
+        f"speedBoost = {rng.choice((1, 1.05, 1.1, 0.95))}",
+        f"jumpBoost = {rng.choice((1, 1.1, 1.2))}",
+        f"magicBoost = {rng.choice((1, 1.15, 1.3))}",
+        f"frost = {'true' if index % 7 == 0 else 'false'}",
+        f"freemiumGoldPrice = {rng.randint(0, 90) * 1000}",
+    ]
+    if item_type in ("armor", "ring"):
+        lines.append(f"armor = {rng.randint(1, 400)}")
+        lines.append(f"armorBoost = {rng.choice((1, 1.1, 1.25))}")
+        lines.append(f"maxLevelAllowed = {rng.randint(1, 10)}")
+    else:
+        lines.append(f"damage = {rng.randint(5, 900)}")
+        lines.append(f"attackCooldown = {rng.randint(200, 1200)}; // ms")
+        lines.append(f"armorBoost = {rng.choice((1, 1.1))}")
+    return "item\n{\n" + "".join(f"    {line}\n" for line in lines) + "}\n", lines[0][len("name = "):]
+
+
+def write_items(folder, items, seed=0):
+    """Spread ``items`` item blocks over the FILE_MAP files; return ``[(item_type, name)]``."""
+    rng = random.Random(seed)
+    files = list(FILE_MAP.items())
+    per_file = [items // len(files) + (1 if index < items % len(files) else 0) for index in range(len(files))]
+    written = []
+    index = 0
+    for (file_name, item_type), count in zip(files, per_file):
+        with open(Path(folder) / file_name, "w", encoding="utf-8") as handle:
+            handle.write(f"// generated: {count} {item_type} item(s)\n")
+            for _ in range(count):
+                block, name = _item_block(rng, index, item_type)
+                handle.write(block)
+                written.append((item_type, name))
+                index += 1
+    return written
+
+
+def online_items(written, seed=0):
+    """Online-gist style entries for ``written`` items, with a localized name per language."""
+    rng = random.Random(seed + 1)
+    entries = []
+    for item_type, name in written:
+        weapon = item_type not in ("armor", "ring")
+        entry = {
+            "name": name,
+            "name_en": name,
+            "type": "weapon" if weapon else item_type,
+            "secondaryType": item_type,
+            "sprite": f"{item_type}.png",
+            "freemiumGoldPrice": rng.randint(0, 90) * 1000,
+            "premiumCoinPrice": rng.randint(0, 500),
+        }
+        entry.update({f"name_{lang}": f"{name} ({lang})" for lang in TARGET_LANGUAGES})
+        entry["maxLevelDamage" if weapon else "maxLevelArmor"] = rng.randint(100, 5000)
+        entries.append(entry)
+    # Unmatched online-only entries, as in the real gist.
+    entries.extend({"name": f"Essence {index}", "type": "supply", "secondaryType": "essence"}
+                   for index in range(len(written) // 20))
+    rng.shuffle(entries)
+    return entries
+
+
+def write_class_heads(folder, count, seed=0):
+    rng = random.Random(seed + 2)
+    with open(Path(folder) / "class-heads.enml", "w", encoding="utf-8") as handle:
+        for index in range(count):
+            handle.write(f"{CLASS_HEADERS[index % 3]}{index}\n{{\n")
+            handle.write(f"    class = {rng.choice(CLASS_NAMES)}\n")
+            handle.write(f"    armorBoost = {rng.choice((1, 1.1, 1.2))}\n")
+            handle.write(f"    {rng.choice(('magic', 'sword', 'dagger', 'axe'))}Boost = 1.25\n")
+            handle.write("}\n")
+
+
+def write_characters(folder, count, seed=0):
+    rng = random.Random(seed + 3)
+    for index in range(count):
+        lines = [
+            "character {",
+            f"  resistance = {rng.randint(1, 5000)};",
+            f"  speed = {rng.randint(10, 90) / 100};",
+            f"  jumpImpulse = {rng.randint(100, 500) / 100};",
+            '  patrolBehaviour = "walk";',
+            '  attackBehaviour = "slash";',
+            f"  passiveDamage = {rng.randint(0, 50)};",
+            "}",
+        ]
+        for slot in range(rng.randint(0, 4)):
+            lines += [
+                f"equippedItem{slot} {{",
+                f"  damage = {rng.randint(1, 60)};",
+                f"  armor = {rng.randint(0, 20)};",
+                f"  speedBoost = {rng.choice((1, 1.1, 1.4))};",
+                "}",
+            ]
+        (Path(folder) / f"enemy-{index}.character").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def write_strings_tree(folder, files, keys_per_file, seed=0):
+    """Write ``lang/<code>/*.strings`` for English and every target language; return the lang dir."""
+    rng = random.Random(seed + 4)
+    lang_dir = Path(folder) / "lang"
+    for code in ("en",) + tuple(TARGET_LANGUAGES):
+        (lang_dir / code).mkdir(parents=True, exist_ok=True)
+    for file_index in range(files):
+        keys = [f"{rng.choice(WORDS)}-{rng.choice(WORDS)}_{file_index}{key}" for key in range(keys_per_file)]
+        for code in ("en",) + tuple(TARGET_LANGUAGES):
+            with open(lang_dir / code / f"pack{file_index}.strings", "w", encoding="utf-8") as handle:
+                handle.write("# generated\n")
+                for key in keys:
+                    handle.write(f'"{key}" = "{code} text for {key} <number>{rng.randint(1, 99)}</number>";\n')
+    return lang_dir
+
+
+def build_corpus(folder, items, characters=300, strings_files=20, keys_per_file=500, seed=0):
+    """Write a full corpus under ``folder`` and return the paths the benchmarks need."""
+    root = Path(folder)
+    items_dir = root / "items"
+    enemies_dir = root / "enemies"
+    items_dir.mkdir(parents=True, exist_ok=True)
+    enemies_dir.mkdir(parents=True, exist_ok=True)
+    written = write_items(items_dir, items, seed)
+    online_path = root / "online_items.json"
+    online_path.write_text(json.dumps(online_items(written, seed), ensure_ascii=False), encoding="utf-8")
+    write_class_heads(items_dir, max(3, items // 100), seed)
+    write_characters(enemies_dir, characters, seed)
+    lang_dir = write_strings_tree(root, strings_files, keys_per_file, seed)
+    return {"items": items_dir, "enemies": enemies_dir, "online": online_path, "lang": lang_dir}
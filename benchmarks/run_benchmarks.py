@@ -0,0 +1,158 @@
+"""Per-stage timings of the parsing and export pipeline on synthetic corpora.
+
+Generates a corpus per scale (see corpus.py), times every stage separately
+(best of ``--repeat`` runs) and writes the results as JSON:
+
+    python benchmarks/run_benchmarks.py --scales 1000,10000,100000 --output bench.json
+    python benchmarks/run_benchmarks.py --scales 1000 --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import armor_ring_parser  # noqa: E402
+import language_getter  # noqa: E402
+import weapon_parser  # noqa: E402
+from class_parser import ClassParser  # noqa: E402
+from corpus import build_corpus  # noqa: E402
+from enemy_parser import EnemyParser  # noqa: E402
+from file_parser import FileParser  # noqa: E402
+from filter_util import DataFilter  # noqa: E402
+from formatter import OutputFormatter  # noqa: E402
+from models import WEAPON_TYPES  # noqa: E402
+from online_data import OnlineDataManager  # noqa: E402
+from pipeline import FILE_MAP, ItemPipeline  # noqa: E402
+
+
+def _copy(grouped):
+    return {item_type: [dict(item) for item in items] for item_type, items in grouped.items()}
+
+
+def timed(repeat, func, setup=None):
+    """Best and all wall times of ``func(setup())`` over ``repeat`` runs, plus the last result."""
+    runs = []
+    result = None
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        started = time.perf_counter()
+        result = func(argument) if setup else func()
+        runs.append(time.perf_counter() - started)
+    return {"seconds": min(runs), "runs": [round(run, 6) for run in runs]}, result
+
+
+def run_scale(items, args):
+    stages = {}
+
+    def stage(name, func, setup=None):
+        stages[name], result = timed(args.repeat, func, setup)
+        return result
+
+    with tempfile.TemporaryDirectory() as folder:
+        started = time.perf_counter()
+        paths = build_corpus(folder, items, characters=args.characters, strings_files=args.strings_files,
+                             keys_per_file=args.keys)
+        generated = time.perf_counter() - started
+
+        manager = OnlineDataManager(bundled_items_path=paths["online"])
+        online = manager.validate_online_item_data(json.loads(paths["online"].read_text(encoding="utf-8")))
+
+        local = stage("FileParser.parse_files", FileParser(str(paths["items"]), FILE_MAP).parse_files)
+        filtered = stage("DataFilter.filter_parsed_data", DataFilter().filter_parsed_data, lambda: _copy(local))
+        merged = stage("OnlineDataManager.merge_online_fields",
+                       lambda data: OnlineDataManager().merge_online_fields(data, online),
+                       lambda: _copy(filtered))
+        reclassified = ItemPipeline.reclassify_axes_and_hammers(_copy(merged))
+        records = ItemPipeline.to_records(stage("ItemPipeline.sort_grouped_items",
+                                                ItemPipeline.sort_grouped_items, lambda: _copy(reclassified)))
+
+        for item_type, type_records in records.items():
+            module = armor_ring_parser if item_type in ("armor", "ring") else weapon_parser
+            generate = getattr(module, f"generate_{item_type}_code")
+            stage(f"generate_{item_type}_code", lambda: generate(type_records))
+        stage("OutputFormatter.format_human_armor", lambda: OutputFormatter.format_human_armor(records["armor"]))
+        stage("OutputFormatter.format_human_ring", lambda: OutputFormatter.format_human_ring(records["ring"]))
+        for weapon_type in sorted(WEAPON_TYPES):
+            stage(f"OutputFormatter.format_human_weapon[{weapon_type}]",
+                  lambda: OutputFormatter.format_human_weapon(records[weapon_type], default_weapon_type=weapon_type))
+
+        class_file = str(paths["items"] / "class-heads.enml")
+        stage("ClassParser.generate_class_code", lambda: ClassParser(class_file).generate_class_code())
+        for mode in ("developer", "normal"):
+            stage(f"EnemyParser.parse_enemy_stats[{mode}]",
+                  lambda: EnemyParser([str(paths["enemies"])]).parse_enemy_stats(mode=mode))
+
+        en_dir = str(paths["lang"] / "en")
+        with contextlib.redirect_stdout(io.StringIO()):  # the builders print progress
+            stage("language_getter.create_key_locations_map",
+                  lambda: language_getter.create_key_locations_map(en_dir))
+            stage("language_getter.create_english_text_db", lambda: language_getter.create_english_text_db(en_dir))
+            stage("language_getter.create_translations_db",
+                  lambda: language_getter.create_translations_db(str(paths["lang"])))
+
+    return {
+        "items": items,
+        "parsed_items": sum(len(group) for group in local.values()),
+        "characters": args.characters,
+        "strings_files": args.strings_files,
+        "keys_per_file": args.keys,
+        "corpus_seconds": round(generated, 3),
+        "stages": stages,
+    }
+
+
+def compare(current, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    previous = {scale["items"]: scale["stages"] for scale in baseline["scales"]}
+    for scale in current["scales"]:
+        old_stages = previous.get(scale["items"])
+        if old_stages is None:
+            continue
+        print(f"\n{scale['items']} items vs {baseline_path}:")
+        for name, result in scale["stages"].items():
+            if name in old_stages and old_stages[name]["seconds"]:
+                ratio = result["seconds"] / old_stages[name]["seconds"]
+                print(f"  {name:<50} {result['seconds']:9.4f}s  x{ratio:5.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1000,10000,100000", help="Comma-separated item counts")
+    parser.add_argument("--characters", type=int, default=300)
+    parser.add_argument("--strings-files", type=int, default=20)
+    parser.add_argument("--keys", type=int, default=500, help="Keys per .strings file")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results to this JSON file (default: stdout)")
+    parser.add_argument("--compare", help="Print per-stage ratios against an earlier results file")
+    args = parser.parse_args(argv)
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "scales": [],
+    }
+    for items in (int(scale) for scale in args.scales.split(",")):
+        print(f"benchmarking {items} items...", file=sys.stderr)
+        results["scales"].append(run_scale(items, args))
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,50 @@
 import os
 import logging
-from parser_utils import parse_scalar, process_boost
+from enml_tokenizer import read_enml_blocks
+from parser_utils import ValueDecoder, boost_columns
 from models import ClassRecord
 
 logger = logging.getLogger(__name__)
 
+
+CLASS_BOOST_FIELDS = (
+    "armorBoost", "magicBoost", "swordBoost", "daggerBoost", "hammerBoost",
+    "axeBoost", "spearBoost", "staffBoost", "speedBoost", "jumpBoost",
+)
+
+
+def is_class_header(name):
+    return name.startswith(("helmet", "hood", "hat"))
+
+
 class ClassParser:
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache=None):
         self.file_path = file_path
+        self.cache = cache
 
-    def parse_class_block(self, block_text):
-        item = {}
-        for line in block_text.strip().splitlines():
-            if '//' in line:
-                line = line.split('//')[0]
-            line = line.strip()
-            if "=" in line:
-                try:
-                    key, value = line.split("=", 1)
-                except Exception as e:
-                    logger.debug("Malformed line in class block: %s", e)
-                    continue
-                item[key.strip()] = parse_scalar(value)
-        return item
+    @staticmethod
+    def read_blocks(file_path):
+        """Return (identifier, fields) pairs for every class block in the file."""
+        return [
+            (identifier, fields)
+            for identifier, fields, _ in read_enml_blocks(file_path, is_class_header, ValueDecoder().decode)
+        ]
 
     def parse_file(self):
         if not os.path.exists(self.file_path):
             logger.debug("Class file not found: %s", self.file_path)
             return []
-        with open(self.file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        blocks = []
-        block_lines = []
-        inside_block = False
-        pending_item = False
-        current_identifier = ""
-        for line in lines:
-            s = line.strip()
-            # skip blank or comment
-            if not s or s.startswith("//"):
-                continue
-
-            # start of a class block
-            if s.startswith(("helmet","hood","hat")):
-                pending_item = True
-                current_identifier = s
-                continue
 
-            if pending_item and "{" in s:
-                inside_block = True
-                pending_item = False
-                block_lines = [s.split("{",1)[1]]
-                continue
+        if self.cache is not None:
+            raw_blocks = self.cache.load("class", self.file_path, self.read_blocks)
+        else:
+            raw_blocks = self.read_blocks(self.file_path)
 
-            if inside_block:
-                if "}" in s:
-                    inside_block = False
-                    block_text = "\n".join(block_lines)
-                    block = self.parse_class_block(block_text)
-                    block["identifier"] = current_identifier
-                    blocks.append(ClassRecord.from_mapping(block))
-                    block_lines = []
-                    continue
-                block_lines.append(s)
+        blocks = []
+        for identifier, fields in raw_blocks:
+            block = dict(fields)
+            block["identifier"] = identifier
+            blocks.append(ClassRecord.from_mapping(block))
 
         logger.info("Parsed %s class block(s)", len(blocks))
         return blocks
@@ -71,29 +52,31 @@ class ClassParser:
     def compute_parameters(self, block):
         # order must match your CharacterClass ctor:
         # armor, magic, sword, dagger, hammer, axe, spear, staff, speed, jump
-        p1 = process_boost(block.get("armorBoost", 1))
-        p2 = process_boost(block.get("magicBoost", 1))
-        p3 = process_boost(block.get("swordBoost", 1))
-        p4 = process_boost(block.get("daggerBoost", 1))
-        p5 = process_boost(block.get("hammerBoost", 1))
-        p6 = process_boost(block.get("axeBoost", 1))
-        p7 = process_boost(block.get("spearBoost", 1))
-        p8 = process_boost(block.get("staffBoost", 1))
-        p9 = process_boost(block.get("speedBoost", 1))
-        p10 = process_boost(block.get("jumpBoost", 1))
-
-        return (p1, p2, p3, p4, p5, p6, p7, p8, p9, p10)
+        return self.compute_parameter_rows([block])[0]
 
-    def generate_class_code(self):
-        blocks = self.parse_file()
-        code_lines = []
-        for block in blocks:
-            block = block.as_dict()
+    @staticmethod
+    def compute_parameter_rows(blocks):
+        """Boost percentages of every block in CLASS_BOOST_FIELDS order, computed column-wise."""
+        columns = boost_columns(blocks, CLASS_BOOST_FIELDS)
+        return list(zip(*(columns[field] for field in CLASS_BOOST_FIELDS))) if blocks else []
+
+    def _named_blocks(self):
+        """Parsed class blocks that define a class, as (class name, block) pairs."""
+        named = []
+        for block in self.parse_file():
+            block = block.as_mapping()
             cls = block.get("class", "").strip().lower()
             if not cls:
                 logger.debug("Class block %s has no class field", block.get("identifier", ""))
                 continue
-            params = self.compute_parameters(block)
+            named.append((cls, block))
+        return named
+
+    def generate_class_code(self):
+        named = self._named_blocks()
+        rows = self.compute_parameter_rows([block for _, block in named])
+        code_lines = []
+        for (cls, _), params in zip(named, rows):
             enum_name = cls.upper().replace("-", "_")
             drawable  = f"R.drawable.class_{cls.replace('-', '_')}"
             line = (
@@ -105,24 +88,12 @@ class ClassParser:
         return code_lines
 
     def format_class_human(self):
-        blocks = self.parse_file()
+        named = self._named_blocks()
+        rows = self.compute_parameter_rows([block for _, block in named])
         lines = []
-        for block in blocks:
-            block = block.as_dict()
-            cls_val = block.get("class", "").strip().lower()
-            if not cls_val:
-                continue
-
-            armorBonus = process_boost(block.get("armorBoost", 1))
-            magicBonus = process_boost(block.get("magicBoost", 1))
-            swordBonus = process_boost(block.get("swordBoost", 1))
-            daggerBonus = process_boost(block.get("daggerBoost", 1))
-            hammerBonus = process_boost(block.get("hammerBoost", 1))
-            axeBonus = process_boost(block.get("axeBoost", 1))
-            spearBonus = process_boost(block.get("spearBoost", 1))
-            staffBonus = process_boost(block.get("staffBoost", 1))
-            speedBonus = process_boost(block.get("speedBoost", 1))
-            jumpImpulseBonus = process_boost(block.get("jumpBoost", 1))
+        for (cls_val, _), params in zip(named, rows):
+            (armorBonus, magicBonus, swordBonus, daggerBonus, hammerBonus,
+             axeBonus, spearBonus, staffBonus, speedBonus, jumpImpulseBonus) = params
 
             line = (
                 f"Class: {cls_val.title()}, Armor Bonus: {armorBonus}%, Magic Bonus: {magicBonus}%, "
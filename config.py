@@ -4,6 +4,8 @@ import os
 from dataclasses import dataclass
 from pathlib import Path
 
+from enml_tokenizer import SCANNERS
+
 DEFAULT_ITEMS_FOLDER = r"C:\Program Files (x86)\Steam\steamapps\common\Magic Rampage\items"
 DEFAULT_ENEMY_DIRECTORIES = [
     r"C:\Program Files (x86)\Steam\steamapps\common\Magic Rampage\npcs\enemies",
@@ -12,6 +14,9 @@ DEFAULT_ENEMY_DIRECTORIES = [
 DEFAULT_ONLINE_ITEMS_URL = "https://gist.githubusercontent.com/andresan87/5670c559e5a930129aa03dfce7827306/raw/items.json"
 DEFAULT_OUTPUT_DIR = "output"
 DEFAULT_BASELINE = "items.json"
+DEFAULT_CACHE_DIR = ".cache"
+DEFAULT_CACHE_SIZE_MB = 64
+DEFAULT_ONLINE_MAX_AGE = 300
 OUTPUT_TYPES = ("developer", "normal")
 ITEM_TYPES = ("armor", "ring", "sword", "hammer", "spear", "staff", "dagger", "axe", "all", "class", "enemy", "diff")
 APP_VERSION = "0.1.0"  # keep in sync with pyproject.toml
@@ -28,6 +33,20 @@ class AppConfig:
     log_level: str
     to_stdout: bool
     baseline: Path = Path(DEFAULT_BASELINE)
+    jobs: int = 1
+    export_jobs: int = 1
+    cache_dir: Path | None = None
+    cache_size_mb: int = DEFAULT_CACHE_SIZE_MB
+    cache_hash: bool = False
+    scanner: str = "stream"
+    online_max_age: int = DEFAULT_ONLINE_MAX_AGE
+    online_stream: bool = False
+    online_fields: tuple[str, ...] | None = None
+    snapshot: bool = False
+    profile: bool = False
+    filter_rules: Path | None = None
+    watch: bool = False
+    profile_trace: Path | None = None
 
 
 def _split_env_paths(value):
@@ -37,6 +56,13 @@ def _split_env_paths(value):
     return tuple(Path(part) for part in parts) if parts else None
 
 
+def _split_fields(value):
+    if not value:
+        return None
+    fields = tuple(part.strip() for part in value.split(",") if part.strip())
+    return fields or None
+
+
 def parse_args(argv=None):
     parser = argparse.ArgumentParser("Parse Magic Rampage ENML files")
     parser.add_argument("output_type", choices=OUTPUT_TYPES, nargs="?", default="normal")
@@ -47,10 +73,53 @@ def parse_args(argv=None):
     parser.add_argument("--output-dir", default=os.getenv("MAGIC_RAMPAGE_OUTPUT_DIR", DEFAULT_OUTPUT_DIR))
     parser.add_argument("--log-level", default=os.getenv("MAGIC_RAMPAGE_LOG_LEVEL", "INFO"))
     parser.add_argument("--baseline", default=os.getenv("MAGIC_RAMPAGE_BASELINE", DEFAULT_BASELINE), help="Path to the baseline items.json for diff")
+    parser.add_argument("--jobs", type=int, default=int(os.getenv("MAGIC_RAMPAGE_JOBS", "1")),
+                        help="Number of worker processes used to parse item files")
+    parser.add_argument("--export-jobs", type=int, default=int(os.getenv("MAGIC_RAMPAGE_EXPORT_JOBS", "1")),
+                        help="Number of worker processes used to format the sections of 'all'; only used "
+                             "for datasets of at least 20000 items, smaller ones are formatted in-process")
+    parser.add_argument("--cache-dir", default=os.getenv("MAGIC_RAMPAGE_CACHE_DIR"),
+                        help="Directory for the on-disk parse cache (disabled when omitted)")
+    parser.add_argument("--cache-size-mb", type=int, default=DEFAULT_CACHE_SIZE_MB,
+                        help="Size cap of the parse cache; least recently used entries are evicted")
+    parser.add_argument("--cache-hash", action="store_true",
+                        help="Also verify cached files by content hash, not only size and mtime")
+    parser.add_argument("--scanner", choices=SCANNERS, default=os.getenv("MAGIC_RAMPAGE_SCANNER", "stream"),
+                        help="ENML scanning backend: line-based stream or memory-mapped bytes")
+    parser.add_argument("--online-max-age", type=int,
+                        default=int(os.getenv("MAGIC_RAMPAGE_ONLINE_MAX_AGE", str(DEFAULT_ONLINE_MAX_AGE))),
+                        help="Seconds a cached online item response is reused without revalidation "
+                             "(needs --cache-dir)")
+    parser.add_argument("--online-stream", action="store_true",
+                        help="Decode the online item JSON one item at a time instead of all at once")
+    parser.add_argument("--online-fields", default=os.getenv("MAGIC_RAMPAGE_ONLINE_FIELDS"),
+                        help="Comma-separated field patterns kept from streamed online items "
+                             "(e.g. 'maxLevel*,*Price'; name, type and secondaryType are always kept)")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Start from a binary snapshot of the merged items when the inputs are unchanged "
+                             "(stored in --cache-dir; reused with a fresh cached online response, or offline "
+                             "with an empty --online-items-url while the bundled items.json is unchanged)")
+    parser.add_argument("--filter-rules", default=os.getenv("MAGIC_RAMPAGE_FILTER_RULES"), metavar="PATH",
+                        help="JSON file of item exclusion rules replacing the built-in ones "
+                             '(or extending them with {"include_defaults": true, "rules": [...]})')
+    parser.add_argument("--profile", action="store_true",
+                        help="Print wall and CPU time per stage (parse per file, online fetch, merge, filter, "
+                             "reclassify, sort, format and write per section) to stderr")
+    parser.add_argument("--profile-trace", metavar="PATH",
+                        help="Also write the stage timings as Chrome trace-event JSON (implies --profile)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and regenerate the affected outputs whenever an item, class or enemy "
+                             "file changes")
     parser.add_argument("--stdout", action="store_true",
                         help="Print generated output to stdout instead of writing files")
     parser.add_argument("--version", action="version", version=f"magic-rampage-item-parser {APP_VERSION}")
     args = parser.parse_args(argv)
+    if args.snapshot and not args.cache_dir:
+        parser.error("--snapshot requires --cache-dir")
+    if args.watch and args.item_type == "diff":
+        parser.error("--watch does not support the diff command")
+    if args.filter_rules and not os.path.isfile(args.filter_rules):
+        parser.error(f"--filter-rules file not found: {args.filter_rules}")
 
     env_enemy_dirs = _split_env_paths(os.getenv("MAGIC_RAMPAGE_ENEMY_DIRS"))
     cli_enemy_dirs = tuple(Path(path) for path in args.enemy_dirs) if args.enemy_dirs else None
@@ -66,6 +135,20 @@ def parse_args(argv=None):
         log_level=args.log_level.upper(),
         to_stdout=args.stdout,
         baseline=Path(args.baseline),
+        jobs=max(1, args.jobs),
+        export_jobs=max(1, args.export_jobs),
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        cache_size_mb=args.cache_size_mb,
+        cache_hash=args.cache_hash,
+        scanner=args.scanner,
+        online_max_age=max(0, args.online_max_age),
+        online_stream=args.online_stream,
+        online_fields=_split_fields(args.online_fields),
+        snapshot=args.snapshot,
+        filter_rules=Path(args.filter_rules) if args.filter_rules else None,
+        watch=args.watch,
+        profile=args.profile or bool(args.profile_trace),
+        profile_trace=Path(args.profile_trace) if args.profile_trace else None,
     )
 
 
@@ -6,6 +6,7 @@ from file_parser import FileParser
 from filter_util import DataFilter
 from online_data import OnlineDataManager
 from pipeline import FILE_MAP
+from profiler import NULL_PROFILER
 
 logger = logging.getLogger(__name__)
 
@@ -18,17 +19,25 @@ class DiffChecker:
     Changed = item exists in both but a stat from the ENML differs from the gist value.
     """
 
-    def __init__(self, items_folder, online_items_url, file_map=None, data_filter=None, online_manager=None):
+    def __init__(self, items_folder, online_items_url, file_map=None, data_filter=None, online_manager=None,
+                 max_workers=None, cache=None, scanner="stream", profiler=None):
         self.items_folder = Path(items_folder)
         self.online_items_url = online_items_url
         self.file_map = file_map or FILE_MAP
         self.data_filter = data_filter or DataFilter()
         self.online_manager = online_manager or OnlineDataManager()
+        self.max_workers = max_workers
+        self.cache = cache
+        self.scanner = scanner
+        self.profiler = profiler or NULL_PROFILER
 
     def load_local(self):
         """Parse ENML files and return a name→item dict."""
-        parsed = FileParser(str(self.items_folder), self.file_map).parse_files()
-        filtered = self.data_filter.filter_parsed_data(parsed)
+        with self.profiler.stage("local parse"):
+            parsed = FileParser(str(self.items_folder), self.file_map, max_workers=self.max_workers,
+                               cache=self.cache, scanner=self.scanner, profiler=self.profiler).parse_files()
+        with self.profiler.stage("filter"):
+            filtered = self.data_filter.filter_parsed_data(parsed)
         flat = {}
         for items in filtered.values():
             for item in items:
@@ -39,7 +48,8 @@ class DiffChecker:
 
     def load_online(self):
         """Fetch the gist and return a name→item dict."""
-        raw = self.online_manager.get_online_item_data(self.online_items_url)
+        with self.profiler.stage("online fetch"):
+            raw = self.online_manager.get_online_item_data(self.online_items_url)
         if not raw:
             return {}
         return {item["name"]: item for item in raw if "name" in item}
@@ -78,7 +88,8 @@ class DiffChecker:
         if not local:
             logger.warning("No items parsed from local ENML files — check your items folder path in Settings.")
 
-        new_items, removed_items, changes = self.compare(local, online)
+        with self.profiler.stage("compare"):
+            new_items, removed_items, changes = self.compare(local, online)
         return new_items, removed_items, changes, local
 
     @staticmethod
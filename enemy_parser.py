@@ -1,80 +1,73 @@
 import re
 import logging
 from pathlib import Path
-from parser_utils import parse_scalar
-from models import EnemyRecord
+from enml_tokenizer import read_enml_blocks
+from parser_utils import ValueDecoder
+from models import EnemyRecord, record_to_mapping
 
 logger = logging.getLogger(__name__)
 
+ENEMY_BLOCK_PATTERN = re.compile(r"character|equippedItem\d+", re.IGNORECASE)
+CHARACTER_PATTERN = re.compile(r"character", re.IGNORECASE)
+EQUIPPED_ITEM_PATTERN = re.compile(r"equippedItem\d+", re.IGNORECASE)
+
+
+def enemy_value_converter():
+    decoder = ValueDecoder()
+    return lambda key, value: decoder.decode(key, value.strip('"'))
+
+
 class EnemyParser:
-    def __init__(self, directories):
+    def __init__(self, directories, cache=None, scanner="stream"):
         self.directories = directories
-
-    def parse_character_block(self, block_text):
-        enemy = {}
-        depth = 0
-        for raw_line in block_text.strip().splitlines():
-            line = raw_line.split('//')[0].strip()
-            if not line:
-                continue
-            if depth == 0 and '=' in line:
-                key, value = line.split('=', 1)
-                key = key.strip()
-                parsed = parse_scalar(value.strip().strip('"'))
-                enemy[key] = parsed
-            depth += line.count('{')
-            depth -= line.count('}')
-        return enemy
-
-    def extract_named_blocks(self, content, block_pattern):
-        blocks = []
-        pattern = re.compile(rf"\b(?:{block_pattern})\s*\{{", re.IGNORECASE)
-        pos = 0
-
-        while True:
-            match = pattern.search(content, pos)
-            if not match:
-                break
-
-            brace_start = content.find("{", match.start())
-            depth = 1
-            index = brace_start + 1
-            while index < len(content) and depth > 0:
-                char = content[index]
-                if char == "{":
-                    depth += 1
-                elif char == "}":
-                    depth -= 1
-                index += 1
-
-            if depth == 0:
-                blocks.append(content[brace_start + 1:index - 1])
-            pos = index
-
-        return blocks
+        self.cache = cache
+        self.scanner = scanner
+
+    def read_blocks(self, file_path):
+        """Tokenize a .character file into (header, fields) pairs, keeping top-level fields only."""
+        if self.cache is not None:
+            return self.cache.load("enemy", file_path, self._tokenize)
+        return self._tokenize(file_path)
+
+    def _tokenize(self, file_path):
+        blocks = read_enml_blocks(file_path, ENEMY_BLOCK_PATTERN.fullmatch, enemy_value_converter(),
+                                  nested=False, scanner=self.scanner)
+        return [(header, fields) for header, fields, _ in blocks]
+
+    @staticmethod
+    def index_blocks(blocks):
+        """Group a file's block fields by kind ("character", "equippedItem") in one pass, in file order."""
+        index = {"character": [], "equippedItem": []}
+        for header, fields in blocks:
+            if CHARACTER_PATTERN.fullmatch(header):
+                index["character"].append(fields)
+            elif EQUIPPED_ITEM_PATTERN.fullmatch(header):
+                index["equippedItem"].append(fields)
+        return index
+
+    @staticmethod
+    def aggregate_item_stats(item_blocks):
+        item_stats = {"damage": 0, "armor": 0, "speedBoost": 1.0, "jumpBoost": 1.0}
+        for parsed in item_blocks:
+            for key in item_stats:
+                val = parsed.get(key)
+                if val:
+                    if key in ["speedBoost", "jumpBoost"]:
+                        item_stats[key] *= val
+                    else:
+                        item_stats[key] += val
+        return item_stats
 
     def parse_file(self, file_path):
         enemies = []
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
-        character_blocks = self.extract_named_blocks(content, r"character")
-
-        for block in character_blocks:
-            character = self.parse_character_block(block)
-            item_stats = {"damage": 0, "armor": 0, "speedBoost": 1.0, "jumpBoost": 1.0}
-            # equippedItem blocks are siblings of the character block (not nested
-            # inside it), so scan the whole file content, not just the character body.
-            item_blocks = self.extract_named_blocks(content, r"equippedItem\d+")
-            for item in item_blocks:
-                parsed = self.parse_character_block(item)
-                for key in item_stats:
-                    val = parsed.get(key)
-                    if val:
-                        if key in ["speedBoost", "jumpBoost"]:
-                            item_stats[key] *= val
-                        else:
-                            item_stats[key] += val
-            character["_items"] = item_stats
+        index = self.index_blocks(self.read_blocks(file_path))
+        # equippedItem blocks are siblings of the character block (not nested
+        # inside it), so every character of a file gets the stats of all of them.
+        item_stats = self.aggregate_item_stats(index["equippedItem"])
+
+        for block in index["character"]:
+            character = dict(block)
+            character["_items"] = dict(item_stats)
             character["_filename"] = file_path.stem  # Store file name (stem only, no extension)
             enemies.append(character)
         return enemies
@@ -141,11 +134,10 @@ class EnemyParser:
 
     def export_to_txt(self, enemies, output_path, mode="normal"):
         name_counts = {}
-        sorted_enemies = sorted(enemies, key=lambda e: e.as_dict().get("resistance", 0) if hasattr(e, "as_dict") else e.get("resistance", 0))
+        sorted_enemies = sorted(enemies, key=lambda e: record_to_mapping(e).get("resistance", 0))
         with open(output_path, "w", encoding="utf-8") as f:
             for enemy in sorted_enemies:
-                if hasattr(enemy, "as_dict"):
-                    enemy = enemy.as_dict()
+                enemy = record_to_mapping(enemy)
                 if mode == "developer":
                     f.write(self.format_developer(enemy, name_counts) + "\n")
                 else:
@@ -153,11 +145,11 @@ class EnemyParser:
 
     def parse_enemy_stats(self, mode="normal"):
         enemies = self.parse_enemy_data()
-        sorted_enemies = sorted(enemies, key=lambda e: e.as_dict().get("resistance", 0))
+        sorted_enemies = sorted(enemies, key=lambda e: e.get("resistance", 0))
         lines = []
         name_counts = {}
         for enemy in sorted_enemies:
-            enemy = enemy.as_dict()
+            enemy = enemy.as_mapping()
             if mode == "developer":
                 lines.append(self.format_developer(enemy, name_counts))
             else:
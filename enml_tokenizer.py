@@ -0,0 +1,162 @@
+"""Streaming tokenizer shared by the item, class and enemy ENML parsers."""
+import mmap
+import re
+
+SCANNERS = ("stream", "mmap")
+
+# One token per match: line breaks (the same ones text-mode files split on),
+# comments, braces, and runs of any other text. Text runs are decoded and
+# stripped like the line tokenizer strips its line segments, so both scanners
+# accept the same keys, values and headers.
+_BYTE_TOKEN = re.compile(rb"""
+      (?P<newline>\r\n|\r|\n)
+    | //[^\r\n]*
+    | (?P<open>\{)
+    | (?P<close>\})
+    | (?P<text>(?:[^\r\n{}/]|/(?!/))+)
+""", re.VERBOSE)
+
+
+def iter_enml_events(lines, is_header, nested=True):
+    """Yield ``(block_header, key, value, line_no)`` events from ENML text lines.
+
+    A block starts at a top-level identifier accepted by ``is_header`` and
+    opens at the next ``{`` (on the same or a following line). Every
+    ``key = value`` assignment inside it is yielded with its raw value text
+    (comments and surrounding whitespace removed). Assignments in nested
+    sub-blocks are only included when ``nested`` is true. When a block
+    closes, a final ``(block_header, None, None, line_no)`` event is yielded;
+    unterminated blocks produce no closing event.
+    """
+    header = None   # header of the block currently being read
+    pending = None  # header seen, still waiting for its opening brace
+    depth = 0
+    for line_no, raw in enumerate(lines, 1):
+        line = raw.split("//", 1)[0].strip()
+        while line:
+            if header is None:
+                if pending is None:
+                    name = line.split("{", 1)[0].strip()
+                    if "=" in name or not is_header(name):
+                        break
+                    pending = name
+                if "{" not in line:
+                    break
+                line = line.split("{", 1)[1].strip()
+                header, pending, depth = pending, None, 1
+                continue
+
+            brace = _first_brace(line)
+            text = line if brace < 0 else line[:brace]
+            if "=" in text and (nested or depth == 1):
+                key, value = text.split("=", 1)
+                yield header, key.strip(), value.strip(), line_no
+            if brace < 0:
+                break
+            if line[brace] == "{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    yield header, None, None, line_no
+                    header = None
+            line = line[brace + 1:].strip()
+
+
+def iter_enml_events_mmap(file_path, is_header, nested=True):
+    """Same events as :func:`iter_enml_events`, scanned from a memory-mapped file.
+
+    Block boundaries and text spans are found on the raw bytes; only header
+    candidates, keys and values are decoded to ``str``.
+    """
+    with open(file_path, "rb") as handle:
+        try:
+            data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            return
+    with data:
+        keys = {}
+        header = None
+        pending = None  # header seen, still waiting for its opening brace
+        name = b""  # text of the current line segment outside any block
+        skip_line = False  # the line tokenizer stops reading this line
+        depth = 0
+        line_no = 1
+        for match in _BYTE_TOKEN.finditer(data):
+            kind = match.lastgroup
+            if kind == "newline":
+                if header is None and pending is None and not skip_line:
+                    candidate = name.decode("utf-8").strip()
+                    if candidate and "=" not in candidate and is_header(candidate):
+                        pending = candidate
+                line_no += 1
+                name = b""
+                skip_line = False
+            elif skip_line or kind is None:
+                continue
+            elif header is None:
+                if pending is not None:
+                    if kind == "open":
+                        header, pending, depth = pending, None, 1
+                elif kind == "open":
+                    candidate = name.decode("utf-8").strip()
+                    name = b""
+                    if "=" in candidate or not is_header(candidate):
+                        skip_line = True
+                    else:
+                        header, depth = candidate, 1
+                else:
+                    name += match.group()
+            elif kind == "text":
+                if nested or depth == 1:
+                    text = match.group("text")
+                    if b"=" in text:
+                        raw_key, value = text.split(b"=", 1)
+                        key = keys.get(raw_key)
+                        if key is None:
+                            key = keys[raw_key] = raw_key.decode("utf-8").strip()
+                        yield header, key, value.decode("utf-8").strip(), line_no
+            elif kind == "open":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    yield header, None, None, line_no
+                    header = None
+
+
+def group_enml_blocks(events, convert):
+    """Group tokenizer events into ``(block_header, fields, line_no)`` per closed block.
+
+    ``convert(key, value)`` turns the raw value text into the stored field value;
+    ``line_no`` is the line the block closed on.
+    """
+    fields = {}
+    for header, key, value, line_no in events:
+        if key is None:
+            yield header, fields, line_no
+            fields = {}
+        else:
+            fields[key] = convert(key, value)
+
+
+def iter_enml_blocks(lines, is_header, convert, nested=True):
+    return group_enml_blocks(iter_enml_events(lines, is_header, nested), convert)
+
+
+def read_enml_blocks(file_path, is_header, convert, nested=True, scanner="stream"):
+    """Tokenize ``file_path`` with the chosen scanner and return its closed blocks."""
+    if scanner == "mmap":
+        return list(group_enml_blocks(iter_enml_events_mmap(file_path, is_header, nested), convert))
+    with open(file_path, "r", encoding="utf-8") as handle:
+        return list(iter_enml_blocks(handle, is_header, convert, nested))
+
+
+def _first_brace(text):
+    opening = text.find("{")
+    closing = text.find("}")
+    if opening < 0:
+        return closing
+    if closing < 0:
+        return opening
+    return min(opening, closing)
@@ -1,29 +1,27 @@
+import hashlib
+import json
 import logging
+import os
+import secrets
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from armor_ring_parser import generate_armor_code, generate_ring_code
-from weapon_parser import (
-    generate_axe_code,
-    generate_dagger_code,
-    generate_hammer_code,
-    generate_spear_code,
-    generate_staff_code,
-    generate_sword_code,
-)
-from class_parser import ClassParser
-from enemy_parser import EnemyParser
-from formatter import OutputFormatter
+
+from models import WEAPON_TYPES
+from parser_utils import process_pool
+from profiler import NULL_PROFILER
+
+# Generator, formatter and class/enemy parser modules are imported where they
+# are used, so a single-type export only loads the code it needs.
 
 logger = logging.getLogger(__name__)
 
-WEAPON_GENERATORS = {
-    "sword": generate_sword_code,
-    "hammer": generate_hammer_code,
-    "spear": generate_spear_code,
-    "staff": generate_staff_code,
-    "dagger": generate_dagger_code,
-    "axe": generate_axe_code,
-}
+MANIFEST_NAME = ".export-manifest.json"
+# Starting a worker process (spawn, imports, pickling the items) costs far more
+# than formatting a section of a real dataset, so the pool is only used when
+# the item sections together hold at least this many items.
+POOL_MIN_ITEMS = 20_000
 
 
 @dataclass(frozen=True)
@@ -31,75 +29,246 @@ class ExportResult:
     label: str
     count: int
     path: Path | None  # None when content was printed to stdout instead of written
+    written: bool = True  # False when the file already had this content and was left untouched
 
 
 class ExportService:
-    def __init__(self, output_dir, to_stdout=False):
+    def __init__(self, output_dir, to_stdout=False, cache=None, scanner="stream", profiler=None, max_workers=None):
         self.output_dir = Path(output_dir)
         self.to_stdout = to_stdout
+        self.cache = cache
+        self.scanner = scanner
+        self.profiler = profiler or NULL_PROFILER
+        self.max_workers = max_workers
+        # Content hashes of the files written by earlier runs, so identical
+        # output is not rewritten (which would touch mtimes and trigger rebuilds).
+        self._manifest = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.unchanged = 0
 
     def _emit(self, filename, content):
-        if self.to_stdout:
-            print(f"# ==== {filename} ====")
-            print(content)
-            print()
-            return None
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        """Print or write ``content``; return ``(path, written)``."""
+        with self.profiler.stage(f"write {filename}"):
+            if self.to_stdout:
+                print(f"# ==== {filename} ====")
+                print(content)
+                print()
+                return None, True
+            with self._lock:
+                return self._write_if_changed(filename, content)
+
+    def _write_if_changed(self, filename, content):
         out = self.output_dir / filename
-        out.write_text(content, encoding="utf-8")
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        manifest = self._load_manifest()
+        if self._is_current(out, manifest.get(filename), digest, content):
+            self.unchanged += 1
+            logger.debug("Unchanged %s", out)
+            entry = _manifest_entry(out, digest)
+            if manifest.get(filename) != entry:
+                manifest[filename] = entry
+                self._save_manifest()
+            return out, False
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        _replace_file(out, content)
+        manifest[filename] = _manifest_entry(out, digest)
+        self._save_manifest()
+        self.written += 1
         logger.debug("Exported %s", out)
-        return out
+        return out, True
+
+    @staticmethod
+    def _is_current(out, entry, digest, content):
+        """Whether ``out`` already holds ``content``.
+
+        A manifest entry matching the file's size and mtime is trusted; any other
+        file (edited by hand, or written before the manifest) is compared with
+        ``content`` directly.
+        """
+        try:
+            stat = out.stat()
+        except OSError:
+            return False
+        if (entry is not None and entry.get("sha256") == digest and entry.get("size") == stat.st_size
+                and entry.get("mtime_ns") == stat.st_mtime_ns):
+            return True
+        try:
+            return out.read_text(encoding="utf-8") == content
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    def _load_manifest(self):
+        if self._manifest is None:
+            try:
+                with open(self.output_dir / MANIFEST_NAME, encoding="utf-8") as handle:
+                    manifest = json.load(handle)
+                self._manifest = manifest if isinstance(manifest, dict) else {}
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self):
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            _replace_file(self.output_dir / MANIFEST_NAME, json.dumps(self._manifest, indent=1, sort_keys=True))
+        except OSError as e:
+            logger.warning("Could not write export manifest in %s: %s", self.output_dir, e)
 
     def write_text(self, filename, content):
         """Write arbitrary text (e.g. a diff report), honoring --stdout."""
-        return self._emit(filename, content)
+        return self._emit(filename, content)[0]
 
     def export_items(self, items_by_type, item_type, output_type):
-        items = items_by_type.get(item_type, [])
-        if output_type == "developer":
-            content = self._format_developer_items(item_type, items)
-        else:
-            content = self._format_normal_items(item_type, items)
-        path = self._emit(f"{item_type}_code.txt", content)
-        return ExportResult(item_type, len(items), path)
+        return self._export([(item_type, items_by_type.get(item_type, []))], output_type)[0]
 
     def export_all_items(self, items_by_type, output_type):
-        results = []
-        for item_type, items in items_by_type.items():
-            if not items:
-                continue
-            results.append(self.export_items(items_by_type, item_type, output_type))
-        return results
+        sections = [(item_type, items) for item_type, items in items_by_type.items() if items]
+        return self._export(sections, output_type)
 
     def export_classes(self, items_folder, output_type):
-        class_file = Path(items_folder) / "class-heads.enml"
-        parser = ClassParser(str(class_file))
-        lines = parser.generate_class_code() if output_type == "developer" else parser.format_class_human()
-        path = self._emit("class_code.txt", "\n".join(lines))
-        return ExportResult("class", len(lines), path)
+        return self._export([("class", items_folder)], output_type)[0]
 
     def export_enemies(self, enemy_directories, output_type):
-        parser = EnemyParser([str(path) for path in enemy_directories])
-        lines = parser.parse_enemy_stats(mode=output_type)
-        path = self._emit("enemy_code.txt", "\n".join(lines))
-        return ExportResult("enemy", len(lines), path)
+        return self._export([("enemy", enemy_directories)], output_type)[0]
+
+    def export_all(self, items_by_type, output_type, items_folder, enemy_directories):
+        """Export every non-empty item section, then classes and enemies, in that order."""
+        sections = [(item_type, items) for item_type, items in items_by_type.items() if items]
+        sections += [("class", items_folder), ("enemy", enemy_directories)]
+        return self._export(sections, output_type)
+
+    def _export(self, sections, output_type):
+        """Format and emit ``(section, source)`` pairs; results and output keep the given order.
+
+        With max_workers > 1 and at least POOL_MIN_ITEMS items, sections are
+        formatted in worker processes while the finished ones are written here,
+        in order; otherwise they are formatted in-process.
+        """
+        if not self._use_pool(sections):
+            results = []
+            for section, source in sections:
+                with self.profiler.stage(f"format {section}"):
+                    count, content = format_section(section, source, output_type, self.cache, self.scanner)
+                results.append(self._result(section, count, content))
+            return results
+
+        results = []
+        with process_pool(min(self.max_workers, len(sections))) as pool:
+            futures = [
+                pool.submit(_format_section_timed, section, source, output_type, self.cache, self.scanner)
+                for section, source in sections
+            ]
+            for (section, _), future in zip(sections, futures):
+                count, content, (started, wall, cpu, pid, tid), (hits, misses) = future.result()
+                self.profiler.record(f"format {section}", started, wall, cpu, pid=pid, tid=tid,
+                                     thread=f"export worker {pid}")
+                if self.cache is not None:
+                    # Workers count lookups on their own copy of the cache.
+                    self.cache.hits += hits
+                    self.cache.misses += misses
+                results.append(self._result(section, count, content))
+        return results
+
+    def _use_pool(self, sections):
+        if not self.max_workers or self.max_workers <= 1 or len(sections) < 2:
+            return False
+        items = sum(len(source) for section, source in sections if section not in ("class", "enemy"))
+        return items >= POOL_MIN_ITEMS
+
+    def _result(self, section, count, content):
+        path, written = self._emit(f"{section}_code.txt", content)
+        return ExportResult(section, count, path, written)
 
     @staticmethod
     def _format_developer_items(item_type, items):
-        if item_type == "armor":
-            return "\n".join(generate_armor_code(items))
-        if item_type == "ring":
-            return "\n".join(generate_ring_code(items))
-        if item_type in WEAPON_GENERATORS:
-            return "\n".join(WEAPON_GENERATORS[item_type](items))
-        return ""
+        if item_type in ("armor", "ring"):
+            import armor_ring_parser
+            generate = getattr(armor_ring_parser, f"generate_{item_type}_code")
+        elif item_type in WEAPON_TYPES:
+            import weapon_parser
+            generate = getattr(weapon_parser, f"generate_{item_type}_code")
+        else:
+            return ""
+        return "\n".join(generate(items))
 
     @staticmethod
     def _format_normal_items(item_type, items):
+        from formatter import OutputFormatter
         if item_type == "armor":
             return OutputFormatter.format_human_armor(items)
         if item_type == "ring":
             return OutputFormatter.format_human_ring(items)
-        if item_type in WEAPON_GENERATORS:
+        if item_type in WEAPON_TYPES:
             return OutputFormatter.format_human_weapon(items, default_weapon_type=item_type)
         return ""
+
+
+def _manifest_entry(path, digest):
+    stat = path.stat()
+    return {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _replace_file(path, text):
+    """Atomically replace ``path`` with ``text``.
+
+    The temporary file is created like ``open()`` would (0o666 minus the umask)
+    rather than with mkstemp's 0600, and takes over the mode of the file it
+    replaces, so readers of the output keep access.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = None
+    tmp_path = path.with_name(f".{path.name}.{secrets.token_hex(6)}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def format_section(section, source, output_type, cache=None, scanner="stream"):
+    """Return ``(count, content)`` of one export section.
+
+    ``source`` is the item list for item sections, the items folder for
+    "class" and the enemy directories for "enemy". Module-level so worker
+    processes can run it.
+    """
+    if section == "class":
+        from class_parser import ClassParser
+        parser = ClassParser(str(Path(source) / "class-heads.enml"), cache=cache)
+        lines = parser.generate_class_code() if output_type == "developer" else parser.format_class_human()
+        return len(lines), "\n".join(lines)
+    if section == "enemy":
+        from enemy_parser import EnemyParser
+        parser = EnemyParser([str(path) for path in source], cache=cache, scanner=scanner)
+        lines = parser.parse_enemy_stats(mode=output_type)
+        return len(lines), "\n".join(lines)
+    if output_type == "developer":
+        return len(source), ExportService._format_developer_items(section, source)
+    return len(source), ExportService._format_normal_items(section, source)
+
+
+def _format_section_timed(section, source, output_type, cache=None, scanner="stream"):
+    """format_section plus (start, wall, cpu, pid, tid) and the (hits, misses) it added to ``cache``.
+
+    Runs in a worker process, whose cache is a copy the parent never sees.
+    """
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    cpu_started = time.thread_time()
+    started = time.perf_counter()
+    count, content = format_section(section, source, output_type, cache, scanner)
+    timing = (started, time.perf_counter() - started, time.thread_time() - cpu_started,
+              os.getpid(), threading.get_ident())
+    counts = (cache.hits - hits, cache.misses - misses) if cache is not None else (0, 0)
+    return count, content, timing, counts
@@ -1,78 +1,109 @@
 import os
 import logging
-from parser_utils import parse_scalar
+import threading
+import time
+from functools import partial
+from enml_tokenizer import iter_enml_blocks, read_enml_blocks
+from parser_utils import ValueDecoder, process_pool
+from profiler import NULL_PROFILER
 
 logger = logging.getLogger(__name__)
 
+
+def is_item_header(name):
+    return name.lower().startswith("item")
+
+
+def parse_enml_file(file_path, scanner="stream"):
+    """Return the non-empty item blocks of a single ENML file."""
+    blocks = read_enml_blocks(file_path, is_item_header, ValueDecoder().decode, scanner=scanner)
+    return [item for _, item, _ in blocks if item]
+
+
+def _parse_enml_file_timed(file_path, scanner="stream"):
+    """parse_enml_file plus (start, wall, cpu, pid, tid) of the parse, for profiling worker processes."""
+    cpu_started = time.thread_time()
+    started = time.perf_counter()
+    items = parse_enml_file(file_path, scanner)
+    timing = (started, time.perf_counter() - started, time.thread_time() - cpu_started,
+              os.getpid(), threading.get_ident())
+    return items, timing
+
+
 class FileParser:
-    def __init__(self, folder_path, file_to_type):
+    def __init__(self, folder_path, file_to_type, max_workers=None, cache=None, scanner="stream", profiler=None):
         self.folder_path = folder_path
         self.file_to_type = file_to_type
+        self.max_workers = max_workers
+        self.cache = cache
+        self.scanner = scanner
+        self.profiler = profiler or NULL_PROFILER
 
     def parse_enml_block(self, block_text):
         """Convert a single item block to a dictionary, ignoring inline comments."""
-        item = {}
-        for line in block_text.strip().splitlines():
-            # Remove inline comments (everything after '//')
-            if '//' in line:
-                line = line.split('//')[0]
-            line = line.strip()
-            if "=" in line:
-                try:
-                    key, value = line.split("=", 1)
-                except Exception as e:
-                    logger.warning("Malformed line: %s", e)
-                    continue
-                key = key.strip()
-                item[key] = parse_scalar(value)
-        return item
+        lines = ["item {", *block_text.splitlines(), "}"]
+        for _, item, _ in iter_enml_blocks(lines, is_item_header, ValueDecoder().decode):
+            return item
+        return {}
+
+    def parse_file(self, file_path):
+        return parse_enml_file(file_path, self.scanner)
+
+    def relevant_files(self):
+        """Return (file_name, item_type) pairs present in the folder, in file_to_type order."""
+        return [
+            (file_name, item_type)
+            for file_name, item_type in self.file_to_type.items()
+            if file_name.endswith(".enml") and os.path.isfile(os.path.join(self.folder_path, file_name))
+        ]
 
     def parse_files(self):
-        """Parse all ENML files in the folder using the file_to_type mapping."""
+        """Parse all ENML files in the folder using the file_to_type mapping.
+
+        Files are merged in file_to_type order, so the result does not depend on
+        directory listing order or, with max_workers > 1, on which worker finishes first.
+        """
         parsed_data = {v: [] for v in set(self.file_to_type.values())}
         if not os.path.exists(self.folder_path):
             logger.debug("Local directory not found: %s", self.folder_path)
             return parsed_data
 
-        for file_name in os.listdir(self.folder_path):
-            if file_name.endswith(".enml") and file_name in self.file_to_type:
-                logger.debug("Found relevant file: %s", file_name)
-                item_type = self.file_to_type[file_name]
-                file_path = os.path.join(self.folder_path, file_name)
-                with open(file_path, "r", encoding="utf-8") as file:
-                    lines = file.readlines()
-
-                block_lines = []
-                inside_block = False
-                pending_item = False
-                brace_depth = 0
-
-                for line in lines:
-                    line_stripped = line.strip()
-                    if line_stripped.lower().startswith("item"):
-                        pending_item = True
-                        continue
-
-                    if pending_item and "{" in line_stripped:
-                        inside_block = True
-                        pending_item = False
-                        brace_depth = 1
-                        block_lines = [line_stripped[line_stripped.index("{") + 1:]]
-                        continue
-
-                    if inside_block:
-                        if "{" in line_stripped:
-                            brace_depth += 1
-                        if "}" in line_stripped:
-                            brace_depth -= 1
-                            if brace_depth == 0:
-                                inside_block = False
-                                block_text = "\n".join(block_lines)
-                                item_data = self.parse_enml_block(block_text)
-                                if item_data:
-                                    parsed_data[item_type].append(item_data)
-                                block_lines = []
-                                continue
-                        block_lines.append(line_stripped)
-                logger.info("Parsed %s %s item(s) from %s", len(parsed_data[item_type]), item_type, file_name)
+        files = self.relevant_files()
+        paths = [os.path.join(self.folder_path, file_name) for file_name, _ in files]
+        results = [None] * len(paths)
+        fingerprints = {}
+        if self.cache is not None:
+            with self.profiler.stage("parse cache lookup", files=len(paths)):
+                for index, path in enumerate(paths):
+                    fingerprints[index] = self.cache.fingerprint(path)
+                    results[index] = self.cache.get("item", path, fingerprints[index])
+
+        misses = [index for index, items in enumerate(results) if items is None]
+        miss_paths = [paths[index] for index in misses]
+        if self.max_workers and self.max_workers > 1 and len(miss_paths) > 1:
+            with process_pool(min(self.max_workers, len(miss_paths))) as pool:
+                if self.profiler.enabled:
+                    parsed = []
+                    timed = pool.map(partial(_parse_enml_file_timed, scanner=self.scanner), miss_paths)
+                    for path, (items, (started, wall, cpu, pid, tid)) in zip(miss_paths, timed):
+                        self.profiler.record(f"parse {os.path.basename(path)}", started, wall, cpu, depth=1,
+                                             pid=pid, tid=tid, thread=f"parse worker {pid}", items=len(items))
+                        parsed.append(items)
+                else:
+                    parsed = list(pool.map(partial(parse_enml_file, scanner=self.scanner), miss_paths))
+        else:
+            parsed = []
+            for path in miss_paths:
+                with self.profiler.stage(f"parse {os.path.basename(path)}"):
+                    parsed.append(self.parse_file(path))
+
+        for index, items in zip(misses, parsed):
+            results[index] = items
+            if self.cache is not None:
+                self.cache.put("item", paths[index], fingerprints[index], items)
+
+        for (file_name, item_type), items in zip(files, results):
+            logger.debug("Found relevant file: %s", file_name)
+            parsed_data[item_type].extend(items)
+            logger.info("Parsed %s %s item(s) from %s", len(parsed_data[item_type]), item_type, file_name)
         return parsed_data
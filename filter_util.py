@@ -1,40 +1,200 @@
+import hashlib
+import json
 import logging
+from collections import Counter
+from functools import partial
 
 logger = logging.getLogger(__name__)
 
+WEAPON_FILTER_TYPES = ("sword", "hammer", "spear", "staff", "dagger", "axe")
+
+# Declarative exclusion rules. A rule drops an item when its ``field`` (stripped,
+# and lowercased with ``ignore_case``) equals one of ``equals`` or ends with one
+# of ``suffix``; ``types`` limits it to some item types. Fields are checked in
+# the order of their first rule, and the first matching rule is credited.
+DEFAULT_RULES = (
+    {"id": "b-variant", "field": "name", "suffix": [" B"]},
+    {"id": "non-equipment", "field": "secondaryType", "ignore_case": True,
+     "equals": ["essence", "rune", "key", "arcane-rune"]},
+    {"id": "armor-dummy-sprite", "types": ["armor"], "field": "sprite", "ignore_case": True,
+     "equals": ["armor_dummy.png"]},
+    {"id": "weapon-dummy-sprite", "types": list(WEAPON_FILTER_TYPES), "field": "sprite", "ignore_case": True,
+     "equals": ["sword_dummy.png", "question_mark_entity.png"]},
+    {"id": "ring-dummy-sprite", "types": ["ring"], "field": "sprite", "ignore_case": True,
+     "equals": ["question_mark_entity.png", "ring_dummy.png"]},
+)
+_RULE_KEYS = {"id", "field", "types", "ignore_case", "equals", "suffix"}
+
+
+def _validate_rule(rule):
+    if not isinstance(rule, dict):
+        raise ValueError(f"Filter rule must be an object: {rule!r}")
+    unknown = set(rule) - _RULE_KEYS
+    if unknown:
+        raise ValueError(f"Filter rule {rule.get('id')!r} has unknown keys: {', '.join(sorted(unknown))}")
+    for key in ("id", "field"):
+        if not isinstance(rule.get(key), str) or not rule[key]:
+            raise ValueError(f"Filter rule {rule!r} needs a non-empty {key!r}")
+    if not rule.get("equals") and not rule.get("suffix"):
+        raise ValueError(f"Filter rule {rule['id']!r} needs 'equals' or 'suffix'")
+    for key in ("types", "equals", "suffix"):
+        values = rule.get(key)
+        if values is not None and (not isinstance(values, list) or not all(isinstance(v, str) for v in values)):
+            raise ValueError(f"Filter rule {rule['id']!r}: {key!r} must be a list of strings")
+    return rule
+
+
+def load_rules(path):
+    """Read a rule file: a list of rules, or ``{"include_defaults": bool, "rules": [...]}``."""
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    if isinstance(data, list):
+        data = {"rules": data}
+    if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+        raise ValueError(f"{path}: expected a list of rules or an object with a 'rules' list")
+    rules = list(DEFAULT_RULES) if data.get("include_defaults") else []
+    return rules + data["rules"]
+
+
+# Normalized lookups of string values are memoized (sprites and secondary types
+# repeat a lot) up to this many distinct values per field.
+_MEMO_LIMIT = 4096
+_UNSEEN = object()
+
+
+def _field_matcher(field_rules, ignore_case):
+    """Return ``match(value) -> rule id or None`` for the rules on one field, in rule order."""
+    def normalize(value):
+        value = str(value).strip()
+        return value.lower() if ignore_case else value
+
+    rules = tuple(
+        (rule["id"],
+         frozenset(normalize(value) for value in rule.get("equals") or ()),
+         tuple(suffix.lower() if ignore_case else suffix for suffix in rule.get("suffix") or ()))
+        for rule in field_rules
+    )
+    # Union of all rules, so most values are rejected with one lookup and one endswith.
+    equals = frozenset().union(*(values for _, values, _ in rules))
+    suffixes = tuple(suffix for _, _, rule_suffixes in rules for suffix in rule_suffixes)
+
+    def match(value):
+        value = normalize(value)
+        if value not in equals and not value.endswith(suffixes):
+            return None
+        for rule_id, values, rule_suffixes in rules:
+            if value in values or value.endswith(rule_suffixes):
+                return rule_id
+    return match
+
+
+def _lookup_pass(items, field, memo, match, exclusions, keep):
+    """Match ``field`` of every item, memoizing the result per string value."""
+    for item in items:
+        value = item.get(field)
+        if value is None:
+            keep(item)
+            continue
+        if value.__class__ is str:
+            rule_id = memo.get(value, _UNSEEN)
+            if rule_id is _UNSEEN:
+                rule_id = match(value)
+                if len(memo) < _MEMO_LIMIT:
+                    memo[value] = rule_id
+        else:
+            rule_id = match(value)  # rare, and may be unhashable: never memoized
+        if rule_id is None:
+            keep(item)
+        else:
+            exclusions[rule_id] += 1
+
+
+def _suffix_pass(items, field, suffixes, ignore_case, match, exclusions, keep):
+    """Match ``field`` of every item against suffix-only rules; values (names) rarely repeat."""
+    for item in items:
+        value = item.get(field)
+        if value is None:
+            keep(item)
+            continue
+        text = (value if value.__class__ is str else str(value)).strip()
+        rule_id = match(value) if (text.lower() if ignore_case else text).endswith(suffixes) else None
+        if rule_id is None:
+            keep(item)
+        else:
+            exclusions[rule_id] += 1
+
+
+def _compile_type(rules):
+    """Compile the rules of one item type into ``filter_items(items, exclusions, append)``.
+
+    Rules are grouped by field, and each group becomes one matcher over
+    precomputed frozensets and ``str.endswith`` tuples. The items make one
+    pass per field, in order of the fields' first rule, so an item is credited
+    to the first field that excludes it; kept items of the last pass go to
+    ``append``.
+    """
+    by_field = {}
+    for rule in rules:
+        by_field.setdefault((rule["field"], bool(rule.get("ignore_case"))), []).append(rule)
+    passes = []
+    for (field, ignore_case), field_rules in by_field.items():
+        match = _field_matcher(field_rules, ignore_case)
+        if any(rule.get("equals") for rule in field_rules):
+            passes.append(partial(_lookup_pass, field=field, memo={}, match=match))
+        else:
+            suffixes = tuple(suffix.lower() if ignore_case else suffix
+                             for rule in field_rules for suffix in rule["suffix"])
+            passes.append(partial(_suffix_pass, field=field, suffixes=suffixes, ignore_case=ignore_case,
+                                  match=match))
+
+    def filter_items(items, exclusions, append):
+        for run_pass in passes[:-1]:
+            kept = []
+            run_pass(items, exclusions=exclusions, keep=kept.append)
+            items = kept
+        passes[-1](items, exclusions=exclusions, keep=append)
+    return filter_items
+
 
 class DataFilter:
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = tuple(_validate_rule(rule) for rule in rules)
+        self.digest = hashlib.sha256(json.dumps(self.rules, sort_keys=True).encode("utf-8")).hexdigest()
+        self._compiled = {}
+        self.exclusions = Counter()  # rule id -> items excluded by the last filter_parsed_data call
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(load_rules(path))
+
+    def compile(self, item_type):
+        """Return the compiled filter for ``item_type`` (None when no rule applies), built once."""
+        if item_type not in self._compiled:
+            rules = [rule for rule in self.rules if rule.get("types") is None or item_type in rule["types"]]
+            self._compiled[item_type] = _compile_type(rules) if rules else None
+        return self._compiled[item_type]
+
     def filter_parsed_data(self, local_data):
         """
         NOTE: This filter does NOT whitelist keys, so new price fields will not be dropped.
         """
-        for item_type in local_data:
-            filtered_items = []
-            for item in local_data[item_type]:
-                raw_name = item.get("name", "").strip()
-                # Exclude items whose name ends with " B"
-                if raw_name.endswith(" B"):
-                    logger.debug("Excluding item %s because its name ends with ' B'", raw_name)
-                    continue
-                # Exclude items with secondaryType equal to "essence", "rune", "key", or "arcane-rune"
-                secondary = item.get("secondaryType", "").strip().lower()
-                if secondary in {"essence", "rune", "key", "arcane-rune"}:
-                    logger.debug("Excluding item %s because its secondaryType is %s", raw_name, secondary)
-                    continue
-
-                sprite_val = item.get("sprite", "").strip().lower()
-                if item_type == "armor":
-                    if sprite_val == "armor_dummy.png":
-                        logger.debug("Excluding armor %s with sprite %s", raw_name, sprite_val)
-                        continue
-                elif item_type in ["sword", "hammer", "spear", "staff", "dagger", "axe"]:
-                    if sprite_val == "sword_dummy.png" or sprite_val == "question_mark_entity.png":
-                        logger.debug("Excluding weapon %s with sprite %s", raw_name, sprite_val)
-                        continue
-                elif item_type == "ring":
-                    if sprite_val in ["question_mark_entity.png", "ring_dummy.png"]:
-                        logger.debug("Excluding ring %s with sprite %s", raw_name, sprite_val)
-                        continue
-                filtered_items.append(item)
-            local_data[item_type] = filtered_items
+        kept = {item_type: [] for item_type in local_data}
+        self.filter_into(local_data, lambda item_type: kept[item_type].append)
+        local_data.update(kept)
+        return local_data
+
+    def filter_into(self, local_data, sink):
+        """Pass every kept item of ``local_data`` to ``sink(item_type)``, in order, without building lists."""
+        self.exclusions = Counter()
+        for item_type, items in local_data.items():
+            append = sink(item_type)
+            filter_items = self.compile(item_type)
+            if filter_items is not None:
+                filter_items(items, self.exclusions, append)
+            else:
+                for item in items:
+                    append(item)
+        if self.exclusions:
+            logger.debug("Filter exclusions: %s", ", ".join(f"{rule}={count}"
+                                                            for rule, count in self.exclusions.items()))
         return local_data
@@ -1,10 +1,9 @@
 from models import record_to_mapping
+from parser_utils import boost_columns, process_boost
 
 
 class OutputFormatter:
-    @staticmethod
-    def process_boost(value):
-        return 0 if value == 0 or value == 1 else round((value - 1) * 100)
+    process_boost = staticmethod(process_boost)
 
     @staticmethod
     def _price_suffix(item):
@@ -24,8 +23,9 @@ class OutputFormatter:
     @classmethod
     def format_human_armor(cls, items):
         lines = []
-        for item in items:
-            item = record_to_mapping(item)
+        items = [record_to_mapping(item) for item in items]
+        boosts = boost_columns(items, ("speedBoost", "jumpBoost", "magicBoost"))
+        for index, item in enumerate(items):
             name = item.get("name", "Unknown").replace("_", " ").title()
             element = item.get("element", "NEUTRAL").title()
             frost = item.get("frost", False)
@@ -33,9 +33,9 @@ class OutputFormatter:
             min_armor = item.get("armor", 0)
             max_armor = item.get("maxLevelArmor", min_armor)
             upgrades = item.get("maxLevelAllowed", 1)
-            speed = cls.process_boost(item.get("speedBoost", 1))
-            jump = cls.process_boost(item.get("jumpBoost", 1))
-            magic = cls.process_boost(item.get("magicBoost", 1))
+            speed = boosts["speedBoost"][index]
+            jump = boosts["jumpBoost"][index]
+            magic = boosts["magicBoost"][index]
             line = (f"Armor: {name}, Element: {element}, Immune to Frost: {frost_str}, "
                     f"Min Armor: {min_armor}, Max Armor: {max_armor}, Upgrades: {upgrades}, "
                     f"Speed: {speed}%, Jump: {jump}%, Magic: {magic}%")
@@ -46,8 +46,9 @@ class OutputFormatter:
     @classmethod
     def format_human_weapon(cls, items, default_weapon_type=None):
         lines = []
-        for item in items:
-            item = record_to_mapping(item)
+        items = [record_to_mapping(item) for item in items]
+        boosts = boost_columns(items, ("armorBoost", "speedBoost", "jumpBoost"))
+        for index, item in enumerate(items):
             name = item.get("name", "Unknown").replace("_", " ").title()
             weapon_type = (
                 item.get("weapon_type")
@@ -60,9 +61,9 @@ class OutputFormatter:
             min_damage = item.get("damage", 0)
             max_damage = item.get("maxLevelDamage", item.get("damage", 0))
             upgrades = item.get("maxLevelAllowed", 1)
-            armor_bonus = cls.process_boost(item.get("armorBoost", 1))
-            speed = cls.process_boost(item.get("speedBoost", 1))
-            jump = cls.process_boost(item.get("jumpBoost", 1))
+            armor_bonus = boosts["armorBoost"][index]
+            speed = boosts["speedBoost"][index]
+            jump = boosts["jumpBoost"][index]
             attack_cd = item.get("attackCooldown", 0)
             pierce_count = item.get("pierceCount", 0)
             enable_pierce_str = "Yes" if item.get("enablePierceAreaDamage", False) else "No"
@@ -80,15 +81,16 @@ class OutputFormatter:
     @classmethod
     def format_human_ring(cls, items):
         lines = []
-        for item in items:
-            item = record_to_mapping(item)
+        items = [record_to_mapping(item) for item in items]
+        boosts = boost_columns(items, ("armorBoost", "speedBoost", "jumpBoost", "magicBoost"))
+        for index, item in enumerate(items):
             name = item.get("name", "Unknown").replace("_", " ").title()
             element = item.get("element", "NEUTRAL").title()
             armor = item.get("armor", 0)
-            armor_bonus = cls.process_boost(item.get("armorBoost", 1))
-            speed = cls.process_boost(item.get("speedBoost", 1))
-            jump = cls.process_boost(item.get("jumpBoost", 1))
-            magic = cls.process_boost(item.get("magicBoost", 1))
+            armor_bonus = boosts["armorBoost"][index]
+            speed = boosts["speedBoost"][index]
+            jump = boosts["jumpBoost"][index]
+            magic = boosts["magicBoost"][index]
             line = (f"Ring: {name}, Element: {element}, Armor: {armor}, Armor Bonus: {armor_bonus}%, "
                     f"Speed: {speed}%, Jump: {jump}%, Magic: {magic}%")
             line += cls._price_suffix(item)
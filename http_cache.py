@@ -0,0 +1,153 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from json_stream import CHUNK_SIZE, iter_file_chunks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 300
+
+
+class HttpFetchError(Exception):
+    """Raised when a fetch fails and no cached body can stand in for it."""
+
+
+def requests_transport(url, headers, timeout):
+    """Fetch ``url`` with ``requests`` and return ``(status, headers, body)``."""
+    import requests
+    response = requests.get(url, headers=headers, timeout=timeout)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response.status_code, response.headers, response.content
+
+
+def urllib_transport(url, headers, timeout):
+    """Standard-library transport with the same contract as :func:`requests_transport`."""
+    import urllib.error
+    import urllib.request
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, e.headers, b""
+        raise
+
+
+class HttpCache:
+    """On-disk cache of HTTP response bodies and their validators.
+
+    A cached body younger than ``max_age`` seconds is returned without any
+    network access. Older entries are revalidated with ``If-None-Match`` /
+    ``If-Modified-Since``; a ``304 Not Modified`` answer reuses the stored
+    body and restarts its max-age window. When the fetch itself fails, a
+    stored body is served stale instead.
+    """
+
+    def __init__(self, cache_dir, max_age=DEFAULT_MAX_AGE, transport=None):
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+        self.transport = transport or requests_transport
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+        self.stale_hits = 0
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as handle:
+                meta = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not body_path.is_file():
+            return None
+        return meta
+
+    def _store(self, url, meta, body=None):
+        meta_path, body_path = self._paths(url)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if body is not None:
+                self._replace(body_path, body)
+            self._replace(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            logger.warning("Could not write HTTP cache entry for %s: %s", url, e)
+
+    def _replace(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+
+    def body_digest(self, url, fresh_only=False):
+        """SHA-256 of the cached body, or None; with ``fresh_only`` only within max_age."""
+        meta = self._load(url)
+        if meta is None or (fresh_only and time.time() - meta.get("fetched_at", 0) >= self.max_age):
+            return None
+        return meta.get("sha256")
+
+    def get(self, url, timeout=15):
+        """Return the response body for ``url``, from cache when allowed."""
+        return b"".join(self.iter_chunks(url, timeout))
+
+    def iter_chunks(self, url, timeout=15, chunk_size=CHUNK_SIZE):
+        """Like :meth:`get`, but yield the body in chunks; cached bodies are streamed from disk."""
+        meta = self._load(url)
+        body_path = self._paths(url)[1]
+        now = time.time()
+        if meta is not None and now - meta.get("fetched_at", 0) < self.max_age:
+            self.fresh_hits += 1
+            logger.info("Using cached response for %s (%.0fs old)", url, now - meta["fetched_at"])
+            yield from iter_file_chunks(body_path, chunk_size)
+            return
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            status, response_headers, content = self.transport(url, headers, timeout)
+        except Exception as e:
+            if meta is None:
+                raise HttpFetchError(f"Fetching {url} failed: {e}") from e
+            self.stale_hits += 1
+            logger.warning("Fetching %s failed (%s); using the cached response from %.0fs ago",
+                           url, e, now - meta.get("fetched_at", 0))
+            yield from iter_file_chunks(body_path, chunk_size)
+            return
+
+        if status == 304:
+            if meta is None:
+                raise HttpFetchError(f"{url} answered 304 but nothing is cached")
+            meta["fetched_at"] = now
+            self._store(url, meta)
+            self.revalidated += 1
+            logger.info("Cached response for %s is still current", url)
+            yield from iter_file_chunks(body_path, chunk_size)
+            return
+
+        meta = {
+            "url": url,
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "fetched_at": now,
+            "sha256": hashlib.sha256(content).hexdigest(),
+        }
+        self._store(url, meta, content)
+        self.downloads += 1
+        view = memoryview(content)
+        for start in range(0, len(content), chunk_size):
+            yield bytes(view[start:start + chunk_size])
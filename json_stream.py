@@ -0,0 +1,89 @@
+"""Incremental reader for large top-level JSON arrays."""
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_NON_SPACE = re.compile(r"\S")
+
+
+def iter_file_chunks(file_path, chunk_size=CHUNK_SIZE):
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            yield chunk
+
+
+def _iter_text(chunks):
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    for chunk in chunks:
+        yield chunk if isinstance(chunk, str) else decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+class _TextBuffer:
+    """Sliding text window over the decoded chunks; only unread text is kept."""
+
+    def __init__(self, chunks):
+        self._texts = _iter_text(chunks)
+        self.text = ""
+        self.pos = 0
+
+    def fill(self):
+        """Append the next non-empty chunk, returning False at end of input."""
+        for text in self._texts:
+            if text:
+                self.text = self.text[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        while True:
+            match = _NON_SPACE.search(self.text, self.pos)
+            if match:
+                self.pos = match.start()
+                return self.text[self.pos]
+            self.pos = len(self.text)
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def take(self, expected):
+        char = self.peek()
+        if char not in expected:
+            raise ValueError(f"Expected one of {expected!r} in JSON input, found {char!r}")
+        self.pos += 1
+        return char
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number at the very end of the window may continue in the next chunk.
+            if end == len(self.text) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks):
+    """Yield the elements of a top-level JSON array one at a time.
+
+    ``chunks`` is any iterable of ``bytes`` (UTF-8) or ``str`` pieces, such as
+    ``response.iter_content()`` or :func:`iter_file_chunks`. Only the element
+    being decoded is held in memory, never the whole array.
+    """
+    buffer = _TextBuffer(chunks)
+    buffer.take("[")
+    if buffer.peek() == "]":
+        return
+    while True:
+        yield buffer.decode()
+        if buffer.take(",]") == "]":
+            return
@@ -2,9 +2,12 @@ import sys
 import time
 
 from config import configure_logging, parse_args
-from diff_checker import DiffChecker
-from exporters import ExportService
-from pipeline import ItemPipeline
+
+# Everything else is imported on demand so that a single-type command only
+# loads what it needs; benchmarks/bench_startup.py guards the import budget.
+
+
+_STAGE_LABELS = {"snapshot": "snapshot load", "parse": "local parse", "online": "online data (overlapped)"}
 
 
 def _report(message=""):
@@ -26,19 +29,101 @@ def _print_header(config):
     _report()
 
 
-def _print_summary(results, config, elapsed):
+def _print_summary(results, config, elapsed, timings=None):
     for result in results:
         target = "stdout" if result.path is None else result.path
-        _report(f"  {result.label:<9}{result.count:>4}  -> {target}")
+        note = "" if result.written else "  (unchanged)"
+        _report(f"  {result.label:<9}{result.count:>4}  -> {target}{note}")
+    if timings:
+        stages = " | ".join(f"{label} {timings[stage]:.2f}s"
+                            for stage, label in _STAGE_LABELS.items() if stage in timings)
+        _report(f"\n  {stages}")
     total = sum(result.count for result in results)
     if config.to_stdout:
         _report(f"\nDone: {total} records across {len(results)} section(s)  ({elapsed:.1f}s)")
     else:
         files = sum(1 for result in results if result.path is not None)
-        _report(f"\nDone: {total} records -> {files} file(s) in {config.output_dir}/  ({elapsed:.1f}s)")
+        written = sum(1 for result in results if result.path is not None and result.written)
+        _report(f"\nDone: {total} records -> {files} file(s) in {config.output_dir}/  "
+                f"({written} written, {files - written} unchanged; {elapsed:.1f}s)")
         _report("Tip: re-run with --stdout to preview without writing.")
 
 
+def _print_profile(profiler, config):
+    if profiler is None:
+        return
+    _report("\nProfile (wall / CPU time per stage):")
+    _report(profiler.report())
+    if config.profile_trace is not None:
+        profiler.write_chrome_trace(config.profile_trace)
+        _report(f"Trace written to {config.profile_trace}")
+
+
+def _profiler(config):
+    if not config.profile:
+        return None
+    from profiler import Profiler
+    return Profiler()
+
+
+def _parse_cache(config):
+    if config.cache_dir is None:
+        return None
+    from parse_cache import ParseCache
+    return ParseCache(config.cache_dir / "parse", max_bytes=config.cache_size_mb * 1024 * 1024,
+                      verify_hash=config.cache_hash)
+
+
+def _snapshot(config):
+    if not config.snapshot:
+        return None
+    from snapshot import ItemSnapshot
+    return ItemSnapshot(config.cache_dir / "items.snapshot")
+
+
+def _data_filter(config):
+    from filter_util import DataFilter
+    if config.filter_rules is None:
+        return DataFilter()
+    return DataFilter.from_file(config.filter_rules)
+
+
+def _online_manager(config):
+    from online_data import BUNDLED_INDEX_NAME, OnlineDataManager
+    http_cache = index_path = None
+    if config.cache_dir is not None:
+        from http_cache import HttpCache
+        http_cache = HttpCache(config.cache_dir / "http", max_age=config.online_max_age)
+        index_path = config.cache_dir / BUNDLED_INDEX_NAME
+    return OnlineDataManager(index_path=index_path, http_cache=http_cache, stream=config.online_stream,
+                             keep_fields=config.online_fields)
+
+
+def _watch(config):
+    from watch_session import WatchSession
+    from watcher import create_watcher
+
+    started = time.perf_counter()
+    _print_header(config)
+    session = WatchSession(config, data_filter=_data_filter(config), online_manager=_online_manager(config))
+    _print_summary(session.start(), config, time.perf_counter() - started)
+    watcher = create_watcher(session.directories())
+    _report(f"\nWatching for changes ({type(watcher).__name__}); press Ctrl+C to stop.")
+    try:
+        while True:
+            changed = watcher.wait()
+            started = time.perf_counter()
+            results = session.apply(changed)
+            if results:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                sections = ", ".join(result.label for result in results)
+                _report(f"Regenerated {sections} in {elapsed_ms:.0f} ms")
+    except KeyboardInterrupt:
+        _report("Stopped watching.")
+    finally:
+        watcher.close()
+
+
 def main(argv=None):
     # Keep emoji/non-ASCII names from crashing on a redirected non-UTF-8 stream.
     for stream in (sys.stdout, sys.stderr):
@@ -49,35 +134,53 @@ def main(argv=None):
 
     config = parse_args(argv)
     configure_logging(config.log_level)
-    exporter = ExportService(config.output_dir, to_stdout=config.to_stdout)
+    if config.watch:
+        _watch(config)
+        return
+    from exporters import ExportService
+    cache = _parse_cache(config)
+    profiler = _profiler(config)
+    exporter = ExportService(config.output_dir, to_stdout=config.to_stdout, cache=cache,
+                             scanner=config.scanner, profiler=profiler, max_workers=config.export_jobs)
 
     if config.item_type == "diff":
-        checker = DiffChecker(config.items_folder, config.online_items_url)
+        from diff_checker import DiffChecker
+        checker = DiffChecker(config.items_folder, config.online_items_url, data_filter=_data_filter(config),
+                              online_manager=_online_manager(config),
+                              max_workers=config.jobs, cache=cache, scanner=config.scanner, profiler=profiler)
         new_items, removed_items, changes, fresh_enml = checker.run()
         report = DiffChecker.format_report(new_items, removed_items, changes, fresh_enml)
         path = exporter.write_text("diff_report.txt", report)
         if path is not None:
             _report(report)
+        _print_profile(profiler, config)
         return
 
     started = time.perf_counter()
     _print_header(config)
 
     results = []
+    timings = None
     if config.item_type == "class":
         results.append(exporter.export_classes(config.items_folder, config.output_type))
     elif config.item_type == "enemy":
         results.append(exporter.export_enemies(config.enemy_directories, config.output_type))
     else:
-        items_by_type = ItemPipeline(config.items_folder, config.online_items_url).load_items()
+        from pipeline import ItemPipeline
+        pipeline = ItemPipeline(config.items_folder, config.online_items_url, data_filter=_data_filter(config),
+                                online_manager=_online_manager(config),
+                                max_workers=config.jobs, cache=cache, scanner=config.scanner,
+                                snapshot=_snapshot(config), profiler=profiler)
+        items_by_type = pipeline.load_items()
+        timings = pipeline.timings
         if config.item_type == "all":
-            results.extend(exporter.export_all_items(items_by_type, config.output_type))
-            results.append(exporter.export_classes(config.items_folder, config.output_type))
-            results.append(exporter.export_enemies(config.enemy_directories, config.output_type))
+            results.extend(exporter.export_all(items_by_type, config.output_type, config.items_folder,
+                                               config.enemy_directories))
         else:
             results.append(exporter.export_items(items_by_type, config.item_type, config.output_type))
 
-    _print_summary(results, config, time.perf_counter() - started)
+    _print_summary(results, config, time.perf_counter() - started, timings)
+    _print_profile(profiler, config)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+import threading
+
+# Prometheus' default latency buckets, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "magic_rampage"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join('%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+                     for name, value in labels)
+    return "{" + pairs + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+
+class Metrics:
+    """In-process counters, gauges and histograms rendered in the Prometheus text format.
+
+    Request and stage observations are pushed in by the web app; cache and
+    online-fetch counters are read from the objects passed to ``render`` at
+    scrape time, so those keep counting without knowing about metrics.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}  # (name, labels) -> value
+        self._gauges = {}
+        self._histograms = {}
+        self._help = {}
+
+    def _key(self, name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, help_text, amount=1, **labels):
+        with self._lock:
+            self._help[name] = ("counter", help_text)
+            key = self._key(name, labels)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set(self, name, help_text, value, **labels):
+        with self._lock:
+            self._help[name] = ("gauge", help_text)
+            self._gauges[self._key(name, labels)] = value
+
+    def observe(self, name, help_text, value, **labels):
+        with self._lock:
+            self._help[name] = ("histogram", help_text)
+            key = self._key(name, labels)
+            if key not in self._histograms:
+                self._histograms[key] = _Histogram(self.buckets)
+            self._histograms[key].observe(value)
+
+    def observe_request(self, action, status, seconds):
+        self.inc(f"{PREFIX}_requests_total", "API requests by action and HTTP status.", action=action,
+                 status=status)
+        self.observe(f"{PREFIX}_request_duration_seconds", "API request latency by action.", seconds,
+                     action=action)
+
+    def observe_stages(self, timings):
+        """Record the stage durations of one ItemPipeline.load_items run."""
+        for stage, seconds in timings.items():
+            self.observe(f"{PREFIX}_pipeline_stage_duration_seconds", "Item pipeline stage durations.",
+                         seconds, stage=stage)
+
+    def observe_exclusions(self, exclusions):
+        """Add the per-rule exclusion counts of one DataFilter run."""
+        for rule, count in exclusions.items():
+            self.inc(f"{PREFIX}_filter_exclusions_total", "Items dropped by each filter rule.", count, rule=rule)
+
+    def set_dataset(self, items_by_type):
+        """Record the size of the most recently loaded item dataset."""
+        name = f"{PREFIX}_dataset_items"
+        with self._lock:
+            self._gauges = {key: value for key, value in self._gauges.items() if key[0] != name}
+        for item_type, items in items_by_type.items():
+            self.set(name, "Items per type in the last loaded dataset.", len(items), type=item_type)
+
+    def render(self, parse_cache=None, http_cache=None, online_manager=None, output_cache=None):
+        samples = []  # (name, type, help, [(suffix, labels, value)])
+        with self._lock:
+            by_name = {}
+            for (name, labels), value in self._counters.items():
+                by_name.setdefault(name, []).append(("", labels, value))
+            for (name, labels), value in self._gauges.items():
+                by_name.setdefault(name, []).append(("", labels, value))
+            for (name, labels), histogram in self._histograms.items():
+                rows = by_name.setdefault(name, [])
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    rows.append(("_bucket", labels + (("le", _number(float(bound))),), count))
+                rows.append(("_bucket", labels + (("le", "+Inf"),), histogram.total))
+                rows.append(("_sum", labels, histogram.sum))
+                rows.append(("_count", labels, histogram.total))
+            for name in sorted(by_name):
+                kind, help_text = self._help[name]
+                samples.append((name, kind, help_text, by_name[name]))
+
+        samples.extend(self._collect(parse_cache, http_cache, online_manager, output_cache))
+        lines = []
+        for name, kind, help_text, rows in samples:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in rows:
+                lines.append(f"{name}{suffix}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _collect(parse_cache, http_cache, online_manager, output_cache):
+        cache_rows = []
+        if parse_cache is not None:
+            cache_rows += [(("cache", "parse"), ("result", "hit"), parse_cache.hits),
+                           (("cache", "parse"), ("result", "miss"), parse_cache.misses)]
+        if http_cache is not None:
+            cache_rows += [(("cache", "online"), ("result", "fresh"), http_cache.fresh_hits),
+                           (("cache", "online"), ("result", "revalidated"), http_cache.revalidated),
+                           (("cache", "online"), ("result", "miss"), http_cache.downloads),
+                           (("cache", "online"), ("result", "stale"), http_cache.stale_hits)]
+        if output_cache is not None:
+            cache_rows += [(("cache", "output"), ("result", "hit"), output_cache.unchanged),
+                           (("cache", "output"), ("result", "miss"), output_cache.written)]
+        if cache_rows:
+            yield (f"{PREFIX}_cache_requests_total", "counter", "Cache lookups by cache and result.",
+                   [("", tuple(labels), value) for *labels, value in cache_rows])
+        if online_manager is not None:
+            yield (f"{PREFIX}_online_fetch_failures_total", "counter",
+                   "Online item fetches that failed.", [("", (), online_manager.fetch_failures)])
+            yield (f"{PREFIX}_online_bundled_fallbacks_total", "counter",
+                   "Failed online fetches served from the bundled items.json.",
+                   [("", (), online_manager.bundled_fallbacks)])
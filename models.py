@@ -1,4 +1,5 @@
-from dataclasses import dataclass, field
+import threading
+from collections.abc import Mapping
 
 PRICE_FIELD_NAMES = (
     "freemiumGoldPrice",
@@ -12,54 +13,187 @@ PRICE_FIELD_NAMES = (
 WEAPON_TYPES = {"sword", "hammer", "spear", "staff", "dagger", "axe"}
 OUTPUT_ORDER = ("armor", "ring", "sword", "hammer", "spear", "staff", "dagger", "axe")
 
+_MISSING = object()
+_LAYOUT_LOCK = threading.Lock()
 
-@dataclass(frozen=True)
-class ItemRecord:
-    item_type: str
-    data: dict = field(default_factory=dict)
+
+class FieldLayout:
+    """Append-only field order shared by every record of one kind.
+
+    Records store their values in a tuple ordered by this layout, so field
+    names are kept once per kind instead of once per record. Fields first seen
+    after a record was packed are simply missing from its (shorter) tuple.
+    """
+
+    __slots__ = ("names", "index")
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+
+    def position(self, name):
+        position = self.index.get(name)
+        if position is None:
+            with _LAYOUT_LOCK:
+                position = self.index.get(name)
+                if position is None:
+                    position = len(self.names)
+                    self.names.append(name)
+                    self.index[name] = position
+        return position
+
+    def pack(self, mapping):
+        positions = [self.position(key) for key in mapping]
+        values = [_MISSING] * (max(positions) + 1 if positions else 0)
+        for position, value in zip(positions, mapping.values()):
+            values[position] = value
+        return tuple(values)
+
+
+_LAYOUTS = {}
+
+
+def layout_for(kind):
+    layout = _LAYOUTS.get(kind)
+    if layout is None:
+        with _LAYOUT_LOCK:
+            layout = _LAYOUTS.setdefault(kind, FieldLayout())
+    return layout
+
+
+class RecordView(Mapping):
+    """Read-only mapping over a record's packed values; nothing is copied."""
+
+    __slots__ = ("_layout", "_values")
+
+    def __init__(self, layout, values):
+        self._layout = layout
+        self._values = values
+
+    def get(self, key, default=None):
+        position = self._layout.index.get(key)
+        if position is None or position >= len(self._values):
+            return default
+        value = self._values[position]
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        for name, value in zip(self._layout.names, self._values):
+            if value is not _MISSING:
+                yield name
+
+    def __len__(self):
+        return sum(1 for value in self._values if value is not _MISSING)
+
+    def __repr__(self):
+        return f"RecordView({dict(self)!r})"
+
+
+class _CompactRecord:
+    __slots__ = ("_layout", "_values")
+    __hash__ = None
+
+    def __init__(self, kind, data=None):
+        self._layout = layout_for(kind)
+        self._values = self._layout.pack(data if data is not None else {})
+
+    @property
+    def data(self):
+        return RecordView(self._layout, self._values)
+
+    def as_mapping(self):
+        """Return a read-only view of the record's fields without copying them."""
+        return RecordView(self._layout, self._values)
+
+    def as_dict(self):
+        """Return a mutable copy of the record's fields."""
+        return dict(self.as_mapping())
+
+    def get(self, key, default=None):
+        return self.as_mapping().get(key, default)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._identity() == other._identity()
+
+    def _identity(self):
+        return self.as_dict()
+
+    def __reduce__(self):
+        # Rebuild against the receiving process's shared layout.
+        return type(self), (self.as_dict(),)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+
+class ItemRecord(_CompactRecord):
+    __slots__ = ("item_type",)
+
+    def __init__(self, item_type, data=None):
+        super().__init__(item_type, data)
+        self.item_type = item_type
 
     @classmethod
     def from_mapping(cls, item_type, mapping):
-        return cls(item_type=item_type, data=dict(mapping))
+        return cls(item_type, mapping)
 
-    def as_dict(self):
-        return dict(self.data)
+    def _identity(self):
+        return (self.item_type, self.as_dict())
+
+    def __reduce__(self):
+        return ItemRecord, (self.item_type, self.as_dict())
 
     def sort_key(self):
+        data = self.as_mapping()
         if self.item_type == "armor":
-            return (self.data.get("maxLevelArmor", self.data.get("armor", 0)), self.data.get("name", ""))
+            return (data.get("maxLevelArmor", data.get("armor", 0)), data.get("name", ""))
         if self.item_type == "ring":
-            return (self.data.get("armor", 0), self.data.get("name", ""))
+            return (data.get("armor", 0), data.get("name", ""))
         if self.item_type in WEAPON_TYPES:
-            return (self.data.get("maxLevelDamage", self.data.get("damage", 0)), self.data.get("name", ""))
-        return (self.data.get("name", ""),)
+            return (data.get("maxLevelDamage", data.get("damage", 0)), data.get("name", ""))
+        return (data.get("name", ""),)
 
+    def __repr__(self):
+        return f"ItemRecord({self.item_type!r}, {self.as_dict()!r})"
 
-@dataclass(frozen=True)
-class ClassRecord:
-    data: dict = field(default_factory=dict)
+
+class ClassRecord(_CompactRecord):
+    __slots__ = ()
+
+    def __init__(self, data=None):
+        super().__init__("class", data)
 
     @classmethod
     def from_mapping(cls, mapping):
-        return cls(data=dict(mapping))
+        return cls(mapping)
 
-    def as_dict(self):
-        return dict(self.data)
 
+class EnemyRecord(_CompactRecord):
+    __slots__ = ()
 
-@dataclass(frozen=True)
-class EnemyRecord:
-    data: dict = field(default_factory=dict)
+    def __init__(self, data=None):
+        super().__init__("enemy", data)
 
     @classmethod
     def from_mapping(cls, mapping):
-        return cls(data=dict(mapping))
-
-    def as_dict(self):
-        return dict(self.data)
+        return cls(mapping)
 
 
 def record_to_mapping(value):
-    if hasattr(value, "as_dict"):
-        return value.as_dict()
+    """Return a read-only mapping for a record or mapping, without copying it."""
+    if hasattr(value, "as_mapping"):
+        return value.as_mapping()
+    if isinstance(value, Mapping):
+        return value
     return dict(value)
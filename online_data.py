@@ -1,9 +1,14 @@
+import os
 import re
 import json
 import logging
+import tempfile
 import unicodedata
+from fnmatch import fnmatchcase
 from pathlib import Path
+from json_stream import CHUNK_SIZE, iter_file_chunks, iter_json_array
 from models import PRICE_FIELD_NAMES
+from parse_cache import file_sha256
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +20,10 @@ ONLINE_REQUIRED_FIELDS = {"name", "type", "secondaryType"}
 # Bundled snapshot of the online data, used as an offline fallback when the
 # network fetch fails or `requests` is unavailable.
 BUNDLED_ITEMS_PATH = Path(__file__).resolve().parent / "items.json"
+# Bump whenever the sidecar layout, _norm_key or _get_local_item_type change.
+BUNDLED_INDEX_VERSION = 1
+# File name of the sidecar index inside a cache directory.
+BUNDLED_INDEX_NAME = "items.index.json"
 
 
 def _norm_key(s):
@@ -35,8 +44,8 @@ def _strip_type_suffix(name, item_type):
     return name
 
 
-def _matches(local_key, online_item, item_type):
-    """Check if a local item name matches an online entry by any reasonable means."""
+def _candidates(online_item):
+    """Raw identifiers an online entry can be matched by, in the order _matches tries them."""
     candidates = [
         online_item.get("name_en"),
         online_item.get("name"),
@@ -51,64 +60,252 @@ def _matches(local_key, online_item, item_type):
     sprite = (online_item.get("sprite") or "").strip().lower()
     if sprite:
         candidates.append(sprite)
+    return candidates
+
 
+def _matches(local_key, online_item, item_type):
+    """Check if a local item name matches an online entry by any reasonable means."""
     # include stripped local name variant
     stripped = _strip_type_suffix(local_key, item_type)
 
-    for c in candidates:
+    for c in _candidates(online_item):
         norm_c = _norm_key(c)
         if norm_c in (local_key, stripped):
             return True
     return False
 
 
+class OnlineIndex:
+    """Normalized candidate key -> earliest online entry carrying it.
+
+    ``find`` returns the same entry as scanning ``online_data`` in order with
+    ``_matches`` and taking the first hit, but with two dict lookups instead
+    of re-normalizing every candidate of every entry.
+    """
+
+    def __init__(self, online_data, keys=None):
+        self.items = list(online_data or [])
+        if keys is None:
+            keys = [[_norm_key(c) for c in _candidates(o)] for o in self.items]
+        self.positions = {}
+        for position, item_keys in enumerate(keys):
+            for key in item_keys:
+                self.positions.setdefault(key, position)
+
+    def find(self, local_key, item_type):
+        positions = [
+            self.positions.get(key)
+            for key in (local_key, _strip_type_suffix(local_key, item_type))
+        ]
+        positions = [position for position in positions if position is not None]
+        return self.items[min(positions)] if positions else None
+
+
 class OnlineDataManager:
-    def __init__(self, bundled_items_path=BUNDLED_ITEMS_PATH):
+    def __init__(self, bundled_items_path=BUNDLED_ITEMS_PATH, index_path=None, http_cache=None,
+                 stream=False, keep_fields=None):
         self.bundled_items_path = Path(bundled_items_path)
+        self.http_cache = http_cache
+        # Streaming ingestion decodes the JSON array one item at a time and,
+        # with keep_fields (fnmatch patterns), drops every other field.
+        self.stream = stream
+        self.keep_fields = tuple(keep_fields) if keep_fields else None
+        self._kept = {}
+        # Sidecar with the validated bundled items and their lookup keys; without
+        # one (no cache directory) the index is rebuilt on every bundled load.
+        self.index_path = Path(index_path) if index_path else None
+        self._prebuilt = None  # sidecar index of the last bundled load
+        self._index = None  # (online list, OnlineIndex) of the last merge
+        self.fetch_failures = 0
+        self.bundled_fallbacks = 0
 
     def get_online_item_data(self, url):
+        return self.load_online_data(url)[0]
+
+    def load_online_data(self, url):
+        """Return ``(valid_items, source)``.
+
+        ``source`` identifies the payload the items came from (cached HTTP body
+        digest, or path, size and mtime of the bundled file) and is None when it
+        cannot be known.
+        """
         try:
-            import requests
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            valid_data = self.validate_online_item_data(data)
+            if not url:
+                # Offline run: no need to import requests just to fail.
+                raise ValueError("no online items URL configured")
+            if self.stream:
+                valid_data = self.ingest_items(self._online_chunks(url))
+            elif self.http_cache is not None:
+                valid_data = self.validate_online_item_data(json.loads(self.http_cache.get(url, timeout=15)))
+            else:
+                import requests
+                response = requests.get(url, timeout=15)
+                response.raise_for_status()
+                valid_data = self.validate_online_item_data(response.json())
             logger.info("Retrieved %s valid item(s) from online JSON", len(valid_data))
-            return valid_data
+            return valid_data, self._source("http", self.http_cache and self.http_cache.body_digest(url))
         except Exception as e:
             logger.warning("Error fetching online data: %s", e)
-            return self._load_bundled_item_data()
+            self.fetch_failures += 1
+            valid_data, source = self._load_bundled_item_data()
+            if valid_data is not None:
+                self.bundled_fallbacks += 1
+            return valid_data, source
+
+    def peek_online_source(self, url):
+        """Source the next load of ``url`` would report, if known without fetching or decoding."""
+        if not url:
+            return self._bundled_source()
+        return self._source("http", self.http_cache and self.http_cache.body_digest(url, fresh_only=True))
+
+    def _bundled_source(self):
+        """Source of the bundled items.json, identified by its path, size and mtime."""
+        try:
+            stat = self.bundled_items_path.stat()
+        except OSError:
+            return None
+        return self._source("bundled", f"{self.bundled_items_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}")
+
+    def _source(self, kind, digest):
+        if not digest:
+            return None
+        fields = ",".join(self.keep_fields) if self.keep_fields else "*"
+        return f"{kind}:{digest}:{fields}"
+
+    def _online_chunks(self, url):
+        if self.http_cache is not None:
+            yield from self.http_cache.iter_chunks(url, timeout=15)
+            return
+        import requests
+        with requests.get(url, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size=CHUNK_SIZE)
+
+    def ingest_items(self, chunks):
+        """Validate and trim online items one at a time from a chunked JSON array.
+
+        Match keys and local types are computed before fields are dropped, so
+        matching still sees every localized name of the trimmed items.
+        """
+        items, keys, types = [], [], []
+        for index, item in enumerate(iter_json_array(chunks)):
+            if not self._is_valid_item(index, item):
+                continue
+            keys.append([_norm_key(c) for c in _candidates(item)])
+            types.append(self._get_local_item_type(item))
+            items.append(self._trim(item))
+        self._prebuilt = {"items": items, "keys": keys, "types": types}
+        return items
+
+    def _trim(self, item):
+        if self.keep_fields is None:
+            return item
+        return {key: value for key, value in item.items() if self._keeps(key)}
+
+    def _keeps(self, key):
+        kept = self._kept.get(key)
+        if kept is None:
+            kept = self._kept[key] = key in ONLINE_REQUIRED_FIELDS or any(
+                fnmatchcase(key, pattern) for pattern in self.keep_fields)
+        return kept
 
     def _load_bundled_item_data(self):
         if not self.bundled_items_path.exists():
             logger.warning("Bundled item data not found at %s", self.bundled_items_path)
-            return None
+            return None, None
         try:
-            with open(self.bundled_items_path, encoding="utf-8") as handle:
-                data = json.load(handle)
-            valid_data = self.validate_online_item_data(data)
+            source = self._bundled_source()
+            digest = file_sha256(self.bundled_items_path)
+            if self.stream:
+                valid_data = self.ingest_items(iter_file_chunks(self.bundled_items_path))
+                logger.info("Using bundled offline item data: %s valid item(s)", len(valid_data))
+                return valid_data, source
+            index = self._read_bundled_index(digest)
+            if index is None:
+                with open(self.bundled_items_path, encoding="utf-8") as handle:
+                    data = json.load(handle)
+                index = self._build_bundled_index(self.validate_online_item_data(data), digest)
+                self._write_bundled_index(index)
+            self._prebuilt = index
+            valid_data = index["items"]
             logger.info("Using bundled offline item data: %s valid item(s)", len(valid_data))
-            return valid_data
+            return valid_data, source
         except Exception as e:
             logger.warning("Error reading bundled item data: %s", e)
+            return None, None
+
+    def _build_bundled_index(self, valid_data, digest):
+        return {
+            "version": BUNDLED_INDEX_VERSION,
+            "source_sha256": digest,
+            "items": valid_data,
+            "keys": [[_norm_key(c) for c in _candidates(item)] for item in valid_data],
+            "types": [self._get_local_item_type(item) for item in valid_data],
+        }
+
+    def _read_bundled_index(self, digest):
+        if self.index_path is None:
             return None
+        try:
+            with open(self.index_path, encoding="utf-8") as handle:
+                index = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if (not isinstance(index, dict)
+                or index.get("version") != BUNDLED_INDEX_VERSION
+                or index.get("source_sha256") != digest):
+            logger.info("Bundled item index %s is stale, rebuilding", self.index_path)
+            return None
+        count = len(index.get("items") or [])
+        if len(index.get("keys") or []) != count or len(index.get("types") or []) != count:
+            return None
+        return index
+
+    def _write_bundled_index(self, index):
+        if self.index_path is None:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.index_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(index, handle, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning("Could not write bundled item index %s: %s", self.index_path, e)
+
+    def _online_index(self, online_data):
+        """Return the OnlineIndex of ``online_data``, reused while the same list is merged again."""
+        if self._index is None or self._index[0] is not online_data:
+            prebuilt = self._prebuilt_for(online_data)
+            self._index = (online_data, OnlineIndex(online_data, prebuilt["keys"] if prebuilt else None))
+        return self._index[1]
+
+    def _prebuilt_for(self, online_data):
+        """Return the sidecar index when ``online_data`` is the bundled list it describes."""
+        if self._prebuilt is not None and self._prebuilt["items"] is online_data:
+            return self._prebuilt
+        return None
 
     def validate_online_item_data(self, data):
-        valid_items = []
-        for index, item in enumerate(data or []):
-            missing = sorted(field for field in ONLINE_REQUIRED_FIELDS if field not in item)
-            if missing:
-                logger.warning("Skipping online item at index %s due to missing fields: %s", index, ", ".join(missing))
-                continue
-            valid_items.append(item)
-        return valid_items
+        return [item for index, item in enumerate(data or []) if self._is_valid_item(index, item)]
+
+    def _is_valid_item(self, index, item):
+        missing = sorted(field for field in ONLINE_REQUIRED_FIELDS if field not in item)
+        if missing:
+            logger.warning("Skipping online item at index %s due to missing fields: %s", index, ", ".join(missing))
+            return False
+        return True
 
     def convert_online_to_local(self, online_data):
         """Convert online JSON items into the local grouped structure."""
         converted = {item_type: [] for item_type in LOCAL_ITEM_TYPES}
+        prebuilt = self._prebuilt_for(online_data)
+        if prebuilt is not None:
+            item_types = prebuilt["types"]
+        else:
+            item_types = [self._get_local_item_type(item) for item in online_data]
 
-        for item in online_data:
-            item_type = self._get_local_item_type(item)
+        for item, item_type in zip(online_data, item_types):
             if item_type is None:
                 continue
             converted[item_type].append(dict(item))
@@ -134,25 +331,20 @@ class OnlineDataManager:
         - Try exact match (name_en / name)
         - Try stripped variant (without type suffix)
         - If still no match, retry with last word removed
+        The earliest matching online entry wins.
         """
+        index = self._online_index(online_data)
         for item_type in local_data:
             for item in local_data[item_type]:
                 local_name_key = _norm_key(item.get("name", ""))
-                match = None
 
                 # Try normal matching
-                for o in online_data:
-                    if _matches(local_name_key, o, item_type):
-                        match = o
-                        break
+                match = index.find(local_name_key, item_type)
 
                 # Fallback: remove last word if not found
                 if not match and " " in local_name_key:
                     reduced_key = " ".join(local_name_key.split(" ")[:-1])
-                    for o in online_data:
-                        if _matches(reduced_key, o, item_type):
-                            match = o
-                            break
+                    match = index.find(reduced_key, item_type)
 
                 # Print only when no match found
                 if not match:
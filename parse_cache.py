@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import marshal
+import os
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the tokenizer or value parsing changes so that entries written
+# by an older parser are treated as misses instead of being reused.
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Once the cache outgrows max_bytes, put() evicts down to this fraction of it,
+# so a full cache is not rescanned on every following write.
+EVICT_TO = 0.75
+
+
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """On-disk cache of parsed ENML blocks, keyed by file path, size and mtime.
+
+    Each source file gets one JSON entry per parser kind ("item", "class",
+    "enemy"). With ``verify_hash`` the file's SHA-256 is part of the
+    fingerprint too, which catches edits that keep size and mtime. Entries are
+    touched on every hit and the least recently used ones are evicted once the
+    directory grows beyond ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, verify_hash=False):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.verify_hash = verify_hash
+        self.hits = 0
+        self.misses = 0
+        self._size = None  # running total of the entry files, measured on the first put
+
+    def fingerprint(self, file_path):
+        stat = os.stat(file_path)
+        fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if self.verify_hash:
+            fingerprint["sha256"] = file_sha256(file_path)
+        return fingerprint
+
+    def _entry_path(self, kind, file_path):
+        key = f"{CACHE_VERSION}:{kind}:{os.path.abspath(file_path)}"
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, kind, file_path, fingerprint):
+        """Return the cached blocks for ``file_path`` or None on a miss."""
+        entry_path = self._entry_path(kind, file_path)
+        try:
+            with open(entry_path, encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if (entry.get("version") != CACHE_VERSION
+                or entry.get("path") != os.path.abspath(file_path)
+                or entry.get("fingerprint") != fingerprint):
+            self.misses += 1
+            return None
+        try:
+            os.utime(entry_path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["blocks"]
+
+    def put(self, kind, file_path, fingerprint, blocks):
+        entry = {
+            "version": CACHE_VERSION,
+            "path": os.path.abspath(file_path),
+            "fingerprint": fingerprint,
+            "blocks": blocks,
+        }
+        entry_path = self._entry_path(kind, file_path)
+        try:
+            old_size = entry_path.stat().st_size
+        except OSError:
+            old_size = 0
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(entry, handle, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+            new_size = entry_path.stat().st_size
+        except OSError as e:
+            logger.warning("Could not write parse cache entry for %s: %s", file_path, e)
+            return
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entry_stats())
+        else:
+            self._size += new_size - old_size
+        if self._size > self.max_bytes:
+            self.evict(int(self.max_bytes * EVICT_TO))
+
+    def load(self, kind, file_path, parse):
+        """Return cached blocks for ``file_path``, calling ``parse(file_path)`` on a miss."""
+        fingerprint = self.fingerprint(file_path)
+        blocks = self.get(kind, file_path, fingerprint)
+        if blocks is None:
+            blocks = parse(file_path)
+            self.put(kind, file_path, fingerprint, blocks)
+        return blocks
+
+    def evict(self, max_bytes=None):
+        """Delete least recently used entries until the cache fits in ``max_bytes`` (default: self.max_bytes)."""
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        stats = self._entry_stats()
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in sorted(stats):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            logger.debug("Evicted parse cache entry %s", path)
+        self._size = total
+
+    def _entry_stats(self):
+        """``(mtime_ns, size, path)`` of every entry file; other processes may have added some."""
+        stats = []
+        try:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    stats.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return stats
+
+
+class MemoryParseCache:
+    """In-process counterpart of ParseCache for long-running sessions such as --watch.
+
+    Entries are kept marshal-encoded, so every hit hands out fresh objects that
+    callers may mutate (the online merge does) without corrupting the cache.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, file_path):
+        stat = os.stat(file_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, kind, file_path, fingerprint):
+        entry = self._entries.get((kind, os.path.abspath(file_path)))
+        if entry is None or entry[0] != fingerprint:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return marshal.loads(entry[1])
+
+    def put(self, kind, file_path, fingerprint, blocks):
+        self._entries[(kind, os.path.abspath(file_path))] = (fingerprint, marshal.dumps(blocks))
+
+    def load(self, kind, file_path, parse):
+        fingerprint = self.fingerprint(file_path)
+        blocks = self.get(kind, file_path, fingerprint)
+        if blocks is None:
+            blocks = parse(file_path)
+            self.put(kind, file_path, fingerprint, blocks)
+        return blocks
@@ -1,24 +1,167 @@
 import re
+from functools import lru_cache
+
+_INT_PATTERN = re.compile(r"[+-]?\d+")
+_FLOAT_PATTERN = re.compile(r"[+-]?(?:\d+\.\d*|\.\d+)")
+_BOOL_WORDS = ("true", "false")
+_NO_MATCH = object()
+
+# Value types of well-known ENML/online fields. Keys not listed here are
+# classified by parse_scalar the first time a ValueDecoder sees them.
+FIELD_SCHEMA = {
+    "name": str,
+    "type": str,
+    "secondaryType": str,
+    "sprite": str,
+    "element": str,
+    "class": str,
+    "damage": int,
+    "maxLevelDamage": int,
+    "armor": int,
+    "maxLevelArmor": int,
+    "maxLevelAllowed": int,
+    "attackCooldown": int,
+    "pierceCount": int,
+    "resistance": int,
+    "passiveDamage": int,
+    "freemiumGoldPrice": int,
+    "premiumGoldPrice": int,
+    "freemiumCoinPrice": int,
+    "premiumCoinPrice": int,
+    "baseFreemiumSellPrice": int,
+    "basePremiumSellPrice": int,
+    "speed": float,
+    "jumpImpulse": float,
+    "armorBoost": float,
+    "magicBoost": float,
+    "swordBoost": float,
+    "daggerBoost": float,
+    "hammerBoost": float,
+    "axeBoost": float,
+    "spearBoost": float,
+    "staffBoost": float,
+    "speedBoost": float,
+    "jumpBoost": float,
+    "frost": bool,
+    "poisonous": bool,
+    "enablePierceAreaDamage": bool,
+    "persistAgainstProjectile": bool,
+}
+
+
+def _parse_text(text):
+    lowered = text.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+
+    if _INT_PATTERN.fullmatch(text):
+        return int(text)
+    if _FLOAT_PATTERN.fullmatch(text):
+        return float(text)
+
+    return text
 
 
 def parse_scalar(value):
     """Parse booleans and simple numeric literals from ENML-like assignments."""
     if not isinstance(value, str):
         return value
+    return _parse_text(value.strip().rstrip(";"))
+
+
+def _decode_int(text):
+    if text.isdecimal() or (text[:1] in "+-" and text[1:].isdecimal()):
+        return int(text)
+    return _NO_MATCH
+
+
+def _decode_float(text):
+    body = text[1:] if text[:1] in "+-" else text
+    whole, dot, fraction = body.partition(".")
+    if (dot and (whole or fraction)
+            and (not whole or whole.isdecimal())
+            and (not fraction or fraction.isdecimal())):
+        return float(text)
+    return _NO_MATCH
+
 
-    text = value.strip().rstrip(";")
+def _decode_bool(text):
     lowered = text.lower()
     if lowered == "true":
         return True
     if lowered == "false":
         return False
+    return _NO_MATCH
 
-    if re.fullmatch(r"[+-]?\d+", text):
-        return int(text)
-    if re.fullmatch(r"[+-]?(?:\d+\.\d*|\.\d+)", text):
-        return float(text)
 
-    return text
+def _decode_str(text):
+    # Text starting with a letter can never be numeric; only booleans remain,
+    # and those are exactly four or five characters long.
+    if text[:1].isalpha() and (len(text) not in (4, 5) or text.lower() not in _BOOL_WORDS):
+        return text
+    return _NO_MATCH
+
+
+_CONVERTERS = {int: _decode_int, float: _decode_float, bool: _decode_bool, str: _decode_str}
+
+
+class ValueDecoder:
+    """Decode assignment values with per-key converters instead of generic classification.
+
+    Keys in ``schema`` go straight to the converter for their type; other keys
+    are classified by parse_scalar the first time they are seen and use that
+    type's converter afterwards. A converter that does not recognise a value
+    defers to parse_scalar, so decoded values always equal parse_scalar's.
+    """
+
+    def __init__(self, schema=None):
+        schema = FIELD_SCHEMA if schema is None else schema
+        self.converters = {key: _CONVERTERS[kind] for key, kind in schema.items()}
+
+    def decode(self, key, value):
+        if not isinstance(value, str):
+            return value
+        text = value.strip().rstrip(";")
+        converter = self.converters.get(key)
+        if converter is not None:
+            result = converter(text)
+            if result is not _NO_MATCH:
+                return result
+            return _parse_text(text)
+        result = _parse_text(text)
+        self.converters[key] = _CONVERTERS[type(result)]
+        return result
+
+
+# Batches smaller than this are converted in plain Python: importing NumPy
+# costs far more than it saves on the few hundred items of a real dataset.
+NUMPY_MIN_BATCH = 50_000
+
+
+@lru_cache(maxsize=None)
+def load_numpy():
+    """Return the numpy module when it is installed, otherwise None."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def process_pool(max_workers):
+    """Return a ProcessPoolExecutor whose workers are not forked from this process.
+
+    Pools are started while other threads run (the online fetch, web app
+    request threads), and forking a multi-threaded process can deadlock a
+    child on a lock some other thread held. Workers come from a fork server
+    where available, else they are spawned.
+    """
+    import multiprocessing  # slow to import, and only needed for parallel runs
+    from concurrent.futures import ProcessPoolExecutor
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
 
 
 def process_boost(value):
@@ -30,6 +173,37 @@ def process_boost(value):
     return 0 if numeric in (0.0, 1.0) else round((numeric - 1) * 100)
 
 
+def process_boosts(values):
+    """Apply process_boost to a whole sequence of multipliers in one pass.
+
+    Batches of at least NUMPY_MIN_BATCH values are vectorized with NumPy when
+    it is installed; the rounding matches process_boost exactly (both round
+    half to even).
+    """
+    numpy = load_numpy() if len(values) >= NUMPY_MIN_BATCH else None
+    if numpy is None:
+        return [process_boost(value) for value in values]
+    try:
+        multipliers = numpy.array(values, dtype=float)
+    except (TypeError, ValueError):
+        multipliers = numpy.array([_boost_multiplier(value) for value in values], dtype=float)
+    neutral = (multipliers == 0) | (multipliers == 1) | numpy.isnan(multipliers)
+    percentages = numpy.round((numpy.where(neutral, 1.0, multipliers) - 1) * 100)
+    return percentages.astype(int).tolist()
+
+
+def _boost_multiplier(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def boost_columns(items, fields):
+    """Return ``{field: [percentage, ...]}`` for every boost field of ``items`` (mappings), in item order."""
+    return {field: process_boosts([item.get(field, 1) for item in items]) for field in fields}
+
+
 def sanitize_resource_name(name, fallback):
     """Normalize an item name for generated Android resource identifiers."""
     text = str(name or fallback).strip().lower()
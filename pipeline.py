@@ -1,8 +1,13 @@
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from file_parser import FileParser
 from online_data import OnlineDataManager
 from filter_util import DataFilter
 from models import ItemRecord, OUTPUT_ORDER
+from parse_cache import CACHE_VERSION
+from profiler import NULL_PROFILER
 
 logger = logging.getLogger(__name__)
 
@@ -27,35 +32,132 @@ FILE_MAP = {
     "weapon-axe-2.enml": "axe",
 }
 
+# Profiler stage names of the timings ItemPipeline keeps for the run summary.
+_PROFILE_STAGES = {"snapshot": "snapshot load", "parse": "local parse", "online": "online fetch"}
+
 
 class ItemPipeline:
-    def __init__(self, items_folder, online_items_url, file_map=None, data_filter=None, online_manager=None):
+    def __init__(self, items_folder, online_items_url, file_map=None, data_filter=None, online_manager=None,
+                 max_workers=None, cache=None, scanner="stream", snapshot=None, profiler=None):
         self.items_folder = items_folder
         self.online_items_url = online_items_url
         self.file_map = file_map or FILE_MAP
         self.data_filter = data_filter or DataFilter()
         self.online_manager = online_manager or OnlineDataManager()
+        self.max_workers = max_workers
+        self.cache = cache
+        self.scanner = scanner
+        self.snapshot = snapshot
+        self.profiler = profiler or NULL_PROFILER
+        self.timings = {}
+
+    def _timed(self, stage, func, *args):
+        started = time.perf_counter()
+        try:
+            with self.profiler.stage(_PROFILE_STAGES[stage]):
+                return func(*args)
+        finally:
+            self.timings[stage] = time.perf_counter() - started
 
     def load_items(self):
-        local = FileParser(str(self.items_folder), self.file_map).parse_files()
-        total = sum(len(items) for items in local.values())
-        online = self.online_manager.get_online_item_data(self.online_items_url)
-
-        if total == 0:
-            if online:
-                logger.info("No local items found. Using online fallback data.")
-                merged = self.online_manager.convert_online_to_local(online)
+        # The online fetch (or bundled-snapshot load) runs in a background
+        # thread while the local files are parsed, so a slow network only
+        # costs the time it exceeds parsing by.
+        self.timings = {}
+        parser = FileParser(str(self.items_folder), self.file_map, max_workers=self.max_workers,
+                            cache=self.cache, scanner=self.scanner, profiler=self.profiler)
+        local_files = self._local_file_stats(parser) if self.snapshot is not None else None
+        if local_files is not None:
+            source = self.online_manager.peek_online_source(self.online_items_url)
+            if source is not None:
+                items = self._timed("snapshot", self.snapshot.load, self._fingerprint(local_files, source))
+                if items is not None:
+                    return items
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="online-fetch") as executor:
+            online_future = executor.submit(self._timed, "online", self.online_manager.load_online_data,
+                                            self.online_items_url)
+            local = self._timed("parse", parser.parse_files)
+            online, source = online_future.result()
+        logger.info("Parsed local files in %.2fs, online data ready in %.2fs",
+                    self.timings["parse"], self.timings["online"])
+        items = self.assemble(local, online)
+        if local_files is not None and source is not None:
+            self.snapshot.save(self._fingerprint(local_files, source), items)
+        return items
+
+    def assemble(self, local, online, has_local=None):
+        """Merge parsed local items with online data, then filter, reclassify and sort them.
+
+        ``has_local`` overrides whether any local items exist (falling back to
+        the online data when none do), for callers passing only some types.
+        """
+        if has_local is None:
+            has_local = any(local.values())
+
+        with self.profiler.stage("merge"):
+            if not has_local:
+                if online:
+                    logger.info("No local items found. Using online fallback data.")
+                    merged = self.online_manager.convert_online_to_local(online)
+                else:
+                    logger.warning("No local items found and online fallback is unavailable.")
+                    merged = local
+            elif online:
+                merged = self.online_manager.merge_online_fields(local, online)
             else:
-                logger.warning("No local items found and online fallback is unavailable.")
                 merged = local
-        elif online:
-            merged = self.online_manager.merge_online_fields(local, online)
+
+        if hasattr(self.data_filter, "filter_into"):
+            with self.profiler.stage("filter+reclassify+sort"):
+                items = self.build_records(merged)
         else:
-            merged = local
+            with self.profiler.stage("filter"):
+                filtered = self.data_filter.filter_parsed_data(merged)
+            with self.profiler.stage("reclassify"):
+                reclassified = self.reclassify_axes_and_hammers(filtered)
+            with self.profiler.stage("sort"):
+                items = self.to_records(self.sort_grouped_items(reclassified))
+        return items
+
+    def _local_file_stats(self, parser):
+        stats = []
+        for file_name, item_type in parser.relevant_files():
+            stat = os.stat(os.path.join(parser.folder_path, file_name))
+            stats.append((file_name, item_type, stat.st_size, stat.st_mtime_ns))
+        return tuple(stats)
+
+    def _fingerprint(self, local_files, online_source):
+        """Identify the inputs (and parser version) a snapshot was built from; any change makes it stale."""
+        return (CACHE_VERSION, os.path.abspath(str(self.items_folder)), local_files, online_source,
+                type(self.data_filter).__name__, getattr(self.data_filter, "digest", None))
+
+    def build_records(self, data):
+        """Filter, reclassify, wrap in ItemRecords and sort in a single pass over ``data``.
+
+        Same result as to_records(sort_grouped_items(reclassify_axes_and_hammers(
+        filter_parsed_data(data)))), but each kept item is visited once and only
+        its record is allocated.
+        """
+        buckets = {item_type: [] for item_type in OUTPUT_ORDER}
+        moved = []  # maces/hammers among the axes; they follow the hammers, as in the staged pipeline
+
+        def sink(item_type):
+            append = buckets.setdefault(item_type, []).append
+            if item_type == "axe":
+                def place_axe(item):
+                    if str(item.get("secondaryType", "")).lower() in ("mace", "hammer"):
+                        moved.append(ItemRecord("hammer", item))
+                    else:
+                        append(ItemRecord("axe", item))
+                return place_axe
+            return lambda item: append(ItemRecord(item_type, item))
 
-        filtered = self.data_filter.filter_parsed_data(merged)
-        reclassified = self.reclassify_axes_and_hammers(filtered)
-        return self.to_records(self.sort_grouped_items(reclassified))
+        self.data_filter.filter_into(data, sink)
+        buckets["hammer"].extend(moved)
+        for records in buckets.values():
+            records.sort(key=ItemRecord.sort_key)
+        return buckets
 
     @staticmethod
     def reclassify_axes_and_hammers(data):
@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class StageEvent:
+    name: str
+    start: float  # time.perf_counter() at entry
+    wall: float
+    cpu: float  # CPU time of the thread (or worker process) that ran the stage
+    depth: int = 0
+    pid: int = 0
+    tid: int = 0
+    thread: str = ""
+    args: dict = field(default_factory=dict)
+
+
+class Profiler:
+    """Record wall and CPU time of named pipeline stages.
+
+    Stages nest per thread; ``report()`` renders a breakdown table and
+    ``write_chrome_trace()`` a trace viewable in chrome://tracing or Perfetto.
+    A disabled profiler records nothing and costs a single attribute check.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def stage(self, name, **args):
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name, args)
+
+    @contextmanager
+    def _stage(self, name, args):
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        cpu_started = time.thread_time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - started
+            cpu = time.thread_time() - cpu_started
+            self._local.depth = depth
+            thread = threading.current_thread()
+            self.record(name, started, wall, cpu, depth=depth, tid=thread.ident, thread=thread.name, **args)
+
+    def record(self, name, start, wall, cpu, depth=0, pid=None, tid=None, thread="", **args):
+        """Add a stage measured elsewhere, e.g. in a worker process."""
+        if not self.enabled:
+            return
+        event = StageEvent(name, start, wall, cpu, depth, pid or os.getpid(), tid or 0, thread, args)
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self):
+        """Return ``[(name, depth, calls, wall, cpu)]`` aggregated by name, in order of first start."""
+        totals = {}
+        for event in sorted(self.events, key=lambda event: event.start):
+            entry = totals.setdefault(event.name, [event.depth, 0, 0.0, 0.0])
+            entry[1] += 1
+            entry[2] += event.wall
+            entry[3] += event.cpu
+        return [(name, depth, calls, wall, cpu) for name, (depth, calls, wall, cpu) in totals.items()]
+
+    def report(self):
+        width = max([len("stage")] + [len(name) + 2 * depth for name, depth, *_ in self.summary()])
+        lines = [f"  {'stage':<{width}}  {'calls':>5}  {'wall ms':>9}  {'cpu ms':>9}"]
+        for name, depth, calls, wall, cpu in self.summary():
+            label = "  " * depth + name
+            lines.append(f"  {label:<{width}}  {calls:>5}  {wall * 1000:>9.1f}  {cpu * 1000:>9.1f}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Return the recorded stages as a Chrome trace-event document."""
+        trace = []
+        threads = {}
+        for event in self.events:
+            if event.thread:
+                threads[(event.pid, event.tid)] = event.thread
+            trace.append({
+                "name": event.name,
+                "ph": "X",
+                "ts": round((event.start - self.origin) * 1e6, 1),
+                "dur": round(event.wall * 1e6, 1),
+                "pid": event.pid,
+                "tid": event.tid,
+                "args": dict(event.args, cpu_ms=round(event.cpu * 1000, 3)),
+            })
+        for (pid, tid), name in threads.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.chrome_trace(), handle)
+
+
+NULL_PROFILER = Profiler(enabled=False)
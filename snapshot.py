@@ -0,0 +1,154 @@
+"""Binary snapshot of the merged item dataset for fast cold starts.
+
+Layout: ``MAGIC``, a struct header (format version and the Python version
+that wrote the ``marshal`` payload), then one marshalled tuple holding the
+input fingerprint, a string table, and per item type its row count, field
+order and one packed column per field.
+"""
+import logging
+import marshal
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+
+from models import ItemRecord, layout_for
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+MAGIC = b"MRSNAP\x00"
+_HEADER = struct.Struct("<IBB")
+_MARSHAL_VERSION = 4
+
+# Column kinds: packed arrays for homogeneous columns, marshalled objects otherwise.
+_BOOL, _INT, _FLOAT, _STR, _OBJECT = "b", "q", "d", "s", "o"
+_INT_RANGE = (-(1 << 63), (1 << 63) - 1)
+
+
+def _column_kind(values):
+    kinds = {type(value) for value in values}
+    if kinds == {bool}:
+        return _BOOL
+    if kinds == {int} and all(_INT_RANGE[0] <= value <= _INT_RANGE[1] for value in values):
+        return _INT
+    if kinds == {float}:
+        return _FLOAT
+    if kinds == {str}:
+        return _STR
+    return _OBJECT
+
+
+def _pack_column(values, strings, string_ids):
+    """Pack present ``values`` as ``(kind, payload)``."""
+    kind = _column_kind(values)
+    if kind == _BOOL:
+        return kind, bytes(values)
+    if kind in (_INT, _FLOAT):
+        return kind, array(kind, values).tobytes()
+    if kind == _STR:
+        ids = array("I")
+        for value in values:
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(strings)
+                strings.append(value)
+            ids.append(string_id)
+        return kind, ids.tobytes()
+    return kind, list(values)
+
+
+def _unpack_column(kind, payload, strings):
+    if kind == _BOOL:
+        return [bool(value) for value in payload]
+    if kind in (_INT, _FLOAT):
+        return array(kind, payload).tolist()
+    if kind == _STR:
+        return [strings[string_id] for string_id in array("I", payload)]
+    return payload
+
+
+def encode_items(items_by_type, fingerprint):
+    strings, string_ids = [], {}
+    sections = []
+    for item_type, records in items_by_type.items():
+        mappings = [record.as_mapping() for record in records]
+        fields, columns = [], []
+        for field in list(layout_for(item_type).names):
+            rows = array("I")
+            values = []
+            for row, mapping in enumerate(mappings):
+                if field in mapping:
+                    rows.append(row)
+                    values.append(mapping[field])
+            if not values:
+                continue
+            fields.append(field)
+            # Rows are only stored for columns with gaps.
+            present = b"" if len(rows) == len(mappings) else rows.tobytes()
+            columns.append((present,) + _pack_column(values, strings, string_ids))
+        sections.append((item_type, len(mappings), fields, columns))
+    payload = marshal.dumps((fingerprint, strings, sections), _MARSHAL_VERSION)
+    header = _HEADER.pack(SNAPSHOT_VERSION, sys.version_info[0], sys.version_info[1])
+    return MAGIC + header + payload
+
+
+def decode_items(data, fingerprint):
+    """Return ``{item_type: [ItemRecord]}`` or None if ``data`` is stale or unreadable."""
+    if not data.startswith(MAGIC):
+        return None
+    offset = len(MAGIC)
+    version, major, minor = _HEADER.unpack_from(data, offset)
+    if version != SNAPSHOT_VERSION or (major, minor) != sys.version_info[:2]:
+        return None
+    stored_fingerprint, strings, sections = marshal.loads(data[offset + _HEADER.size:])
+    if stored_fingerprint != fingerprint:
+        return None
+
+    items_by_type = {}
+    for item_type, count, fields, columns in sections:
+        layout = layout_for(item_type)
+        for field in fields:  # keep the writer's field order in a fresh process
+            layout.position(field)
+        rows = [{} for _ in range(count)]
+        for field, (present, kind, payload) in zip(fields, columns):
+            values = _unpack_column(kind, payload, strings)
+            targets = array("I", present) if present else range(count)
+            for row, value in zip(targets, values):
+                rows[row][field] = value
+        items_by_type[item_type] = [ItemRecord(item_type, row) for row in rows]
+    return items_by_type
+
+
+class ItemSnapshot:
+    """Single-slot snapshot file, reused while the pipeline inputs' fingerprint matches."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def load(self, fingerprint):
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return None
+        try:
+            items_by_type = decode_items(data, fingerprint)
+        except (ValueError, EOFError, TypeError, struct.error) as e:
+            logger.warning("Ignoring unreadable snapshot %s: %s", self.path, e)
+            return None
+        if items_by_type is not None:
+            logger.info("Loaded %s item(s) from snapshot %s",
+                        sum(len(items) for items in items_by_type.values()), self.path)
+        return items_by_type
+
+    def save(self, fingerprint, items_by_type):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(encode_items(items_by_type, fingerprint))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not write snapshot %s: %s", self.path, e)
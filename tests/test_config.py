@@ -18,6 +18,13 @@ class ConfigTests(unittest.TestCase):
             "out",
             "--log-level",
             "debug",
+            "--jobs",
+            "4",
+            "--export-jobs",
+            "2",
+            "--online-stream",
+            "--online-fields",
+            "maxLevel*, *Price",
         ])
 
         self.assertEqual(config.output_type, "developer")
@@ -26,6 +33,10 @@ class ConfigTests(unittest.TestCase):
         self.assertEqual([str(path) for path in config.enemy_directories], ["enemy-a", "enemy-b"])
         self.assertEqual(str(config.output_dir), "out")
         self.assertEqual(config.log_level, "DEBUG")
+        self.assertEqual(config.jobs, 4)
+        self.assertEqual(config.export_jobs, 2)
+        self.assertTrue(config.online_stream)
+        self.assertEqual(config.online_fields, ("maxLevel*", "*Price"))
 
     def test_parse_args_uses_enemy_env_var(self):
         original = os.environ.get("MAGIC_RAMPAGE_ENEMY_DIRS")
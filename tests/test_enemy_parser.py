@@ -34,6 +34,25 @@ equippedItem2 {
         self.assertEqual(enemies[0]["_items"]["damage"], 10)  # 3 + 7
         self.assertEqual(enemies[0]["_items"]["speedBoost"], 3.0)  # 1.5 * 2
 
+    def test_parse_file_indexes_blocks_once_for_many_characters(self):
+        content = "".join(
+            f"character {{\n  resistance = {index};\n}}\nequippedItem{index} {{\n  damage = 1;\n}}\n"
+            for index in range(1, 4)
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "horde.character"
+            path.write_text(content, encoding="utf-8")
+            parser = EnemyParser([tmp_dir])
+            blocks = parser.read_blocks(path)
+            index = parser.index_blocks(blocks)
+            enemies = parser.parse_file(path)
+
+        self.assertEqual([fields["resistance"] for fields in index["character"]], [1, 2, 3])
+        self.assertEqual(len(index["equippedItem"]), 3)
+        self.assertEqual([enemy["resistance"] for enemy in enemies], [1, 2, 3])
+        self.assertEqual([enemy["_items"]["damage"] for enemy in enemies], [3, 3, 3])
+        self.assertIsNot(enemies[0]["_items"], enemies[1]["_items"])
+
     def test_parse_enemy_stats_supports_developer_mode(self):
         content = """
 character {
@@ -0,0 +1,115 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from enml_tokenizer import iter_enml_blocks, iter_enml_events, iter_enml_events_mmap
+
+
+def _is_item(name):
+    return name == "item"
+
+
+class IterEnmlEventsTests(unittest.TestCase):
+    def test_yields_assignments_with_line_numbers_and_close_event(self):
+        stream = io.StringIO("item\n{\n  name = Holy Sword // note\n  damage = 10\n}\n")
+        events = list(iter_enml_events(stream, _is_item))
+        self.assertEqual(events, [
+            ("item", "name", "Holy Sword", 3),
+            ("item", "damage", "10", 4),
+            ("item", None, None, 5),
+        ])
+
+    def test_brace_on_header_line_and_closing_after_assignment(self):
+        events = list(iter_enml_events(["item { name = A", "damage = 2 }"], _is_item))
+        self.assertEqual(events, [
+            ("item", "name", "A", 1),
+            ("item", "damage", "2", 2),
+            ("item", None, None, 2),
+        ])
+
+    def test_nested_assignments_are_optional(self):
+        lines = ["item {", "a = 1", "sub {", "b = 2", "}", "}"]
+        flat = [key for _, key, _, _ in iter_enml_events(lines, _is_item) if key]
+        top = [key for _, key, _, _ in iter_enml_events(lines, _is_item, nested=False) if key]
+        self.assertEqual(flat, ["a", "b"])
+        self.assertEqual(top, ["a"])
+
+    def test_ignores_other_blocks_and_unterminated_blocks(self):
+        lines = ["other {", "a = 1", "}", "item {", "b = 2"]
+        events = list(iter_enml_events(lines, _is_item))
+        self.assertEqual(events, [("item", "b", "2", 5)])
+
+
+class IterEnmlBlocksTests(unittest.TestCase):
+    def test_groups_fields_per_block(self):
+        lines = ["item {", "a = 1", "}", "item", "{", "}", "item {", "b = x", "}"]
+        blocks = list(iter_enml_blocks(lines, _is_item, lambda key, value: value.upper()))
+        self.assertEqual([fields for _, fields, _ in blocks], [{"a": "1"}, {}, {"b": "X"}])
+
+
+class IterEnmlEventsMmapTests(unittest.TestCase):
+    CONTENT = (
+        "// item { skipped = 1 }\n"
+        "item { name = A\r\n"
+        "damage = 2 }\r\n"
+        "other {\n a = 1\n}\n"
+        "item\n"
+        "{\n"
+        "  url = a/b // comment\n"
+        "  sub { x = 1 }\n"
+        "  empty =\n"
+        "}\n"
+    )
+
+    def test_matches_line_based_events(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "items.enml"
+            path.write_bytes(self.CONTENT.encode("utf-8"))
+            for nested in (True, False):
+                with open(path, encoding="utf-8") as handle:
+                    expected = list(iter_enml_events(handle, _is_item, nested))
+                self.assertEqual(list(iter_enml_events_mmap(path, _is_item, nested)), expected)
+
+    PARITY_CASES = (
+        "item Foo { my key = 5 }\n",
+        "item Foo\n{\n  my key = a = b\n}\n",
+        "item {\ra = 1\r}\rb = 2\r",
+        "item\u00a0{\u2003name = A\u00a0\n\u3000damage\u2003= 2 }\n",
+        "item { a = 1 } item Foo { b = 2 } x = 3 { c = 4 }\n",
+        "} item {\na = 1\n}\n",
+        "item\njunk = 1 {\na = 2 }\n",
+        "{\nitem = 1 {\n}\n",
+        "item { a = 1 /2 }\nitem { b = // c }\n}\n",
+    )
+
+    def test_scanners_agree_on_whitespace_and_key_edge_cases(self):
+        def is_header(name):
+            return name in ("item", "item Foo")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "items.enml"
+            for content in self.PARITY_CASES:
+                path.write_bytes(content.encode("utf-8"))
+                for nested in (True, False):
+                    with self.subTest(content=content, nested=nested):
+                        with open(path, encoding="utf-8") as handle:
+                            expected = list(iter_enml_events(handle, is_header, nested))
+                        self.assertEqual(list(iter_enml_events_mmap(path, is_header, nested)), expected)
+
+    def test_keys_and_headers_may_contain_spaces(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "items.enml"
+            path.write_bytes(b"item Foo { my key = 5 }\n")
+            events = list(iter_enml_events_mmap(path, lambda name: name == "item Foo"))
+        self.assertEqual(events, [("item Foo", "my key", "5", 1), ("item Foo", None, None, 1)])
+
+    def test_empty_file_yields_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "empty.enml"
+            path.write_bytes(b"")
+            self.assertEqual(list(iter_enml_events_mmap(path, _is_item)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
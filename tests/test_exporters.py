@@ -0,0 +1,118 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import exporters
+from exporters import MANIFEST_NAME, ExportService
+from models import ItemRecord
+from parse_cache import ParseCache
+
+ITEMS = {"sword": [ItemRecord("sword", {"name": "Holy Sword", "damage": 10})]}
+
+
+class ExportServiceWriteTests(unittest.TestCase):
+    def test_identical_content_is_not_rewritten(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            first = ExportService(out_dir).export_items(ITEMS, "sword", "developer")
+            self.assertTrue(first.written)
+            os.utime(first.path, ns=(0, 0))
+
+            exporter = ExportService(out_dir)
+            second = exporter.export_items(ITEMS, "sword", "developer")
+            self.assertFalse(second.written)
+            self.assertEqual(first.path.stat().st_mtime_ns, 0)
+            self.assertEqual((exporter.written, exporter.unchanged), (0, 1))
+
+            changed = {"sword": [ItemRecord("sword", {"name": "Holy Sword", "damage": 12})]}
+            self.assertTrue(exporter.export_items(changed, "sword", "developer").written)
+            self.assertNotEqual(first.path.stat().st_mtime_ns, 0)
+            self.assertEqual(sorted(path.name for path in Path(out_dir).iterdir()),
+                             sorted([MANIFEST_NAME, "sword_code.txt"]))
+
+    @unittest.skipIf(os.name != "posix", "POSIX file modes")
+    def test_written_files_honor_umask_and_keep_existing_mode(self):
+        umask = os.umask(0o022)
+        try:
+            with tempfile.TemporaryDirectory() as out_dir:
+                path = ExportService(out_dir).write_text("diff_report.txt", "report")
+                self.assertEqual(path.stat().st_mode & 0o777, 0o644)
+                self.assertEqual((Path(out_dir) / MANIFEST_NAME).stat().st_mode & 0o777, 0o644)
+                os.chmod(path, 0o640)
+                ExportService(out_dir).write_text("diff_report.txt", "changed")
+                self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+        finally:
+            os.umask(umask)
+
+    def test_same_size_hand_edit_is_rewritten(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = ExportService(out_dir).write_text("diff_report.txt", "report")
+            path.write_text("REPORT", encoding="utf-8")
+            result = ExportService(out_dir).write_text("diff_report.txt", "report")
+            self.assertEqual(result.read_text(encoding="utf-8"), "report")
+
+    def test_existing_identical_file_without_manifest_is_kept(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = ExportService(out_dir).write_text("diff_report.txt", "same")
+            os.remove(Path(out_dir) / MANIFEST_NAME)
+            os.utime(path, ns=(0, 0))
+            ExportService(out_dir).write_text("diff_report.txt", "same")
+            self.assertEqual(path.stat().st_mtime_ns, 0)
+
+    def test_file_edited_outside_the_exporter_is_rewritten(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = ExportService(out_dir).write_text("diff_report.txt", "report")
+            path.write_text("edited by hand", encoding="utf-8")
+            ExportService(out_dir).write_text("diff_report.txt", "report")
+            self.assertEqual(path.read_text(encoding="utf-8"), "report")
+
+
+class ExportServiceParallelTests(unittest.TestCase):
+    def test_parallel_export_keeps_result_and_stdout_order(self):
+        items = {
+            "armor": [ItemRecord("armor", {"name": "Plate", "armor": 5})],
+            "ring": [],
+            "sword": [ItemRecord("sword", {"name": "Holy Sword", "damage": 10})],
+            "axe": [ItemRecord("axe", {"name": "Axe", "damage": 3})],
+        }
+        with tempfile.TemporaryDirectory() as items_dir, tempfile.TemporaryDirectory() as enemy_dir:
+            (Path(items_dir) / "class-heads.enml").write_text("helmet0\n{\n    class = knight\n}\n",
+                                                               encoding="utf-8")
+            (Path(enemy_dir) / "slime.character").write_text("character {\n  resistance = 10;\n}\n",
+                                                             encoding="utf-8")
+            outputs = []
+            for workers in (None, 3):
+                printed = io.StringIO()
+                with contextlib.redirect_stdout(printed), mock.patch.object(exporters, "POOL_MIN_ITEMS", 0):
+                    results = ExportService(items_dir, to_stdout=True, max_workers=workers).export_all(
+                        items, "normal", items_dir, [Path(enemy_dir)])
+                outputs.append((results, printed.getvalue()))
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual([result.label for result in outputs[1][0]], ["armor", "sword", "axe", "class", "enemy"])
+
+    def test_small_exports_are_formatted_in_process(self):
+        with tempfile.TemporaryDirectory() as items_dir:
+            exporter = ExportService(items_dir, to_stdout=True, max_workers=4)
+            with mock.patch("concurrent.futures.ProcessPoolExecutor") as pool, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                results = exporter.export_all(ITEMS, "normal", items_dir, [])
+        pool.assert_not_called()
+        self.assertEqual([result.label for result in results], ["sword", "class", "enemy"])
+
+    def test_parallel_export_counts_worker_cache_lookups(self):
+        with tempfile.TemporaryDirectory() as items_dir, tempfile.TemporaryDirectory() as cache_dir:
+            (Path(items_dir) / "class-heads.enml").write_text("helmet0\n{\n    class = knight\n}\n",
+                                                               encoding="utf-8")
+            cache = ParseCache(cache_dir)
+            for expected in ((0, 1), (1, 1)):
+                exporter = ExportService(items_dir, to_stdout=True, cache=cache, max_workers=2)
+                with contextlib.redirect_stdout(io.StringIO()), mock.patch.object(exporters, "POOL_MIN_ITEMS", 0):
+                    exporter.export_all(ITEMS, "normal", items_dir, [])
+                self.assertEqual((cache.hits, cache.misses), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -25,6 +25,26 @@ class FileParserTests(unittest.TestCase):
         self.assertEqual(result["sword"][0]["name"], "Holy Sword")
         self.assertEqual(result["sword"][0]["damage"], 10)
 
+    def test_parse_files_mmap_scanner_matches_stream(self):
+        content = "item\n{\n    name = Holy Sword // note\n    damage = 10\n    frost = true\n}\n"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "weapon-sword-1.enml").write_text(content, encoding="utf-8")
+            stream = FileParser(tmp_dir, {"weapon-sword-1.enml": "sword"}).parse_files()
+            mapped = FileParser(tmp_dir, {"weapon-sword-1.enml": "sword"}, scanner="mmap").parse_files()
+        self.assertEqual(mapped, stream)
+
+    def test_parse_files_merges_in_file_map_order_with_workers(self):
+        file_map = {"b.enml": "sword", "a.enml": "sword", "c.enml": "axe"}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for file_name in file_map:
+                content = f"item\n{{\n    name = {file_name}\n}}\n"
+                (Path(tmp_dir) / file_name).write_text(content, encoding="utf-8")
+            sequential = FileParser(tmp_dir, file_map).parse_files()
+            parallel = FileParser(tmp_dir, file_map, max_workers=2).parse_files()
+        self.assertEqual(parallel, sequential)
+        self.assertEqual([item["name"] for item in parallel["sword"]], ["b.enml", "a.enml"])
+        self.assertEqual([item["name"] for item in parallel["axe"]], ["c.enml"])
+
     def test_parse_files_missing_folder_returns_empty_groups(self):
         parser = FileParser("does-not-exist", {"weapon-sword-1.enml": "sword"})
         result = parser.parse_files()
@@ -0,0 +1,64 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from filter_util import DEFAULT_RULES, DataFilter
+
+
+def _items():
+    return {
+        "sword": [
+            {"name": "Holy Sword"},
+            {"name": "Holy Sword B "},
+            {"name": "Dummy", "sprite": " Sword_Dummy.png"},
+            {"name": "Rune", "secondaryType": "RUNE"},
+        ],
+        "armor": [
+            {"name": "Plate", "sprite": "question_mark_entity.png"},
+            {"name": "Dummy", "sprite": "armor_dummy.png"},
+        ],
+        "ring": [{"name": "Ring", "sprite": "ring_dummy.png"}, {"name": "Gold Ring"}],
+    }
+
+
+class DataFilterTests(unittest.TestCase):
+    def test_default_rules_keep_existing_behavior_and_count_exclusions(self):
+        data_filter = DataFilter()
+        filtered = data_filter.filter_parsed_data(_items())
+        self.assertEqual({t: [i["name"] for i in items] for t, items in filtered.items()},
+                         {"sword": ["Holy Sword"], "armor": ["Plate"], "ring": ["Gold Ring"]})
+        self.assertEqual(dict(data_filter.exclusions), {
+            "b-variant": 1, "weapon-dummy-sprite": 1, "non-equipment": 1,
+            "armor-dummy-sprite": 1, "ring-dummy-sprite": 1,
+        })
+
+    def test_rules_load_from_file_and_can_extend_defaults(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "rules.json"
+            path.write_text(json.dumps({"include_defaults": True, "rules": [
+                {"id": "gold", "types": ["ring"], "field": "name", "ignore_case": True, "suffix": [" ring"]},
+            ]}), encoding="utf-8")
+            data_filter = DataFilter.from_file(path)
+        filtered = data_filter.filter_parsed_data(_items())
+        self.assertEqual(filtered["ring"], [])
+        self.assertEqual(data_filter.exclusions["gold"], 1)
+        self.assertNotEqual(data_filter.digest, DataFilter().digest)
+        self.assertEqual(len(data_filter.rules), len(DEFAULT_RULES) + 1)
+
+    def test_non_string_values_are_matched_without_memoizing(self):
+        data_filter = DataFilter([{"id": "flag", "field": "flag", "ignore_case": True, "equals": ["true"]}])
+        items = {"sword": [{"flag": True}, {"flag": 1}, {"flag": ["true"]}, {"flag": "TRUE "}, {"flag": True}]}
+        filtered = data_filter.filter_parsed_data(items)
+        self.assertEqual(filtered["sword"], [{"flag": 1}, {"flag": ["true"]}])
+        self.assertEqual(data_filter.exclusions["flag"], 3)
+
+    def test_invalid_rule_is_rejected(self):
+        with self.assertRaises(ValueError):
+            DataFilter([{"id": "x", "field": "name"}])
+        with self.assertRaises(ValueError):
+            DataFilter([{"id": "x", "field": "name", "equals": ["a"], "contains": ["b"]}])
+
+
+if __name__ == "__main__":
+    unittest.main()
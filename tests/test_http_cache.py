@@ -0,0 +1,96 @@
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from http_cache import HttpCache, HttpFetchError, urllib_transport
+from online_data import OnlineDataManager
+
+BODY = json.dumps([{"name": "Holy Sword", "type": "weapon", "secondaryType": "sword"}]).encode("utf-8")
+ETAG = '"v1"'
+
+
+class _GistHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpCacheTests(unittest.TestCase):
+    def setUp(self):
+        _GistHandler.requests_seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _GistHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/items.json"
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp_dir.name) / "http"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def test_revalidates_with_etag_and_reuses_body_on_304(self):
+        cache = HttpCache(self.cache_dir, max_age=0, transport=urllib_transport)
+        self.assertEqual(cache.get(self.url), BODY)
+        self.assertEqual(cache.get(self.url), BODY)
+
+        self.assertEqual((cache.downloads, cache.revalidated), (1, 1))
+        self.assertNotIn("If-None-Match", _GistHandler.requests_seen[0])
+        self.assertEqual(_GistHandler.requests_seen[1]["If-None-Match"], ETAG)
+        self.assertEqual(_GistHandler.requests_seen[1]["If-Modified-Since"], "Mon, 01 Jan 2024 00:00:00 GMT")
+
+    def test_fresh_entry_skips_network(self):
+        cache = HttpCache(self.cache_dir, max_age=3600, transport=urllib_transport)
+        cache.get(self.url)
+        self.assertEqual(HttpCache(self.cache_dir, max_age=3600, transport=urllib_transport).get(self.url), BODY)
+        self.assertEqual(len(_GistHandler.requests_seen), 1)
+
+    def test_failed_fetch_raises(self):
+        def unreachable(url, headers, timeout):
+            raise OSError("connection refused")
+
+        with self.assertRaises(HttpFetchError):
+            HttpCache(self.cache_dir, max_age=0, transport=unreachable).get(self.url)
+
+    def test_failed_fetch_serves_stale_body(self):
+        HttpCache(self.cache_dir, max_age=0, transport=urllib_transport).get(self.url)
+
+        def unreachable(url, headers, timeout):
+            raise OSError("connection refused")
+
+        cache = HttpCache(self.cache_dir, max_age=0, transport=unreachable)
+        manager = OnlineDataManager(bundled_items_path=Path(self.tmp_dir.name) / "missing.json", http_cache=cache)
+        with self.assertLogs("http_cache", "WARNING"):
+            items = manager.get_online_item_data(self.url)
+        self.assertEqual([item["name"] for item in items], ["Holy Sword"])
+        self.assertEqual((cache.stale_hits, manager.fetch_failures), (1, 0))
+
+    def test_online_manager_reads_through_cache(self):
+        manager = OnlineDataManager(
+            bundled_items_path=Path(self.tmp_dir.name) / "missing.json",
+            http_cache=HttpCache(self.cache_dir, max_age=0, transport=urllib_transport),
+        )
+        self.assertEqual([item["name"] for item in manager.get_online_item_data(self.url)], ["Holy Sword"])
+        self.assertEqual([item["name"] for item in manager.get_online_item_data(self.url)], ["Holy Sword"])
+        self.assertEqual(manager.http_cache.revalidated, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import unittest
+
+from json_stream import iter_json_array
+
+DOCUMENT = json.dumps([
+    {"name": "Café Sword", "name_ja": "剣", "damage": 12.5},
+    [1, 2, {"nested": True}],
+    12345,
+    "text with ] and , inside",
+    None,
+], ensure_ascii=False)
+
+
+class IterJsonArrayTests(unittest.TestCase):
+    def test_matches_json_loads_for_every_chunk_size(self):
+        raw = DOCUMENT.encode("utf-8")
+        for size in range(1, 20):
+            chunks = [raw[i:i + size] for i in range(0, len(raw), size)]
+            self.assertEqual(list(iter_json_array(chunks)), json.loads(DOCUMENT), size)
+
+    def test_number_split_across_chunks(self):
+        self.assertEqual(list(iter_json_array(["[1", "23,4", "5]"])), [123, 45])
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array([b" [ ", b"] "])), [])
+
+    def test_yields_items_before_input_ends(self):
+        def chunks():
+            yield b'[{"a": 1}, '
+            raise AssertionError("read past the first item")
+
+        self.assertEqual(next(iter_json_array(chunks())), {"a": 1})
+
+    def test_malformed_input_raises(self):
+        for text in ("", "{}", "[1 2]", "[1,"):
+            with self.assertRaises(ValueError):
+                list(iter_json_array([text]))
+
+
+if __name__ == "__main__":
+    unittest.main()
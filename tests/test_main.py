@@ -1,5 +1,7 @@
 import contextlib
 import io
+import subprocess
+import sys
 import tempfile
 import unittest
 from pathlib import Path
@@ -63,5 +65,20 @@ class MainAllModeTests(unittest.TestCase):
         self.assertIn("Done:", text)
 
 
+class StartupImportTests(unittest.TestCase):
+    def test_single_type_command_loads_only_needed_modules(self):
+        with tempfile.TemporaryDirectory() as items_dir:
+            argv = ["developer", "sword", "--stdout", "--items-folder", items_dir,
+                    "--online-items-url", "", "--log-level", "critical"]
+            script = f"import sys, main; main.main({argv!r}); print(' '.join(sys.modules), file=sys.stderr)"
+            completed = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).resolve().parent.parent,
+                                       capture_output=True, text=True, check=True)
+        modules = set(completed.stderr.strip().splitlines()[-1].split())
+        self.assertIn("weapon_parser", modules)
+        for unneeded in ("class_parser", "enemy_parser", "formatter", "armor_ring_parser", "diff_checker",
+                         "multiprocessing"):
+            self.assertNotIn(unneeded, modules)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from types import SimpleNamespace
+
+from metrics import Metrics
+
+
+class MetricsTests(unittest.TestCase):
+    def test_request_counters_and_histogram(self):
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics.observe_request("sword", 200, 0.05)
+        metrics.observe_request("sword", 200, 0.5)
+        metrics.observe_request("unknown", 400, 0.01)
+        text = metrics.render()
+        self.assertIn('magic_rampage_requests_total{action="sword",status="200"} 2', text)
+        self.assertIn('magic_rampage_request_duration_seconds_bucket{action="sword",le="0.1"} 1', text)
+        self.assertIn('magic_rampage_request_duration_seconds_bucket{action="sword",le="+Inf"} 2', text)
+        self.assertIn('magic_rampage_request_duration_seconds_count{action="sword"} 2', text)
+        self.assertIn("# TYPE magic_rampage_request_duration_seconds histogram", text)
+
+    def test_dataset_gauge_reflects_last_load_only(self):
+        metrics = Metrics()
+        metrics.set_dataset({"sword": [1, 2], "axe": [1]})
+        metrics.set_dataset({"sword": [1]})
+        text = metrics.render()
+        self.assertIn('magic_rampage_dataset_items{type="sword"} 1', text)
+        self.assertNotIn('type="axe"', text)
+
+    def test_cache_and_online_counters_are_read_at_scrape_time(self):
+        parse_cache = SimpleNamespace(hits=3, misses=1)
+        http_cache = SimpleNamespace(fresh_hits=2, revalidated=1, downloads=1, stale_hits=0)
+        online = SimpleNamespace(fetch_failures=4, bundled_fallbacks=3)
+        output = SimpleNamespace(unchanged=5, written=2)
+        text = Metrics().render(parse_cache=parse_cache, http_cache=http_cache, online_manager=online,
+                                output_cache=output)
+        self.assertIn('magic_rampage_cache_requests_total{cache="parse",result="hit"} 3', text)
+        self.assertIn('magic_rampage_cache_requests_total{cache="online",result="revalidated"} 1', text)
+        self.assertIn('magic_rampage_cache_requests_total{cache="output",result="hit"} 5', text)
+        self.assertIn("magic_rampage_online_fetch_failures_total 4", text)
+        self.assertIn("magic_rampage_online_bundled_fallbacks_total 3", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import pickle
+import unittest
+
+from models import ClassRecord, EnemyRecord, ItemRecord, record_to_mapping
+
+
+class ItemRecordTests(unittest.TestCase):
+    def test_records_of_a_type_share_one_field_layout(self):
+        first = ItemRecord.from_mapping("sword", {"name": "A", "damage": 1})
+        second = ItemRecord.from_mapping("sword", {"damage": 2, "name": "B", "frost": True})
+        self.assertIs(first._layout, second._layout)
+        self.assertEqual(first.as_dict(), {"name": "A", "damage": 1})
+        self.assertEqual(second.as_dict(), {"name": "B", "damage": 2, "frost": True})
+        self.assertNotIn("frost", first.as_mapping())
+
+    def test_records_have_no_instance_dict(self):
+        record = ItemRecord.from_mapping("ring", {"name": "A"})
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertFalse(hasattr(record.as_mapping(), "__dict__"))
+
+    def test_mapping_view_is_read_only_and_not_a_copy(self):
+        record = ItemRecord.from_mapping("armor", {"name": "A", "armor": 3})
+        view = record_to_mapping(record)
+        self.assertEqual(view["armor"], 3)
+        self.assertEqual(view.get("missing", 7), 7)
+        self.assertEqual(len(view), 2)
+        with self.assertRaises(TypeError):
+            view["armor"] = 4
+        self.assertIs(view._values, record._values)
+
+    def test_record_to_mapping_passes_mappings_through(self):
+        item = {"name": "A"}
+        self.assertIs(record_to_mapping(item), item)
+
+    def test_equality_and_pickling(self):
+        record = ItemRecord.from_mapping("axe", {"name": "A", "damage": 5})
+        self.assertEqual(record, ItemRecord("axe", {"damage": 5, "name": "A"}))
+        self.assertNotEqual(record, ItemRecord("hammer", {"name": "A", "damage": 5}))
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+    def test_class_and_enemy_records(self):
+        self.assertEqual(ClassRecord.from_mapping({"class": "mage"}).as_dict(), {"class": "mage"})
+        self.assertEqual(EnemyRecord.from_mapping({"resistance": 1}).get("resistance"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,7 +20,60 @@ class OfflineFallbackTests(unittest.TestCase):
             # An empty URL makes the fetch fail immediately (no network), so the
             # bundled snapshot should be used instead.
             data = manager.get_online_item_data("")
+            # Without an index path nothing is written next to the bundled file.
+            self.assertEqual([path.name for path in Path(tmp_dir).iterdir()], ["items.json"])
         self.assertEqual([item["name"] for item in data], ["Holy Sword"])
+        self.assertEqual((manager.fetch_failures, manager.bundled_fallbacks), (1, 1))
+
+    def test_sidecar_index_reused_until_bundled_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bundled = Path(tmp_dir) / "items.json"
+            bundled.write_text(
+                json.dumps([{"name": "Holy Sword", "type": "weapon", "secondaryType": "sword"}]),
+                encoding="utf-8",
+            )
+            sidecar = Path(tmp_dir) / "cache" / "items.index.json"
+            OnlineDataManager(bundled_items_path=bundled, index_path=sidecar).get_online_item_data("")
+            index = json.loads(sidecar.read_text(encoding="utf-8"))
+            self.assertEqual(index["keys"], [["", "holy sword"]])
+            self.assertEqual(index["types"], ["sword"])
+
+            # A matching hash means the sidecar is trusted as-is.
+            index["types"] = ["axe"]
+            sidecar.write_text(json.dumps(index), encoding="utf-8")
+            manager = OnlineDataManager(bundled_items_path=bundled, index_path=sidecar)
+            data = manager.get_online_item_data("")
+            self.assertEqual(len(manager.convert_online_to_local(data)["axe"]), 1)
+
+            bundled.write_text(
+                json.dumps([{"name": "Dark Axe", "type": "weapon", "secondaryType": "axe"}]),
+                encoding="utf-8",
+            )
+            manager = OnlineDataManager(bundled_items_path=bundled, index_path=sidecar)
+            data = manager.get_online_item_data("")
+            self.assertEqual([item["name"] for item in data], ["Dark Axe"])
+            index = json.loads(sidecar.read_text(encoding="utf-8"))
+            self.assertEqual(index["keys"], [["", "dark axe"]])
+
+    def test_streaming_keeps_configured_fields_but_matches_localized_names(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bundled = Path(tmp_dir) / "items.json"
+            bundled.write_text(
+                json.dumps([
+                    {"name": "Espada Santa", "name_en": "Holy Sword", "type": "weapon",
+                     "secondaryType": "sword", "maxLevelDamage": 99, "sprite": "holy"},
+                    {"name": "Broken"},
+                ]),
+                encoding="utf-8",
+            )
+            manager = OnlineDataManager(bundled_items_path=bundled, stream=True, keep_fields=["maxLevel*"])
+            data = manager.get_online_item_data("")
+            self.assertFalse((Path(tmp_dir) / "items.index.json").exists())
+
+        self.assertEqual(data, [{"name": "Espada Santa", "type": "weapon", "secondaryType": "sword",
+                                 "maxLevelDamage": 99}])
+        merged = manager.merge_online_fields({"sword": [{"name": "Holy Sword"}]}, data)
+        self.assertEqual(merged["sword"][0]["maxLevelDamage"], 99)
 
     def test_returns_none_when_no_bundled_file(self):
         manager = OnlineDataManager(bundled_items_path=Path("does-not-exist.json"))
@@ -1,6 +1,15 @@
 import unittest
 
-from online_data import OnlineDataManager, _matches, _norm_key, _strip_type_suffix
+import json
+
+from online_data import (
+    BUNDLED_ITEMS_PATH,
+    OnlineDataManager,
+    OnlineIndex,
+    _matches,
+    _norm_key,
+    _strip_type_suffix,
+)
 
 
 class OnlineMatchingHelpersTests(unittest.TestCase):
@@ -20,6 +29,33 @@ class OnlineMatchingHelpersTests(unittest.TestCase):
         self.assertTrue(_matches("ring of power", {"sprite": "Ring Of Power"}, "ring"))
 
 
+class OnlineIndexTests(unittest.TestCase):
+    @staticmethod
+    def _scan(local_key, online, item_type):
+        return next((o for o in online if _matches(local_key, o, item_type)), None)
+
+    def test_earliest_entry_wins_across_candidate_kinds(self):
+        online = [
+            {"name": "Other", "sprite": "holy"},
+            {"name_en": "Holy Sword"},
+            {"name_fr": "Holy Sword"},
+        ]
+        index = OnlineIndex(online)
+        self.assertIs(index.find("holy sword", "sword"), online[0])
+        self.assertIs(index.find("holy sword", "axe"), online[1])
+        self.assertIsNone(index.find("dark axe", "axe"))
+
+    def test_matches_linear_scan_on_bundled_data(self):
+        with open(BUNDLED_ITEMS_PATH, encoding="utf-8") as handle:
+            online = json.load(handle)
+        index = OnlineIndex(online)
+        keys = sorted({_norm_key(o.get("name")) for o in online})[::40]
+        keys += [" ".join(key.split(" ")[:-1]) for key in keys] + ["missing item"]
+        for item_type in ("sword", "hammer"):
+            for key in keys:
+                self.assertIs(index.find(key, item_type), self._scan(key, online, item_type), key)
+
+
 class MergeOnlineFieldsTests(unittest.TestCase):
     def test_merge_copies_max_damage_and_prices(self):
         local = {"sword": [{"name": "Holy Sword", "damage": 10}]}
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import parse_cache
+from class_parser import ClassParser
+from enemy_parser import EnemyParser
+from file_parser import FileParser
+from parse_cache import ParseCache
+
+ITEM_CONTENT = "item\n{\n    name = Holy Sword\n    damage = 10\n}\n"
+
+
+class ParseCacheTests(unittest.TestCase):
+    def test_load_hits_after_first_parse(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / "a.enml"
+            source.write_text("x", encoding="utf-8")
+            cache = ParseCache(Path(tmp_dir) / "cache")
+            calls = []
+
+            def parse(path):
+                calls.append(path)
+                return [{"name": "A"}]
+
+            first = cache.load("item", source, parse)
+            second = cache.load("item", source, parse)
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_changed_file_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / "a.enml"
+            source.write_text("x", encoding="utf-8")
+            cache = ParseCache(Path(tmp_dir) / "cache")
+            cache.load("item", source, lambda path: ["old"])
+            source.write_text("longer", encoding="utf-8")
+            blocks = cache.load("item", source, lambda path: ["new"])
+        self.assertEqual(blocks, ["new"])
+
+    def test_hash_verification_catches_same_size_and_mtime_edits(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / "a.enml"
+            source.write_text("aaa", encoding="utf-8")
+            stat = source.stat()
+            cache = ParseCache(Path(tmp_dir) / "cache", verify_hash=True)
+            cache.load("item", source, lambda path: ["old"])
+            source.write_text("bbb", encoding="utf-8")
+            os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            blocks = cache.load("item", source, lambda path: ["new"])
+        self.assertEqual(blocks, ["new"])
+
+    def test_entries_from_another_version_are_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / "a.enml"
+            source.write_text("x", encoding="utf-8")
+            cache = ParseCache(Path(tmp_dir) / "cache")
+            cache.load("item", source, lambda path: ["old"])
+            entry_path = cache._entry_path("item", source)
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+            entry["version"] = parse_cache.CACHE_VERSION + 1
+            entry_path.write_text(json.dumps(entry), encoding="utf-8")
+            blocks = cache.load("item", source, lambda path: ["new"])
+        self.assertEqual(blocks, ["new"])
+
+    def test_evicts_least_recently_used_entries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ParseCache(Path(tmp_dir) / "cache", max_bytes=10 ** 6)
+            sources = []
+            for index, name in enumerate(("a", "b", "c")):
+                source = Path(tmp_dir) / name
+                source.write_text(name, encoding="utf-8")
+                cache.load("item", source, lambda path: ["x" * 100])
+                os.utime(cache._entry_path("item", source), ns=(index, index))
+                sources.append(source)
+            cache.max_bytes = 2 * cache._entry_path("item", sources[0]).stat().st_size
+            cache.evict()
+            remaining = [cache._entry_path("item", source).exists() for source in sources]
+        self.assertEqual(remaining, [False, True, True])
+
+    def test_puts_scan_the_directory_only_to_measure_and_evict(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ParseCache(Path(tmp_dir) / "cache", max_bytes=10 ** 6)
+            sources = []
+            for name in "abcdefgh":
+                source = Path(tmp_dir) / name
+                source.write_text(name, encoding="utf-8")
+                sources.append(source)
+            with mock.patch("parse_cache.os.scandir", wraps=os.scandir) as scandir:
+                for source in sources[:4]:
+                    cache.load("item", source, lambda path: ["x" * 100])
+            self.assertEqual(scandir.call_count, 1)
+
+            entry_size = cache._entry_path("item", sources[0]).stat().st_size
+            cache.max_bytes = 6 * entry_size
+            with mock.patch("parse_cache.os.scandir", wraps=os.scandir) as scandir:
+                for source in sources[4:]:
+                    cache.load("item", source, lambda path: ["x" * 100])
+            self.assertEqual(scandir.call_count, 1)
+            remaining = sum(cache._entry_path("item", source).exists() for source in sources)
+        # The seventh entry overflowed the cap and eviction kept 4 (75% of 6); the eighth was added after.
+        self.assertEqual(remaining, 5)
+
+
+class ParserCacheIntegrationTests(unittest.TestCase):
+    def test_file_parser_hits_skip_tokenizing(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "weapon-sword-1.enml").write_text(ITEM_CONTENT, encoding="utf-8")
+            cache = ParseCache(Path(tmp_dir) / "cache")
+            parser = FileParser(tmp_dir, {"weapon-sword-1.enml": "sword"}, cache=cache)
+            first = parser.parse_files()
+            with mock.patch("file_parser.read_enml_blocks", side_effect=AssertionError("re-tokenized")):
+                second = parser.parse_files()
+        self.assertEqual(first, second)
+        self.assertEqual(second["sword"][0]["name"], "Holy Sword")
+
+    def test_class_and_enemy_parsers_use_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            class_file = Path(tmp_dir) / "class-heads.enml"
+            class_file.write_text("helmet1\n{\n    class = knight\n}\n", encoding="utf-8")
+            enemy_file = Path(tmp_dir) / "slime.character"
+            enemy_file.write_text("character {\n  resistance = 10;\n}\n", encoding="utf-8")
+            cache = ParseCache(Path(tmp_dir) / "cache")
+            ClassParser(str(class_file), cache=cache).parse_file()
+            EnemyParser([tmp_dir], cache=cache).parse_enemy_data()
+            with mock.patch("class_parser.read_enml_blocks", side_effect=AssertionError), \
+                    mock.patch("enemy_parser.read_enml_blocks", side_effect=AssertionError):
+                classes = ClassParser(str(class_file), cache=cache).parse_file()
+                enemies = EnemyParser([tmp_dir], cache=cache).parse_enemy_data()
+        self.assertEqual(classes[0].as_dict(), {"class": "knight", "identifier": "helmet1"})
+        self.assertEqual(enemies[0].as_dict()["resistance"], 10)
+        self.assertEqual(cache.hits, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
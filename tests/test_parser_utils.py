@@ -1,6 +1,16 @@
 import unittest
+from unittest import mock
 
-from parser_utils import parse_scalar, process_boost, sanitize_resource_name
+import parser_utils
+from parser_utils import (
+    ValueDecoder,
+    boost_columns,
+    parse_scalar,
+    process_boost,
+    process_boosts,
+    process_pool,
+    sanitize_resource_name,
+)
 
 
 class ParseScalarTests(unittest.TestCase):
@@ -27,6 +37,32 @@ class ParseScalarTests(unittest.TestCase):
         self.assertIsNone(parse_scalar(None))
 
 
+class ValueDecoderTests(unittest.TestCase):
+    VALUES = [
+        "10", "-7", "+3", "10;", " 42 ", "3.14", ".5", "1.", "-.5", ".", "1.2.3", "1e5", "1_000",
+        "true", "False", "TRUE;", "Holy Sword", "", "fire", "12 swords", "٣", "nan", "inf", "true story",
+    ]
+
+    def test_matches_parse_scalar_for_every_schema_type(self):
+        decoder = ValueDecoder()
+        for key in ("damage", "speedBoost", "frost", "name", "unknownKey"):
+            for value in self.VALUES:
+                with self.subTest(key=key, value=value):
+                    expected = parse_scalar(value)
+                    result = decoder.decode(key, value)
+                    self.assertEqual(result, expected)
+                    self.assertIs(type(result), type(expected))
+
+    def test_learns_unknown_keys_from_first_value(self):
+        decoder = ValueDecoder(schema={})
+        self.assertEqual(decoder.decode("level", "3"), 3)
+        self.assertEqual(decoder.decode("level", "4.5"), 4.5)  # falls back when the learned type misses
+        self.assertIn("level", decoder.converters)
+
+    def test_non_string_returned_unchanged(self):
+        self.assertIsNone(ValueDecoder().decode("damage", None))
+
+
 class ProcessBoostTests(unittest.TestCase):
     def test_neutral_multipliers_are_zero(self):
         self.assertEqual(process_boost(1), 0)
@@ -41,6 +77,40 @@ class ProcessBoostTests(unittest.TestCase):
         self.assertEqual(process_boost("abc"), 0)
         self.assertEqual(process_boost(None), 0)
 
+    def test_batch_matches_single_value(self):
+        values = [1, 0, 1.5, 2, 0.9, 1.125, 0.875, 1.005, "abc", None, True]
+        self.assertEqual(process_boosts(values), [process_boost(v) for v in values])
+
+    def test_small_batches_do_not_load_numpy(self):
+        with mock.patch.object(parser_utils, "load_numpy") as load_numpy:
+            self.assertEqual(process_boosts([1.5] * 400), [50] * 400)
+        load_numpy.assert_not_called()
+
+    @unittest.skipIf(parser_utils.load_numpy() is None, "numpy is not installed")
+    def test_numpy_batch_matches_single_value(self):
+        numeric = [1, 0, 1.5, 2, 0.9, 1.125, 0.875, 1.005, 0.25, "1.35", True]
+        mixed = numeric + ["abc", None, ""]
+        with mock.patch.object(parser_utils, "NUMPY_MIN_BATCH", 0):
+            for values in (numeric, mixed):
+                result = process_boosts(values)
+                self.assertEqual(result, [process_boost(v) for v in values])
+                self.assertTrue(all(type(value) is int for value in result))
+
+    def test_boost_columns_default_missing_fields(self):
+        items = [{"speedBoost": 1.25}, {"jumpBoost": 0.5}]
+        self.assertEqual(
+            boost_columns(items, ("speedBoost", "jumpBoost")),
+            {"speedBoost": [25, 0], "jumpBoost": [0, -50]},
+        )
+
+
+class ProcessPoolTests(unittest.TestCase):
+    def test_workers_are_not_forked(self):
+        with mock.patch("concurrent.futures.ProcessPoolExecutor") as pool:
+            process_pool(3)
+        self.assertEqual(pool.call_args.kwargs["max_workers"], 3)
+        self.assertIn(pool.call_args.kwargs["mp_context"].get_start_method(), ("forkserver", "spawn"))
+
 
 class SanitizeResourceNameTests(unittest.TestCase):
     def test_spaces_and_apostrophes(self):
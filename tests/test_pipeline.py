@@ -1,7 +1,11 @@
+import threading
 import unittest
+from unittest import mock
 
 from armor_ring_parser import generate_armor_code
+from filter_util import DataFilter
 from models import ItemRecord
+from online_data import OnlineDataManager
 from pipeline import ItemPipeline
 
 
@@ -50,5 +54,64 @@ class ItemPipelineTests(unittest.TestCase):
         self.assertIn("heavy", lines[1])
 
 
+class BuildRecordsTests(unittest.TestCase):
+    @staticmethod
+    def _staged(data):
+        filtered = DataFilter().filter_parsed_data(data)
+        return ItemPipeline.to_records(ItemPipeline.sort_grouped_items(
+            ItemPipeline.reclassify_axes_and_hammers(filtered)))
+
+    def _assert_same_as_staged(self, make_data):
+        fused = ItemPipeline("", "").build_records(make_data())
+        staged = self._staged(make_data())
+        self.assertEqual(list(fused), list(staged))
+        for item_type in staged:
+            self.assertEqual([r.as_dict() for r in fused[item_type]], [r.as_dict() for r in staged[item_type]])
+            self.assertTrue(all(r.item_type == item_type for r in fused[item_type]))
+
+    def test_matches_staged_pipeline_on_bundled_data(self):
+        manager = OnlineDataManager()
+        online = manager.get_online_item_data("")
+        self.assertTrue(online)
+        self._assert_same_as_staged(lambda: manager.convert_online_to_local(online))
+
+    def test_moved_maces_follow_hammers_whatever_the_input_order(self):
+        def data():
+            return {
+                "axe": [{"name": "Mace", "secondaryType": "mace", "damage": 5},
+                        {"name": "Axe", "secondaryType": "axe", "damage": 5},
+                        {"name": "Axe B", "secondaryType": "axe"}],
+                "hammer": [{"name": "Mace", "secondaryType": "hammer", "damage": 5}],
+                "essence": [{"name": "Fire Essence"}],
+            }
+        self._assert_same_as_staged(data)
+
+
+class _SignallingOnlineManager:
+    def __init__(self):
+        self.started = threading.Event()
+
+    def load_online_data(self, url):
+        self.started.set()
+        return [], None
+
+
+class LoadItemsConcurrencyTests(unittest.TestCase):
+    def test_online_fetch_runs_while_local_files_parse(self):
+        manager = _SignallingOnlineManager()
+
+        def parse_files(parser):
+            # Only returns once the online branch has started in parallel.
+            self.assertTrue(manager.started.wait(timeout=5))
+            return {"sword": [{"name": "Holy Sword", "damage": 1}]}
+
+        pipeline = ItemPipeline("unused", "", online_manager=manager)
+        with mock.patch("pipeline.FileParser.parse_files", parse_files):
+            items = pipeline.load_items()
+
+        self.assertEqual([item.as_dict()["name"] for item in items["sword"]], ["Holy Sword"])
+        self.assertEqual(set(pipeline.timings), {"parse", "online"})
+
+
 if __name__ == "__main__":
     unittest.main()
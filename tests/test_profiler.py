@@ -0,0 +1,58 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from main import main
+from profiler import NULL_PROFILER, Profiler
+
+
+class ProfilerTests(unittest.TestCase):
+    def test_stages_nest_and_aggregate_by_name(self):
+        profiler = Profiler()
+        with profiler.stage("outer"):
+            for _ in range(2):
+                with profiler.stage("inner", items=3):
+                    pass
+        summary = {name: (depth, calls) for name, depth, calls, _, _ in profiler.summary()}
+        self.assertEqual(summary, {"outer": (0, 1), "inner": (1, 2)})
+        self.assertIn("inner", profiler.report())
+
+    def test_chrome_trace_has_complete_events(self):
+        profiler = Profiler()
+        with profiler.stage("merge"):
+            pass
+        profiler.record("parse a.enml", profiler.origin, 0.5, 0.25, pid=7, tid=7, thread="worker")
+        events = [event for event in profiler.chrome_trace()["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual([event["name"] for event in events], ["merge", "parse a.enml"])
+        self.assertEqual(events[1]["dur"], 500000.0)
+        self.assertEqual(events[1]["args"]["cpu_ms"], 250.0)
+
+    def test_disabled_profiler_records_nothing(self):
+        with NULL_PROFILER.stage("merge"):
+            pass
+        NULL_PROFILER.record("parse", 0.0, 1.0, 1.0)
+        self.assertEqual(NULL_PROFILER.events, [])
+
+
+class MainProfileTests(unittest.TestCase):
+    def test_profile_trace_covers_parse_and_export_stages(self):
+        with tempfile.TemporaryDirectory() as items_dir, tempfile.TemporaryDirectory() as out_dir:
+            (Path(items_dir) / "weapon-sword-1.enml").write_text(
+                "item\n{\n    name = Holy Sword\n    damage = 10\n}\n", encoding="utf-8")
+            trace = Path(out_dir) / "trace.json"
+            report = io.StringIO()
+            with contextlib.redirect_stderr(report):
+                main(["normal", "sword", "--items-folder", items_dir, "--output-dir", out_dir,
+                      "--online-items-url", "", "--log-level", "critical", "--profile-trace", str(trace)])
+            names = {event["name"] for event in json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]}
+        for stage in ("local parse", "parse weapon-sword-1.enml", "online fetch", "merge",
+                      "filter+reclassify+sort", "format sword", "write sword_code.txt"):
+            self.assertIn(stage, names)
+        self.assertIn("wall ms", report.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
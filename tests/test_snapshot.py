@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from models import ItemRecord
+from online_data import OnlineDataManager
+from pipeline import ItemPipeline
+from snapshot import ItemSnapshot, decode_items, encode_items
+
+ITEMS = {
+    "sword": [
+        ItemRecord("sword", {"name": "Holy Sword", "damage": 10, "frost": True, "speedBoost": 1.25}),
+        ItemRecord("sword", {"name": "Dark Sword", "damage": 7.5, "sprite": "dark.png"}),
+    ],
+    "ring": [],
+    "axe": [ItemRecord("axe", {"name": "Axe", "damage": 2 ** 70, "extra": None})],
+}
+
+
+class _FreshOnlineManager:
+    def peek_online_source(self, url):
+        return "http:abc:*"
+
+    def load_online_data(self, url):
+        return [], "http:abc:*"
+
+
+class SnapshotFormatTests(unittest.TestCase):
+    def test_round_trip_preserves_values_types_and_order(self):
+        loaded = decode_items(encode_items(ITEMS, ("fp", 1)), ("fp", 1))
+        self.assertEqual(list(loaded), ["sword", "ring", "axe"])
+        self.assertEqual(loaded, ITEMS)
+        self.assertIs(loaded["sword"][0].get("frost"), True)
+        self.assertIsInstance(loaded["sword"][0].get("damage"), int)
+        self.assertNotIn("sprite", loaded["sword"][0].as_mapping())
+
+    def test_stale_fingerprint_or_version_is_ignored(self):
+        data = encode_items(ITEMS, ("fp", 1))
+        self.assertIsNone(decode_items(data, ("fp", 2)))
+        self.assertIsNone(decode_items(b"not a snapshot", ("fp", 1)))
+
+
+class PipelineSnapshotTests(unittest.TestCase):
+    def test_unchanged_inputs_load_from_snapshot(self):
+        file_map = {"weapon-sword-1.enml": "sword"}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            items = Path(tmp_dir) / "items"
+            items.mkdir()
+            source = items / "weapon-sword-1.enml"
+            source.write_text("item\n{\n    name = Holy Sword\n    damage = 10\n}\n", encoding="utf-8")
+            snapshot = ItemSnapshot(Path(tmp_dir) / "items.snapshot")
+
+            def pipeline():
+                return ItemPipeline(items, "", file_map=file_map, online_manager=_FreshOnlineManager(),
+                                    snapshot=snapshot)
+
+            first = pipeline().load_items()
+            with mock.patch("pipeline.FileParser.parse_files", side_effect=AssertionError("parsed")):
+                second = pipeline()
+                self.assertEqual(second.load_items(), first)
+            self.assertIn("snapshot", second.timings)
+
+            source.write_text("item\n{\n    name = Holy Sword\n    damage = 12\n}\n", encoding="utf-8")
+            os.utime(source, ns=(0, 0))
+            third = pipeline().load_items()
+        self.assertEqual(third["sword"][0].get("damage"), 12)
+
+    def test_offline_runs_reuse_snapshot_until_bundled_data_or_parser_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bundled = Path(tmp_dir) / "items.json"
+            bundled.write_text('[{"name": "Holy Sword", "type": "weapon", "secondaryType": "sword"}]',
+                               encoding="utf-8")
+            snapshot = ItemSnapshot(Path(tmp_dir) / "items.snapshot")
+
+            def load():
+                manager = OnlineDataManager(bundled, index_path=Path(tmp_dir) / "items.index.json")
+                pipeline = ItemPipeline(Path(tmp_dir) / "no-items", "", online_manager=manager, snapshot=snapshot)
+                return pipeline.load_items(), pipeline.timings
+
+            first, _ = load()
+            self.assertEqual([record.get("name") for record in first["sword"]], ["Holy Sword"])
+            self.assertEqual(load(), (first, {"snapshot": mock.ANY}))
+
+            with mock.patch("pipeline.CACHE_VERSION", -1):
+                _, timings = load()
+            self.assertIn("parse", timings)
+
+            bundled.write_text('[{"name": "Dark Sword", "type": "weapon", "secondaryType": "sword"}]',
+                               encoding="utf-8")
+            os.utime(bundled, ns=(0, 0))
+            changed, _ = load()
+        self.assertEqual([record.get("name") for record in changed["sword"]], ["Dark Sword"])
+
+
+if __name__ == "__main__":
+    unittest.main()
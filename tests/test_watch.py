@@ -0,0 +1,100 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from config import parse_args
+from exporters import MANIFEST_NAME
+from main import main
+from watch_session import WatchSession
+from watcher import InotifyWatcher, PollingWatcher
+
+SWORDS = "item\n{\n    name = Holy Sword\n    damage = 10\n}\n"
+AXES = ("item\n{\n    name = Big Axe\n    secondaryType = axe\n    damage = 4\n}\n"
+        "item\n{\n    name = Small Mace\n    secondaryType = mace\n    damage = 3\n}\n")
+HAMMERS = "item\n{\n    name = War Hammer\n    secondaryType = hammer\n    damage = 8\n}\n"
+CLASSES = "helmet0\n{\n    class = knight\n    armorBoost = 1.1\n}\n"
+ENEMY = "character {\n  resistance = 10;\n  speed = 1;\n}\n"
+
+
+class WatchSessionTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.items = root / "items"
+        self.enemies = root / "enemies"
+        self.items.mkdir()
+        self.enemies.mkdir()
+        (self.items / "weapon-sword-1.enml").write_text(SWORDS, encoding="utf-8")
+        (self.items / "weapon-axe-1.enml").write_text(AXES, encoding="utf-8")
+        (self.items / "special-hammers.enml").write_text(HAMMERS, encoding="utf-8")
+        (self.items / "class-heads.enml").write_text(CLASSES, encoding="utf-8")
+        (self.enemies / "slime.character").write_text(ENEMY, encoding="utf-8")
+        self.root = root
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _argv(self, output_dir):
+        return ["normal", "all", "--items-folder", str(self.items), "--enemy-dir", str(self.enemies),
+                "--output-dir", str(output_dir), "--online-items-url", "", "--log-level", "critical"]
+
+    def _session(self):
+        session = WatchSession(parse_args(self._argv(self.root / "watch")))
+        session.start()
+        return session
+
+    def test_initial_outputs_match_a_full_run(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            main(self._argv(self.root / "full"))
+        self._session()
+        # The export manifests differ in the recorded mtimes only.
+        full = {path.name: path.read_text(encoding="utf-8") for path in (self.root / "full").iterdir()
+                if path.name != MANIFEST_NAME}
+        watched = {path.name: path.read_text(encoding="utf-8") for path in (self.root / "watch").iterdir()
+                   if path.name != MANIFEST_NAME}
+        self.assertEqual(watched, full)
+
+    def test_only_affected_sections_are_regenerated(self):
+        session = self._session()
+        sword_file = self.items / "weapon-sword-1.enml"
+        sword_file.write_text(SWORDS.replace("Holy Sword", "Dark Sword"), encoding="utf-8")
+        os.utime(sword_file, ns=(1, 1))
+        results = session.apply({str(sword_file)})
+        self.assertEqual([result.label for result in results], ["sword"])
+        self.assertIn("Dark Sword", (self.root / "watch" / "sword_code.txt").read_text(encoding="utf-8"))
+
+        results = session.apply({str(self.items / "weapon-axe-1.enml"), str(self.items / "notes.txt")})
+        self.assertEqual([result.label for result in results], ["hammer", "axe"])
+        self.assertIn("Small Mace", (self.root / "watch" / "hammer_code.txt").read_text(encoding="utf-8"))
+
+        self.assertEqual([r.label for r in session.apply({str(self.enemies / "slime.character")})], ["enemy"])
+        self.assertEqual([r.label for r in session.apply({str(self.items / "class-heads.enml")})], ["class"])
+
+
+class WatcherTests(unittest.TestCase):
+    def _assert_reports_change(self, make_watcher):
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "a.enml"
+            path.write_text("x", encoding="utf-8")
+            watcher = make_watcher(folder)
+            try:
+                self.assertEqual(watcher.wait(timeout=0.05), set())
+                path.write_text("xy", encoding="utf-8")
+                self.assertEqual(watcher.wait(timeout=2), {str(path)})
+            finally:
+                watcher.close()
+
+    def test_polling_watcher(self):
+        self._assert_reports_change(lambda folder: PollingWatcher([folder], interval=0.01))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_watcher(self):
+        self._assert_reports_change(lambda folder: InotifyWatcher([folder]))
+
+
+if __name__ == "__main__":
+    unittest.main()
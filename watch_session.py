@@ -0,0 +1,120 @@
+import logging
+import os
+
+from exporters import ExportService
+from file_parser import FileParser
+from models import OUTPUT_ORDER
+from online_data import OnlineDataManager
+from parse_cache import MemoryParseCache
+from pipeline import FILE_MAP, ItemPipeline
+
+logger = logging.getLogger(__name__)
+
+CLASS_FILE = "class-heads.enml"
+# The hammer section also holds the maces parsed from axe files.
+_COUPLED_TYPES = frozenset({"axe", "hammer"})
+
+
+class WatchSession:
+    """Keep parsed inputs in memory and regenerate only the sections whose inputs changed.
+
+    Parsed files live in a MemoryParseCache and the online item data is loaded
+    once, so an edit to one ENML file re-parses that file and rewrites only the
+    sections built from it.
+    """
+
+    def __init__(self, config, file_map=None, data_filter=None, online_manager=None):
+        self.config = config
+        self.file_map = file_map or FILE_MAP
+        self.cache = MemoryParseCache()
+        self.exporter = ExportService(config.output_dir, to_stdout=config.to_stdout, cache=self.cache,
+                                      scanner=config.scanner)
+        self.pipeline = ItemPipeline(config.items_folder, config.online_items_url, file_map=self.file_map,
+                                     data_filter=data_filter, online_manager=online_manager or OnlineDataManager(),
+                                     cache=self.cache, scanner=config.scanner)
+        self.items_folder = os.path.abspath(config.items_folder)
+        self.enemy_directories = {os.path.abspath(directory) for directory in config.enemy_directories}
+        self.sections = self._sections(config.item_type)
+        self.online = None
+        self._local_counts = {}
+
+    def _sections(self, item_type):
+        if item_type == "all":
+            extra = [t for t in dict.fromkeys(self.file_map.values()) if t not in OUTPUT_ORDER]
+            return list(OUTPUT_ORDER) + extra + ["class", "enemy"]
+        return [item_type]
+
+    def directories(self):
+        """Directories to watch for the configured sections."""
+        directories = []
+        if any(section != "enemy" for section in self.sections):
+            directories.append(self.items_folder)
+        if "enemy" in self.sections:
+            directories.extend(sorted(self.enemy_directories))
+        return directories
+
+    def start(self):
+        """Load the online data once and generate every section; return the ExportResults."""
+        if any(section not in ("class", "enemy") for section in self.sections):
+            self.online, _ = self.pipeline.online_manager.load_online_data(self.config.online_items_url)
+            # Whether any local item exists decides the online fallback, as in a full run.
+            local = FileParser(str(self.config.items_folder), self.file_map, cache=self.cache,
+                               scanner=self.config.scanner).parse_files()
+            self._local_counts = {item_type: len(items) for item_type, items in local.items()}
+        return self.regenerate(self.sections)
+
+    def affected(self, paths):
+        """Return the sections built from any of ``paths``, in output order."""
+        affected = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            folder, name = os.path.split(path)
+            if path == self.items_folder:
+                affected.update(section for section in self.sections if section != "enemy")
+            elif path in self.enemy_directories:
+                affected.add("enemy")
+            elif folder in self.enemy_directories:
+                if name.endswith(".character"):
+                    affected.add("enemy")
+            elif folder == self.items_folder:
+                if name == CLASS_FILE:
+                    affected.add("class")
+                elif name in self.file_map:
+                    affected.add(self.file_map[name])
+        if affected & _COUPLED_TYPES:
+            affected |= _COUPLED_TYPES
+        return [section for section in self.sections if section in affected]
+
+    def apply(self, paths):
+        """Regenerate the sections affected by the changed ``paths``; return their ExportResults."""
+        sections = self.affected(paths)
+        if sections:
+            logger.debug("Changed: %s -> regenerating %s", ", ".join(sorted(paths)), ", ".join(sections))
+        return self.regenerate(sections)
+
+    def regenerate(self, sections):
+        results = []
+        item_types = [section for section in sections if section not in ("class", "enemy")]
+        if item_types:
+            results.extend(self._export_items(item_types))
+        if "class" in sections:
+            results.append(self.exporter.export_classes(self.config.items_folder, self.config.output_type))
+        if "enemy" in sections:
+            results.append(self.exporter.export_enemies(self.config.enemy_directories, self.config.output_type))
+        return results
+
+    def _export_items(self, item_types):
+        wanted = set(item_types)
+        parsed_types = wanted | _COUPLED_TYPES if wanted & _COUPLED_TYPES else wanted
+        file_map = {name: item_type for name, item_type in self.file_map.items() if item_type in parsed_types}
+        local = FileParser(str(self.config.items_folder), file_map, cache=self.cache,
+                           scanner=self.config.scanner).parse_files()
+        for item_type, items in local.items():
+            self._local_counts[item_type] = len(items)
+        records = self.pipeline.assemble(local, self.online, has_local=any(self._local_counts.values()))
+        single = self.config.item_type not in ("all", "class", "enemy")
+        return [
+            self.exporter.export_items(records, item_type, self.config.output_type)
+            for item_type in records
+            if item_type in wanted and (records[item_type] or single)
+        ]
@@ -1,14 +1,23 @@
-from parser_utils import process_boost, sanitize_resource_name
+from collections.abc import Mapping
+from parser_utils import boost_columns, process_boost, sanitize_resource_name
 from models import record_to_mapping
 
+WEAPON_BOOST_FIELDS = ("armorBoost", "speedBoost", "jumpBoost")
+
 
 def sort_by_max_damage(weapon_list):
     """Sort weapons by their max damage."""
     return sorted(weapon_list, key=lambda x: x['maxDamage'])
 
 
-def extract_common_fields(block, default_name, weapon_type):
-    """Extract shared weapon properties and compute damage/boost values."""
+def extract_common_fields(block, default_name, weapon_type, boosts=None):
+    """Extract shared weapon properties and compute damage/boost values.
+
+    ``boosts`` optionally holds this block's precomputed boost percentages
+    (see boost_columns); missing ones are computed here.
+    """
+    if boosts is None:
+        boosts = {field: process_boost(block.get(field, 1)) for field in WEAPON_BOOST_FIELDS}
     name = sanitize_resource_name(block.get("name", default_name), default_name)
 
     element = block.get("element", "NEUTRAL").upper() or "NEUTRAL"
@@ -23,9 +32,9 @@ def extract_common_fields(block, default_name, weapon_type):
     )
 
     upgrades = block.get("maxLevelAllowed", 0) or 1
-    armor_bonus = process_boost(block.get("armorBoost", 1))
-    speed = process_boost(block.get("speedBoost", 1))
-    jump = process_boost(block.get("jumpBoost", 1))
+    armor_bonus = boosts["armorBoost"]
+    speed = boosts["speedBoost"]
+    jump = boosts["jumpBoost"]
     attack_cd = block.get("attackCooldown", 0)
     pierce = block.get("pierceCount", 0)
     pierce_area = block.get("enablePierceAreaDamage", False)
@@ -72,11 +81,14 @@ def generate_weapon_code(data, weapon_type, list_name, drawable_prefix, default_
     weapon_data = []
 
     if isinstance(data, list):
-        for block in data:
-            if isinstance(block, dict) or hasattr(block, "as_dict"):
-                block = record_to_mapping(block)
-                fields = extract_common_fields(block, default_name, weapon_type)
-                weapon_data.append(fields)
+        blocks = [
+            record_to_mapping(block) for block in data
+            if isinstance(block, Mapping) or hasattr(block, "as_mapping")
+        ]
+        boosts = boost_columns(blocks, WEAPON_BOOST_FIELDS)
+        for index, block in enumerate(blocks):
+            block_boosts = {field: boosts[field][index] for field in WEAPON_BOOST_FIELDS}
+            weapon_data.append(extract_common_fields(block, default_name, weapon_type, block_boosts))
 
     weapon_data = sort_by_max_damage(weapon_data)
 